@@ -0,0 +1,363 @@
+import os
+import re
+import json
+import time
+import queue
+import logging
+import datetime
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
+import arxiv
+import pytz
+from paper_store import PaperStore
+from paper import Paper
+from instrumentation import span, add_time, incr
+from config import ARXIV_API_URL, ARXIV_STATE_DIR
+
+PUBLISHED_FORMAT = '%Y-%m-%d %H:%M:%S'
+# 카테고리 하나만 검색하는 쿼리 (예: 'cat:cs.LG')
+CATEGORY_QUERY = re.compile(r'^cat:([\w.\-]+)$')
+STATE_DIR = Path(ARXIV_STATE_DIR)
+
+
+def parse_published(published: str) -> datetime.datetime:
+    """논문 dict의 'published' 문자열(UTC)을 datetime으로 변환합니다."""
+    return datetime.datetime.strptime(published, PUBLISHED_FORMAT).replace(tzinfo=pytz.UTC)
+
+
+def result_to_paper(result: arxiv.Result) -> Paper:
+    """arxiv.Result를 크롤러에서 사용하는 Paper로 변환합니다."""
+    return Paper(
+        title=result.title,
+        authors=[author.name for author in result.authors],
+        abstract=result.summary,
+        url=result.entry_id,
+        pdf_url=result.pdf_url,
+        published=result.published.strftime(PUBLISHED_FORMAT),
+        categories=result.categories,
+        doi=result.doi,
+        comment=result.comment,
+        score=0  # 랭킹 점수 초기화
+    )
+
+
+def state_file_for(query: str) -> Path:
+    """쿼리별 수집 상태 파일 경로 (예: 'cat:cs.LG' -> config/arxiv_harvest_state_cat_cs.LG.json)."""
+    slug = re.sub(r'[^A-Za-z0-9.]+', '_', query).strip('_')
+    return STATE_DIR / f'arxiv_harvest_state_{slug}.json'
+
+
+class RequestPacer:
+    """
+    여러 스레드가 공유하는 요청 간격 제한기.
+
+    arXiv API 이용 약관에 따라 모든 쿼리를 합쳐 interval초에 한 번만 요청이 나가도록 합니다.
+    """
+
+    def __init__(self, interval: float = 3.0):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._last_request = 0.0
+
+    def wait(self):
+        with self._lock:
+            delay = self._last_request + self.interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+                add_time('crawl.pacer_wait', delay)
+            self._last_request = time.monotonic()
+
+
+class PoliteClient(arxiv.Client):
+    """
+    페이지 요청(재시도 포함)마다 공유 RequestPacer를 거치는 arxiv.Client.
+
+    arxiv.Client의 요청 간 지연은 클라이언트 인스턴스별이므로, 여러 쿼리를 동시에 수집할 때는
+    클라이언트 자체 지연을 끄고 공유 제한기로 대신합니다.
+    """
+
+    def __init__(self, pacer: RequestPacer, page_size: int = 100, num_retries: int = 3):
+        super().__init__(page_size=page_size, delay_seconds=0, num_retries=num_retries)
+        self.query_url_format = f"{ARXIV_API_URL}?{{}}"
+        self.pacer = pacer
+
+    def _parse_feed(self, url: str, first_page: bool = True, _try_index: int = 0):
+        self.pacer.wait()
+        if _try_index:
+            # 재시도는 첫 요청의 구간 안에서 재귀 호출되므로 횟수만 기록
+            incr('crawl.retries')
+            return super()._parse_feed(url, first_page=first_page, _try_index=_try_index)
+        with span('crawl.request'):
+            return super()._parse_feed(url, first_page=first_page, _try_index=_try_index)
+
+
+class ArxivHarvester:
+    """
+    arXiv 피드를 증분 수집하는 클래스.
+
+    마지막으로 본 제출 시각(high-water mark)과 그 시각의 논문 ID를 파일에 저장하고,
+    다음 실행에서는 제출일 내림차순으로 페이지를 받다가 워터마크를 넘는 순간 중단합니다.
+    수집한 논문은 보존 기간(retention_hours) 동안 보관하므로 (PaperStore가 있으면 저장소에,
+    없으면 상태 파일에), 실행마다 피드는 최대 한 번만 조회되고 이전 실행에서 받은 논문도 후보로 남습니다.
+    """
+
+    def __init__(self, query: str = 'cat:cs.AI', state_file: Optional[Path] = None,
+                 page_size: int = 100, max_results: int = 1000, retention_hours: int = 72,
+                 store: Optional[PaperStore] = None, client: Optional[arxiv.Client] = None):
+        """
+        Args:
+            query (str): arXiv 검색 쿼리
+            state_file (Path): 워터마크와 보관 논문을 저장할 JSON 파일
+            page_size (int): 한 번에 받을 결과 수
+            max_results (int): 한 번의 실행에서 받을 최대 결과 수 (최초 실행 시 안전장치)
+            retention_hours (int): 수집한 논문을 보관할 시간
+            store (PaperStore): 수집한 논문을 저장할 저장소 (선택)
+            client (arxiv.Client): 사용할 클라이언트 (기본값: page_size로 새로 생성)
+        """
+        self.query = query
+        match = CATEGORY_QUERY.match(query.strip())
+        self.category = match.group(1) if match else None
+        self.state_file = Path(state_file) if state_file else Path(__file__).parent.parent / 'config' / 'arxiv_harvest_state.json'
+        self.page_size = page_size
+        self.max_results = max_results
+        self.retention_hours = retention_hours
+        self.store = store
+        self.client = client or arxiv.Client(page_size=page_size)
+        self.logger = logging.getLogger(__name__)
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict[str, Any]:
+        empty = {'query': self.query, 'watermark': None, 'watermark_ids': [], 'papers': []}
+        if not self.state_file.exists():
+            return empty
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except Exception as e:
+            self.logger.error(f"수집 상태 파일 로드 중 오류 발생 ({self.state_file}): {e}")
+            return empty
+        if state.get('query') != self.query:
+            # 쿼리가 바뀌면 이전 워터마크는 의미가 없음
+            self.logger.info(f"검색 쿼리 변경 ({state.get('query')} -> {self.query}), 수집 상태 초기화")
+            return empty
+        return state
+
+    def _save_state(self):
+        """상태 파일을 임시 파일에 쓴 뒤 교체합니다."""
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_file.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_file)
+        except Exception as e:
+            self.logger.error(f"수집 상태 파일 저장 중 오류 발생 ({self.state_file}): {e}")
+
+    def _iter_new(self, cutoff: datetime.datetime) -> Iterator[arxiv.Result]:
+        """워터마크 이후(또는 cutoff 이후)의 새 결과만 받는 대로 내보냅니다 (제출일 내림차순)."""
+        watermark = parse_published(self.state['watermark']) if self.state.get('watermark') else None
+        watermark_ids = set(self.state.get('watermark_ids', []))
+        stop_at = max(cutoff, watermark) if watermark else cutoff
+
+        search = arxiv.Search(
+            query=self.query,
+            max_results=self.max_results,
+            sort_by=arxiv.SortCriterion.SubmittedDate,
+            sort_order=arxiv.SortOrder.Descending
+        )
+
+        for result in self.client.results(search):
+            published = result.published.replace(microsecond=0)
+            if published < stop_at:
+                break
+            if watermark and published == watermark and result.entry_id in watermark_ids:
+                # 이미 본 워터마크 시각의 논문 -> 더 오래된 결과도 이미 수집됨
+                break
+            yield result
+
+    def _matches(self, paper: Paper) -> bool:
+        """저장소의 논문이 이 쿼리의 논문인지 (카테고리 쿼리만 구분 가능, 그 밖의 쿼리는 모두 해당)."""
+        return self.category is None or self.category in (paper.categories or [])
+
+    def _update_watermark(self, newest: Optional[str], newest_ids: List[str]):
+        """이번 실행에서 받은 새 논문 중 가장 최신 제출 시각과 그 시각의 논문 URL로 워터마크를 갱신합니다."""
+        if newest is None:
+            return
+        watermark = self.state.get('watermark')
+        if not watermark or newest > watermark:
+            self.state['watermark'] = newest
+            self.state['watermark_ids'] = newest_ids
+        elif newest == watermark:
+            self.state['watermark_ids'] = list(dict.fromkeys(self.state.get('watermark_ids', []) + newest_ids))
+
+    def iter_harvest(self) -> Iterator[Paper]:
+        """
+        새 논문을 페이지 단위로 받는 대로 내보낸 뒤, 보존 기간 내의 이전 실행 논문(이 쿼리만)을 이어서 내보냅니다.
+
+        저장소가 있으면 새 논문은 페이지마다 저장하고 이전 논문도 저장소에서 나눠 읽으므로,
+        메모리에는 한 페이지 분량의 논문과 이번 실행에서 받은 논문의 URL만 남습니다.
+        저장소가 없으면 보관 논문 전체를 상태 파일에 써야 하므로 그 목록을 메모리에 둡니다.
+        워터마크는 새 결과를 끝까지 받은 뒤에만 갱신하므로 (저장소에는 다른 쿼리의 더 최신 논문도 있어
+        이 쿼리에서 받은 결과로만 갱신), 도중에 소비를 멈추면 다음 실행에서 다시 받습니다.
+        """
+        now = datetime.datetime.now(pytz.UTC)
+        cutoff = now - datetime.timedelta(hours=self.retention_hours)
+
+        if self.store is not None and self.state.get('papers'):
+            # 저장소가 논문의 단일 출처. 상태 파일에 남아 있던 보관 논문은 저장소로 옮김
+            self.store.upsert_papers(self.state['papers'])
+        kept = None
+        if self.store is None:
+            kept = {paper['url']: Paper.from_dict(paper) for paper in self.state.get('papers', [])}
+
+        new_urls: Set[str] = set()
+        newest, newest_ids = None, []
+        page: List[Paper] = []
+
+        def flush_page() -> List[Paper]:
+            nonlocal page
+            batch, page = page, []
+            if self.store is not None:
+                self.store.upsert_papers(batch)
+            else:
+                for paper in batch:
+                    kept[paper['url']] = paper
+            # 소비자가 점수/카테고리를 바꿔도 보관본(상태 파일)에는 영향이 없도록 복사본을 내보냄
+            return [paper.copy(categories=paper.categories) for paper in batch]
+
+        for result in self._iter_new(cutoff):
+            paper = result_to_paper(result)
+            new_urls.add(paper['url'])
+            if newest is None or paper['published'] > newest:
+                newest, newest_ids = paper['published'], [paper['url']]
+            elif paper['published'] == newest:
+                newest_ids.append(paper['url'])
+            page.append(paper)
+            if len(page) >= self.page_size:
+                yield from flush_page()
+        yield from flush_page()
+        print(f"- arXiv 신규 논문 {len(new_urls)}개 수집 ({self.query}, 워터마크: {self.state.get('watermark') or '없음'})")
+
+        self._update_watermark(newest, newest_ids)
+        self.state['query'] = self.query
+        if self.store is not None:
+            self.state['papers'] = []
+            self._save_state()
+            for paper in self.store.iter_papers_since(self.retention_hours, page_size=self.page_size):
+                if paper['url'] not in new_urls and self._matches(paper):
+                    yield paper
+            return
+
+        # 보존 기간이 지난 논문 제거 후 최신순 정렬
+        retained = [paper for paper in kept.values() if parse_published(paper['published']) >= cutoff]
+        retained.sort(key=lambda paper: paper['published'], reverse=True)
+        self.state['papers'] = [paper.to_dict() for paper in retained]
+        self._save_state()
+        for paper in retained:
+            if paper['url'] not in new_urls:
+                yield paper.copy(categories=paper.categories)
+
+    def harvest(self) -> List[Paper]:
+        """새 논문을 수집하고, 보존 기간 내의 이 쿼리 논문(이전 실행 포함)을 최신순으로 반환합니다."""
+        papers = list(self.iter_harvest())
+        papers.sort(key=lambda paper: paper['published'], reverse=True)
+        return papers
+
+
+class MultiQueryHarvester:
+    """
+    여러 arXiv 쿼리(카테고리)를 동시에 증분 수집하는 클래스.
+
+    쿼리마다 ArxivHarvester(상태 파일은 쿼리별)를 두고 스레드 풀에서 함께 실행하며,
+    모든 요청은 하나의 RequestPacer를 공유해 arXiv에 보내는 요청 간격을 지킵니다.
+    교차 등록(cross-list)되어 여러 쿼리에 나온 논문은 버전을 뺀 arXiv ID로 합치고 카테고리를 병합합니다.
+    """
+
+    def __init__(self, queries: Sequence[str], store: Optional[PaperStore] = None,
+                 page_size: int = 100, max_results: int = 1000, retention_hours: int = 72,
+                 request_interval: float = 3.0, max_workers: Optional[int] = None):
+        """
+        Args:
+            queries (Sequence[str]): arXiv 검색 쿼리 목록 (예: ['cat:cs.AI', 'cat:cs.LG'])
+            store (PaperStore): 수집한 논문을 저장할 저장소 (선택)
+            page_size (int): 한 번에 받을 결과 수
+            max_results (int): 쿼리당 한 번의 실행에서 받을 최대 결과 수
+            retention_hours (int): 수집한 논문을 보관할 시간
+            request_interval (float): 전체 쿼리를 합친 arXiv 요청 간 최소 간격 (초)
+            max_workers (int): 동시에 수집할 쿼리 수 (기본값: 쿼리 수)
+        """
+        self.queries = list(queries)
+        self.pacer = RequestPacer(request_interval)
+        self.max_workers = max_workers or max(1, len(self.queries))
+        self.logger = logging.getLogger(__name__)
+        self.harvesters = [
+            ArxivHarvester(query=query, state_file=state_file_for(query), page_size=page_size,
+                           max_results=max_results, retention_hours=retention_hours, store=store,
+                           client=PoliteClient(self.pacer, page_size=page_size))
+            for query in self.queries
+        ]
+
+    def iter_papers(self, queue_size: int = 256) -> Iterator[Paper]:
+        """
+        쿼리별로 받는 대로(페이지 단위) 중복을 제거한 논문을 내보냅니다.
+
+        쿼리마다 스레드가 ArxivHarvester.iter_harvest를 돌며 크기가 queue_size로 제한된 큐에 넣으므로,
+        소비가 느리면 수집도 기다리고 대기 중인 논문은 큐 크기를 넘지 않습니다.
+        이미 내보낸 논문이 다른 쿼리에서 다시 나오면 내보낸 Paper의 categories 목록에 병합합니다
+        (논문 자체는 보관하지 않고 ID별 카테고리 목록만 기억).
+        한 쿼리가 실패해도 나머지 쿼리의 결과는 계속 내보내고, 소비를 중간에 멈추면 수집 스레드도 멈춥니다.
+        """
+        results: queue.Queue = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+        finished = object()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def work(harvester: ArxivHarvester):
+            papers = harvester.iter_harvest()
+            try:
+                if stop.is_set():
+                    return
+                for paper in papers:
+                    if not put(paper):
+                        return
+            except Exception as e:
+                self.logger.error(f"arXiv 수집 중 오류 발생 ({harvester.query}): {e}", exc_info=True)
+            finally:
+                papers.close()
+                put(finished)
+
+        seen: Dict[str, List[str]] = {}  # arXiv ID -> 내보낸 논문의 categories 목록
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for harvester in self.harvesters:
+                executor.submit(work, harvester)
+            remaining = len(self.harvesters)
+            try:
+                while remaining:
+                    paper = results.get()
+                    if paper is finished:
+                        remaining -= 1
+                        continue
+                    categories = seen.get(paper.arxiv_id)
+                    if categories is None:
+                        seen[paper.arxiv_id] = paper.categories
+                        yield paper
+                    else:
+                        categories.extend(category for category in paper.categories if category not in categories)
+            finally:
+                stop.set()
+
+    def harvest(self) -> List[Paper]:
+        """모든 쿼리를 수집하고 중복 제거된 논문을 최신순으로 반환합니다."""
+        papers = list(self.iter_papers())
+        papers.sort(key=lambda paper: paper.published, reverse=True)
+        return papers
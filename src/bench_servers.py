@@ -0,0 +1,325 @@
+import re
+import json
+import time
+import random
+import threading
+import datetime
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+from typing import Any, Dict, List, Optional
+
+EDITOR_HTML = Path(__file__).parent / 'bench_assets' / 'smart_editor.html'
+# 스트리밍 채팅 응답: 조각 수, 전체 지연 중 첫 조각까지의 비율
+STREAM_CHUNKS = 40
+STREAM_FIRST_TOKEN = 0.2
+
+TITLE_WORDS = ['Scalable', 'Efficient', 'Robust', 'Sparse', 'Multimodal', 'Causal', 'Federated', 'Contrastive',
+               'Diffusion', 'Transformer', 'Graph', 'Reinforcement', 'Language', 'Vision', 'Agents', 'Reasoning',
+               'Alignment', 'Retrieval', 'Distillation', 'Benchmark']
+ABSTRACT_WORDS = ['we', 'propose', 'a', 'novel', 'method', 'for', 'learning', 'representations', 'that', 'improves',
+                  'accuracy', 'on', 'standard', 'benchmarks', 'while', 'reducing', 'compute', 'and', 'memory',
+                  'our', 'experiments', 'show', 'deep learning', 'neural network', 'transformer', 'llm',
+                  'machine learning', 'results', 'across', 'tasks', 'with', 'theoretical', 'analysis']
+
+
+class BenchSettings:
+    """가짜 서비스 동작 설정 (프로세스 간 전달을 위해 단순 속성만 가짐)."""
+
+    def __init__(self, categories: Optional[List[str]] = None, papers_per_category: int = 50,
+                 llm_latency: float = 1.0, llm_jitter: float = 0.3, llm_error_rate: float = 0.0,
+                 content_chars: int = 3000, publish_latency: float = 0.2, seed: int = 42):
+        """
+        Args:
+            categories (List[str]): 피드에 있는 arXiv 카테고리
+            papers_per_category (int): 카테고리별 논문 수 (최근 72시간에 고르게 분포)
+            llm_latency (float): 채팅 응답 평균 지연 (초)
+            llm_jitter (float): 지연 변동 비율 (0.3이면 평균의 ±30%)
+            llm_error_rate (float): 503 응답을 돌려줄 확률
+            content_chars (int): 생성되는 본문 길이 (문자)
+            publish_latency (float): HTTP 발행 엔드포인트 응답 지연 (초)
+            seed (int): 피드/응답 생성용 난수 시드
+        """
+        self.categories = categories or ['cs.AI', 'cs.LG']
+        self.papers_per_category = papers_per_category
+        self.llm_latency = llm_latency
+        self.llm_jitter = llm_jitter
+        self.llm_error_rate = llm_error_rate
+        self.content_chars = content_chars
+        self.publish_latency = publish_latency
+        self.seed = seed
+
+
+def _atom_entry(arxiv_id: str, published: datetime.datetime, title: str, abstract: str,
+                authors: List[str], categories: List[str]) -> str:
+    stamp = published.strftime('%Y-%m-%dT%H:%M:%SZ')
+    author_xml = ''.join(f"<author><name>{escape(name)}</name></author>" for name in authors)
+    category_xml = ''.join(f'<category term="{category}" scheme="http://arxiv.org/schemas/atom"/>' for category in categories)
+    return (
+        f"<entry><id>http://arxiv.org/abs/{arxiv_id}v1</id><updated>{stamp}</updated><published>{stamp}</published>"
+        f"<title>{escape(title)}</title><summary>{escape(abstract)}</summary>{author_xml}"
+        f'<link href="http://arxiv.org/abs/{arxiv_id}v1" rel="alternate" type="text/html"/>'
+        f'<link title="pdf" href="http://arxiv.org/pdf/{arxiv_id}v1" rel="related" type="application/pdf"/>'
+        f'<arxiv:primary_category term="{categories[0]}" scheme="http://arxiv.org/schemas/atom"/>'
+        f"{category_xml}</entry>"
+    )
+
+
+class FakeFeed:
+    """
+    카테고리별 논문 목록을 결정적으로 만들어 arXiv API 형식(Atom)으로 페이지 단위 응답합니다.
+
+    각 카테고리의 5번째 논문마다 다음 카테고리에 교차 등록되어 중복 제거 경로도 거칩니다.
+    """
+
+    def __init__(self, settings: BenchSettings):
+        self.now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+        self.entries: Dict[str, List[Dict[str, Any]]] = {category: [] for category in settings.categories}
+        rng = random.Random(settings.seed)
+        count = settings.papers_per_category
+        spacing = datetime.timedelta(hours=72) / max(1, count)
+        for c, category in enumerate(settings.categories):
+            for i in range(count):
+                entry = {
+                    'id': f"2610.{c:01d}{i:04d}",
+                    'published': self.now - spacing * i - datetime.timedelta(seconds=c),
+                    'title': ' '.join(rng.sample(TITLE_WORDS, rng.randint(4, 9))),
+                    'abstract': ' '.join(rng.choice(ABSTRACT_WORDS) for _ in range(rng.randint(80, 220))),
+                    'authors': [f"Author {rng.randint(1, 999)}" for _ in range(rng.randint(1, 12))],
+                    'categories': [category],
+                }
+                self.entries[category].append(entry)
+                if i % 5 == 0 and len(settings.categories) > 1:
+                    other = settings.categories[(c + 1) % len(settings.categories)]
+                    entry['categories'].append(other)
+        for category in settings.categories:
+            for entry in list(self.entries[category]):
+                for other in entry['categories'][1:]:
+                    self.entries[other].append(entry)
+        for category in self.entries:
+            self.entries[category].sort(key=lambda entry: entry['published'], reverse=True)
+
+    def page(self, query: str, start: int, max_results: int) -> str:
+        category = query.split(':', 1)[-1].strip()
+        entries = self.entries.get(category, [])
+        body = ''.join(
+            _atom_entry(entry['id'], entry['published'], entry['title'], entry['abstract'],
+                        entry['authors'], entry['categories'])
+            for entry in entries[start:start + max_results]
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom" '
+            'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+            f"<title>ArXiv Query: {escape(query)}</title>"
+            f"<opensearch:totalResults>{len(entries)}</opensearch:totalResults>"
+            f"<opensearch:startIndex>{start}</opensearch:startIndex>"
+            f"<opensearch:itemsPerPage>{max_results}</opensearch:itemsPerPage>"
+            f"{body}</feed>"
+        )
+
+
+def fake_blog_post(prompt: str, content_chars: int, rng: random.Random) -> str:
+    """블로그 생성 프롬프트에 대한 응답 형식(```json 블록)의 가짜 글."""
+    match = re.search(r'제목: (.*)', prompt)
+    source_title = match.group(1).strip() if match else '논문'
+    sentence = f"이 연구는 {source_title}에 대한 새로운 접근을 제안합니다. "
+    paragraphs = []
+    length = 0
+    while length < content_chars:
+        paragraph = sentence * rng.randint(2, 5)
+        paragraphs.append(paragraph.strip())
+        length += len(paragraph) + 2
+    post = {
+        'blog_title': f"[벤치마크] {source_title[:30]}",
+        'blog_content': '\n\n'.join(paragraphs) + f"\n\n---\n원본 논문: [{source_title}](http://arxiv.org)",
+        'blog_tags': [f"태그{i}" for i in range(15)],
+    }
+    return f"```json\n{json.dumps(post, ensure_ascii=False, indent=2)}\n```"
+
+
+class BenchHandler(BaseHTTPRequestHandler):
+    """
+    벤치마크용 가짜 서비스 라우팅:
+      GET  /api/query                  arXiv Atom 피드
+      POST /v1/chat/completions        OpenAI 호환 채팅 응답 (지연/오류율 설정 가능, stream=true면 SSE)
+      GET  /                           쿠키 복원용 홈
+      GET  /{user}                     블로그 홈 (로그인 상태)
+      GET  /{user}/postwrite           SmartEditor 모형 페이지
+      POST /{user}/write               HTTP 발행 엔드포인트 (form)
+      POST /{user}/editor-publish      에디터 모형의 발행 요청 (JSON)
+      GET  /{user}/postview/{n}        발행된 글
+      GET  /_stats                     요청/발행 통계
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: str, content_type: str = 'text/html; charset=utf-8',
+              headers: Optional[Dict[str, str]] = None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _json(self, status: int, payload: Dict[str, Any]):
+        self._send(status, json.dumps(payload, ensure_ascii=False), 'application/json')
+
+    def do_GET(self):
+        server: BenchServer = self.server
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        if url.path == '/api/query':
+            params = parse_qs(url.query)
+            server.count('arxiv_requests')
+            feed = server.feed.page(params.get('search_query', [''])[0], int(params.get('start', ['0'])[0]),
+                                    int(params.get('max_results', ['100'])[0]))
+            self._send(200, feed, 'application/atom+xml; charset=utf-8')
+        elif url.path == '/_stats':
+            with server.lock:
+                self._json(200, {**server.stats, 'posts': len(server.posts)})
+        elif not parts:
+            self._send(200, '<html><body>home</body></html>')
+        elif len(parts) == 1:
+            self._send(200, f'<html><body><h1>{escape(parts[0])}</h1></body></html>')
+        elif parts[1] == 'postwrite':
+            server.count('editor_loads')
+            self._send(200, server.editor_html)
+        elif parts[1] == 'postview':
+            self._send(200, f'<html><body>post {escape(parts[-1])}</body></html>')
+        else:
+            self._send(404, 'not found')
+
+    def do_POST(self):
+        server: BenchServer = self.server
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        body = self._read_body()
+        if url.path.endswith('/chat/completions'):
+            self._chat(json.loads(body or b'{}'))
+        elif len(parts) == 2 and parts[1] in ('write', 'editor-publish'):
+            if parts[1] == 'write':
+                if 'NID_AUT' not in (self.headers.get('Cookie') or ''):
+                    self._send(302, '', headers={'Location': 'https://nid.naver.com/nidlogin.login'})
+                    return
+                form = parse_qs(body.decode('utf-8'))
+                post = {key: values[0] for key, values in form.items()}
+                time.sleep(server.settings.publish_latency)
+            else:
+                post = json.loads(body or b'{}')
+            log_no = server.add_post(parts[0], parts[1], post)
+            self._json(200, {'isSuccess': True, 'logNo': log_no, 'url': f"/{parts[0]}/postview/{log_no}"})
+        else:
+            self._send(404, 'not found')
+
+    def _chat(self, request: Dict[str, Any]):
+        server: BenchServer = self.server
+        settings = server.settings
+        with server.lock:
+            rng = random.Random(server.rng.random())
+        server.count('chat_requests')
+        delay = settings.llm_latency * rng.uniform(1 - settings.llm_jitter, 1 + settings.llm_jitter)
+        stream = bool(request.get('stream'))
+        # 스트리밍이면 첫 토큰까지 지연의 20%, 나머지는 조각 사이에 나누어 대기
+        time.sleep(max(0.0, delay * (STREAM_FIRST_TOKEN if stream else 1.0)))
+        if rng.random() < settings.llm_error_rate:
+            server.count('chat_errors')
+            self._json(503, {'error': {'message': 'injected outage'}})
+            return
+        prompt = ''.join(message.get('content', '') for message in request.get('messages', []))
+        content = fake_blog_post(prompt, settings.content_chars, rng)
+        usage = {'prompt_tokens': len(prompt) // 3, 'completion_tokens': len(content) // 3,
+                 'prompt_cache_hit_tokens': 0}
+        messages = request.get('messages') or []
+        if messages and messages[0].get('role') == 'system':
+            system = messages[0].get('content', '')
+            with server.lock:
+                if system in server.seen_system_prompts:
+                    usage['prompt_cache_hit_tokens'] = len(system) // 3
+                server.seen_system_prompts.add(system)
+        completion_id = f"bench-{rng.randint(0, 1 << 30)}"
+        if stream:
+            self._stream_chat(completion_id, request.get('model'), content, usage,
+                              max(0.0, delay * (1 - STREAM_FIRST_TOKEN)))
+            return
+        self._json(200, {
+            'id': completion_id,
+            'object': 'chat.completion',
+            'model': request.get('model'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            'usage': usage,
+        })
+
+    def _stream_chat(self, completion_id: str, model: Optional[str], content: str, usage: Dict[str, int],
+                     duration: float):
+        """SSE(text/event-stream)로 응답을 STREAM_CHUNKS개 조각으로 나누어 보냅니다 (연결 종료로 응답 끝 표시)."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        def event(payload: Dict[str, Any]):
+            self.wfile.write(f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+
+        size = max(1, -(-len(content) // STREAM_CHUNKS))
+        for start in range(0, len(content), size):
+            event({'id': completion_id, 'object': 'chat.completion.chunk', 'model': model,
+                   'choices': [{'index': 0, 'delta': {'content': content[start:start + size]}, 'finish_reason': None}]})
+            time.sleep(duration / STREAM_CHUNKS)
+        event({'id': completion_id, 'object': 'chat.completion.chunk', 'model': model,
+               'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})
+        event({'id': completion_id, 'object': 'chat.completion.chunk', 'model': model, 'choices': [], 'usage': usage})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class BenchServer(ThreadingHTTPServer):
+    """가짜 arXiv / DeepSeek / 블로그 서비스를 한 포트에서 제공하는 서버."""
+
+    daemon_threads = True
+
+    def __init__(self, settings: BenchSettings, host: str = '127.0.0.1', port: int = 0):
+        super().__init__((host, port), BenchHandler)
+        self.settings = settings
+        self.feed = FakeFeed(settings)
+        self.editor_html = EDITOR_HTML.read_text(encoding='utf-8')
+        self.rng = random.Random(settings.seed)
+        self.lock = threading.Lock()
+        self.stats: Dict[str, int] = {}
+        self.posts: List[Dict[str, Any]] = []
+        self.seen_system_prompts: set = set()  # 프리픽스 캐시 흉내 (같은 시스템 메시지는 캐시 적중)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name: str):
+        with self.lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def add_post(self, username: str, route: str, post: Dict[str, Any]) -> int:
+        with self.lock:
+            self.posts.append({'username': username, 'route': route, **post})
+            return len(self.posts)
+
+
+def serve(settings: BenchSettings, ready, host: str = '127.0.0.1', port: int = 0):
+    """별도 프로세스에서 서버를 실행합니다. 준비되면 ready 큐에 기본 URL을 넣습니다."""
+    server = BenchServer(settings, host, port)
+    ready.put(server.base_url)
+    server.serve_forever()
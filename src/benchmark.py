@@ -0,0 +1,257 @@
+"""
+오프라인 처리량 벤치마크.
+
+가짜 arXiv 피드, 지연/오류율을 설정할 수 있는 OpenAI 호환 채팅 서버, SmartEditor 모형 페이지와
+HTTP 발행 엔드포인트를 로컬(별도 프로세스)에 띄우고 run_posting_job을 처음부터 끝까지 실행합니다.
+실행마다 임시 디렉토리의 새 DB/캐시/상태 파일을 사용하므로 실제 데이터는 건드리지 않습니다.
+
+사용 예:
+    python benchmark.py --runs 3 --papers 100 --llm-latency 2 --llm-error-rate 0.05
+    python benchmark.py --publisher editor --headless   # Chrome 필요
+
+결과(papers/hour, 단계별 p50/p95, LLM 지연, CPU/RSS)는 화면에 출력하고 --output(JSON Lines)에 추가합니다.
+"""
+import os
+import sys
+import json
+import time
+import queue
+import pickle
+import logging
+import argparse
+import tempfile
+import contextlib
+import traceback
+import multiprocessing
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.request import urlopen
+from bench_servers import BenchSettings, serve
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_OUTPUT = Path(__file__).parent.parent / 'logs' / 'bench_reports.jsonl'
+BENCH_USER = 'benchuser'
+
+
+def peak_rss_mb() -> Optional[float]:
+    """현재 프로세스의 최대 RSS (MB). 측정할 수 없으면 None."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 바이트 단위
+        return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+    try:
+        import psutil
+        return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+    except Exception:
+        return None
+
+
+def bench_env(base_url: str, workdir: Path, args: argparse.Namespace) -> Dict[str, str]:
+    """run_posting_job이 가짜 서비스와 임시 디렉토리만 사용하도록 하는 환경 변수."""
+    cookies_file = workdir / 'naver_cookies.pkl'
+    host = base_url.split('://', 1)[1].split(':', 1)[0]
+    with open(cookies_file, 'wb') as f:
+        pickle.dump([{'name': name, 'value': 'bench', 'domain': host, 'path': '/'}
+                     for name in ('NID_AUT', 'NID_SES')], f)
+    return {
+        'DEEPSEEK_API_KEY': 'bench',
+        'DEEPSEEK_API_URL': f"{base_url}/v1/chat/completions",
+        'ARXIV_API_URL': f"{base_url}/api/query",
+        'ARXIV_CATEGORIES': ','.join(args.categories),
+        'ARXIV_REQUEST_INTERVAL': str(args.arxiv_interval),
+        'ARXIV_QUERY': '',
+        'ARXIV_STATE_DIR': str(workdir / 'state'),
+        'LLM_CACHE_DIR': str(workdir / 'llm_cache'),
+        'LLM_CACHE_BYPASS': '1',
+        'RUN_REPORT_FILE': str(workdir / 'run_reports.jsonl'),
+        'PAPER_DB_FILE': str(workdir / 'papers.db'),
+        'POST_CACHE_FILE': str(workdir / 'posted_papers.txt'),
+        'MAX_POSTS': str(args.max_posts),
+        'NAVER_USERNAME': BENCH_USER,
+        'NAVER_PASSWORD': 'bench',
+        'NAVER_ACCOUNTS': '',
+        'NAVER_COOKIES_FILE': str(cookies_file),
+        'NAVER_BLOG_URL': base_url,
+        'NAVER_HOME_URL': f"{base_url}/",
+        'CHROME_PROFILE_DIR': '',
+        'PUBLISH_BACKEND': 'http' if args.publisher == 'http' else 'selenium',
+        'PUBLISH_HTTP_URL': f"{base_url}/{{username}}/write",
+        'PUBLISH_FALLBACK': '0',
+        'PUBLISH_CONCURRENCY': '',
+        'POST_INTERVAL': str(args.post_interval),
+        'GENERATION_PREFETCH': str(args.prefetch),
+        'BODY_INSERT_MODE': args.insert_mode,
+        'HEADLESS': '1' if args.headless else '0',
+        'BROWSER_KEEP_WARM': '1',
+    }
+
+
+def run_job(env: Dict[str, str], verbose: bool, outcome):
+    """
+    별도 프로세스에서 run_posting_job을 한 번 실행하고 (CPU 초, 최대 RSS MB, 오류)를 outcome 큐에 넣습니다.
+
+    오류는 import/실행 중 발생한 예외의 traceback 문자열이며 성공하면 None입니다.
+    """
+    os.environ.update(env)
+    logging.basicConfig(level=logging.INFO if verbose else logging.WARNING,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    cpu_start = time.process_time()
+    error = None
+    try:
+        # 설정 모듈은 import 시점에 환경 변수를 읽으므로 환경을 정한 뒤 import
+        import main as job
+
+        if verbose:
+            job.run_posting_job(use_cache=True)
+        else:
+            with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+                job.run_posting_job(use_cache=True)
+    except BaseException:
+        error = traceback.format_exc()
+        raise
+    finally:
+        outcome.put((time.process_time() - cpu_start, peak_rss_mb(), error))
+
+
+def wait_outcome(worker: multiprocessing.Process, outcome, timeout: float) -> Tuple[float, Optional[float], Optional[str]]:
+    """
+    작업 프로세스의 (CPU 초, 최대 RSS MB, 오류)를 기다립니다.
+
+    프로세스가 결과 없이 종료되었거나(강제 종료 등) timeout초 안에 끝나지 않으면 종료시키고 오류로 반환합니다.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return outcome.get(timeout=1)
+        except queue.Empty:
+            pass
+        if not worker.is_alive():
+            # 종료 직전에 넣은 결과가 아직 큐에 도착하지 않았을 수 있음
+            try:
+                return outcome.get(timeout=1)
+            except queue.Empty:
+                return 0.0, None, f"작업 프로세스가 결과 없이 종료됨 (exit code {worker.exitcode})"
+        if time.monotonic() > deadline:
+            worker.terminate()
+            return 0.0, None, f"작업이 {timeout:.0f}초 안에 끝나지 않아 종료함"
+
+
+def summarize(report: Dict[str, Any], cpu_s: float, rss_mb: Optional[float],
+              server_stats: Dict[str, Any]) -> Dict[str, Any]:
+    duration = report.get('duration_s') or 0.0
+    posted = report.get('posted', 0)
+    return {
+        'run_id': report.get('run_id'),
+        'status': report.get('status'),
+        'duration_s': duration,
+        'posted': posted,
+        'processed': report.get('processed', 0),
+        'papers_per_hour': round(posted / duration * 3600, 1) if duration else 0.0,
+        'cpu_s': round(cpu_s, 3),
+        'cpu_util': round(cpu_s / duration, 3) if duration else 0.0,
+        'peak_rss_mb': rss_mb,
+        'stages': {name: {key: stage[key] for key in ('count', 'p50_s', 'p95_s', 'total_s')}
+                   for name, stage in report.get('stages', {}).items()},
+        'llm': report.get('llm', {}),
+        'counters': report.get('counters', {}),
+        'server': server_stats,
+    }
+
+
+def print_summary(index: int, result: Dict[str, Any]):
+    print(f"\n=== 실행 {index}: {result['status']}, {result['posted']}개 발행 / {result['duration_s']:.1f}초 "
+          f"-> {result['papers_per_hour']:.0f} papers/hour ===")
+    print(f"CPU {result['cpu_s']:.2f}초 (사용률 {result['cpu_util']:.0%}), 최대 RSS {result['peak_rss_mb']} MB")
+    llm = result['llm']
+    if llm:
+        print(f"LLM {llm.get('calls', 0)}회 (실패 {llm.get('failures', 0)}, 재시도 {llm.get('retries', 0)}), "
+              f"p50 {llm.get('latency_p50_s', 0):.2f}s / p95 {llm.get('latency_p95_s', 0):.2f}s")
+    print(f"{'단계':<32}{'횟수':>6}{'p50(s)':>10}{'p95(s)':>10}{'합계(s)':>10}")
+    for name, stage in result['stages'].items():
+        print(f"{name:<32}{stage['count']:>6}{stage['p50_s']:>10.3f}{stage['p95_s']:>10.3f}{stage['total_s']:>10.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description="가짜 서비스로 run_posting_job 처리량을 측정합니다.")
+    parser.add_argument('--runs', type=int, default=1, help="반복 실행 횟수")
+    parser.add_argument('--papers', type=int, default=50, help="카테고리별 가짜 논문 수")
+    parser.add_argument('--categories', type=lambda value: value.split(','), default=['cs.AI', 'cs.LG'])
+    parser.add_argument('--max-posts', type=int, default=10, help="실행당 최대 발행 수")
+    parser.add_argument('--llm-latency', type=float, default=1.0, help="채팅 응답 평균 지연 (초)")
+    parser.add_argument('--llm-jitter', type=float, default=0.3, help="지연 변동 비율")
+    parser.add_argument('--llm-error-rate', type=float, default=0.0, help="503 응답 확률")
+    parser.add_argument('--content-chars', type=int, default=3000, help="생성 본문 길이")
+    parser.add_argument('--publish-latency', type=float, default=0.2, help="HTTP 발행 응답 지연 (초)")
+    parser.add_argument('--publisher', choices=['http', 'editor'], default='http',
+                        help="http: HTTP 발행 백엔드, editor: Selenium으로 SmartEditor 모형 조작 (Chrome 필요)")
+    parser.add_argument('--insert-mode', default='paste', help="editor 방식의 본문 입력 방식")
+    parser.add_argument('--headless', action='store_true', help="editor 방식에서 창 없이 실행")
+    parser.add_argument('--prefetch', type=int, default=3, help="GENERATION_PREFETCH")
+    parser.add_argument('--post-interval', type=float, default=0, help="계정별 발행 간격 (초)")
+    parser.add_argument('--arxiv-interval', type=float, default=0, help="arXiv 요청 간격 (초)")
+    parser.add_argument('--run-timeout', type=float, default=1800, help="실행 하나의 최대 시간 (초, 넘으면 실패로 기록)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT, help="결과를 추가할 JSON Lines 파일")
+    parser.add_argument('--verbose', action='store_true', help="작업 로그/출력 표시")
+    args = parser.parse_args(argv)
+
+    settings = BenchSettings(args.categories, args.papers, args.llm_latency, args.llm_jitter,
+                             args.llm_error_rate, args.content_chars, args.publish_latency, args.seed)
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(settings, ready), daemon=True)
+    server.start()
+    base_url = ready.get(timeout=30)
+    print(f"- 가짜 서비스 시작: {base_url}")
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix='bench_') as tmp:
+            for index in range(1, args.runs + 1):
+                workdir = Path(tmp) / f"run{index}"
+                workdir.mkdir()
+                # 실행마다 새 프로세스: 설정 모듈/공유 클라이언트 상태가 섞이지 않고 CPU/RSS도 실행 단위로 측정
+                outcome = multiprocessing.Queue()
+                worker = multiprocessing.Process(target=run_job, args=(bench_env(base_url, workdir, args),
+                                                                       args.verbose, outcome))
+                worker.start()
+                cpu_s, rss_mb, error = wait_outcome(worker, outcome, args.run_timeout)
+                worker.join(timeout=10)
+                if worker.is_alive():
+                    worker.terminate()
+
+                run_settings = {**vars(settings), 'publisher': args.publisher, 'max_posts': args.max_posts,
+                                'prefetch': args.prefetch, 'insert_mode': args.insert_mode}
+                report_file = workdir / 'run_reports.jsonl'
+                if error is None and not report_file.exists():
+                    error = "실행 보고서가 기록되지 않음"
+                if error is not None:
+                    # 실패한 실행도 결과 파일에 남기고 다음 실행을 계속함
+                    results.append({'status': 'failed', 'error': error, 'settings': run_settings})
+                    print(f"\n=== 실행 {index}: 실패 ===\n{error}")
+                    continue
+
+                with open(report_file, encoding='utf-8') as f:
+                    report = json.loads(f.readlines()[-1])
+                with urlopen(f"{base_url}/_stats") as response:
+                    server_stats = json.loads(response.read())
+                result = summarize(report, cpu_s, rss_mb, server_stats)
+                result['settings'] = run_settings
+                results.append(result)
+                print_summary(index, result)
+    finally:
+        server.terminate()
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'a', encoding='utf-8') as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False, sort_keys=True) + '\n')
+    print(f"\n- 결과 저장: {args.output}")
+    return results
+
+
+if __name__ == '__main__':
+    sys.exit(1 if any(result['status'] == 'failed' for result in main()) else 0)
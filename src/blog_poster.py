@@ -1,34 +1,85 @@
 import os
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
 import logging
 from datetime import datetime
 import frontmatter
 import yaml
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
-from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-import requests
 from selenium.webdriver.common.action_chains import ActionChains
 from pathlib import Path
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options
 from dotenv import load_dotenv
 import re
+from body_inserter import InsertionStats, insert_body
+from waits import StepWaiter
+from driver_provider import get_provider
+from publishers import build_publisher, PublishUncertainError
+from instrumentation import span, timed, incr, add_time
+from session_manager import NaverSessionManager
+from llm_client import get_client
+from llm_limits import CircuitOpenError
+from json_stream import IncrementalJSONParser, parse_partial
+from prompts import Prompt, compact_abstract
+from config import PROMPT_ABSTRACT_TOKENS
+from post_stream import StreamingPost
+from paper import Paper
+from paper_store import PaperStore, paper_key
+
+# 태그를 생성하지 못했을 때 사용하는 기본 태그
+DEFAULT_TAGS = ['AI', '논문', '기술']
+
+
+def _flag(value: Any, default: bool = False) -> bool:
+    """'1', 'true', 'yes' 같은 설정 값을 bool로 변환합니다."""
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def account_configs(config: Dict) -> List[Dict]:
+    """
+    발행에 사용할 네이버 계정별 설정 목록을 만듭니다.
+
+    NAVER_ACCOUNTS(JSON 목록, 예: [{"username": "id", "password": "pw", "min_interval": 60, "max_posts": 3}])가
+    있으면 계정마다 쿠키 파일과 Chrome 프로필 디렉토리를 분리하고, 없으면 NAVER_USERNAME/NAVER_PASSWORD 한 계정을 사용합니다.
+    """
+    raw_accounts = config.get('NAVER_ACCOUNTS')
+    if not raw_accounts:
+        return [config]
+    accounts = json.loads(raw_accounts) if isinstance(raw_accounts, str) else raw_accounts
+    configs = []
+    for account in accounts:
+        username = account['username']
+        profile_dir = account.get('profile_dir')
+        if not profile_dir and config.get('CHROME_PROFILE_DIR'):
+            profile_dir = os.path.join(config['CHROME_PROFILE_DIR'], username)
+        configs.append({
+            **config,
+            'NAVER_USERNAME': username,
+            'NAVER_PASSWORD': account['password'],
+            'COOKIES_FILE': str(Path(__file__).parent.parent / 'config' / f'naver_cookies_{username}.pkl'),
+            'CHROME_PROFILE_DIR': profile_dir,
+            'MIN_POST_INTERVAL': account.get('min_interval'),
+            'MAX_POSTS_PER_ACCOUNT': account.get('max_posts'),
+        })
+    return configs
+
 
 class BlogPoster:
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, store: Optional[PaperStore] = None):
         self.config = config
+        self.store = store
         self.username = config.get('NAVER_USERNAME')
         self.password = config.get('NAVER_PASSWORD')
         self.api_key = config.get('DEEPSEEK_API_KEY')
         
-        self.naver_blog_url = "https://blog.naver.com"
+        self.naver_blog_url = config.get('NAVER_BLOG_URL') or "https://blog.naver.com"
         self.driver = None
         self.logger = logging.getLogger(__name__)
         
@@ -38,75 +89,62 @@ class BlogPoster:
         if not self.api_key:
              raise ValueError("DEEPSEEK_API_KEY not found in config")
 
-        self.api_url = config.get('DEEPSEEK_API_URL', "https://api.deepseek.com/chat/completions")
+        self.api_url = config.get('DEEPSEEK_API_URL') or "https://api.deepseek.com/chat/completions"
+        self.llm = get_client(self.api_key, self.api_url)
+        # LLM 응답을 스트리밍으로 받아 제목/본문이 완성되는 대로 에디터 입력 시작
+        self.stream_generation = _flag(config.get('LLM_STREAM'), True)
+        # 프롬프트에 넣는 초록의 최대 추정 토큰 수
+        self.abstract_tokens = int(config.get('PROMPT_ABSTRACT_TOKENS') or PROMPT_ABSTRACT_TOKENS)
         self.posts_dir = 'content/posts'
         self.images_dir = 'static/images'
-        self.cookies_file = Path(__file__).parent.parent / 'config' / 'naver_cookies.pkl'
+        # 계정별 쿠키 파일 (여러 계정 사용 시 account_configs에서 지정)
+        self.cookies_file = Path(config.get('COOKIES_FILE') or Path(__file__).parent.parent / 'config' / 'naver_cookies.pkl')
+        # 지정 시 Chrome 프로필(로그인 상태 포함)을 실행 간에 재사용
+        self.profile_dir = config.get('CHROME_PROFILE_DIR')
+        self.session = NaverSessionManager(self.cookies_file, self.login, self.check_login_status,
+                                           home_url=config.get('NAVER_HOME_URL') or 'https://www.naver.com')
+        # 본문 입력 방식: 'paste'(덩어리 붙여넣기), 'js'(문단별 DOM 삽입), 'char'(한 글자씩)
+        self.body_insert_mode = config.get('BODY_INSERT_MODE') or 'paste'
+        self.insertion_stats = InsertionStats()
+        self.wait_timeouts = config.get('WAIT_TIMEOUTS') or {}
+        self.waiter = None
+        # 브라우저는 계정별로 프로세스 안에서 공유되어, 다음 스케줄 실행에서도 다시 띄우지 않고 재사용
+        self.driver_provider = get_provider(
+            self.username, self.profile_dir,
+            headless=_flag(config.get('HEADLESS')),
+            light=_flag(config.get('BROWSER_LIGHT')),
+            keep_warm=_flag(config.get('BROWSER_KEEP_WARM'), True),
+            max_uses=int(config.get('BROWSER_MAX_USES') or 20),
+            max_heap_mb=float(config.get('BROWSER_MAX_HEAP_MB') or 1024),
+        )
+        # 발행 백엔드: 'selenium'(에디터 화면 조작) 또는 'http'(엔드포인트로 직접 발행, 실패 시 Selenium)
+        self.publisher = build_publisher(self, config)
         
-        self._setup_driver()
+        # HTTP 발행이면 브라우저는 Selenium 대체 발행이 필요할 때 띄움
+        if self.publisher.name == 'selenium':
+            self._setup_driver()
 
+    @timed('browser.setup')
     def _setup_driver(self) -> bool:
-        """WebDriver 설정"""
+        """WebDriver 설정 (같은 계정의 브라우저가 살아 있으면 재사용)"""
         try:
             print("- WebDriver 설정 시작...")
-            
-            # Chrome 옵션 설정
-            options = webdriver.ChromeOptions()
-            options.add_argument('--no-sandbox')
-            options.add_argument('--start-maximized')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            # User-Agent 설정
-            options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.159 Safari/537.36')
-            
-            print("- Chrome 옵션 설정 완료")
-            
-            try:
-                # webdriver_manager를 사용하여 ChromeDriver 자동 설치
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=options)
-                print("✓ ChromeDriver 자동 설치 및 설정 완료")
-            except Exception as e:
-                print(f"✗ ChromeDriver 자동 설치 실패: {e}")
-                print("- 수동 설치된 ChromeDriver 사용 시도...")
-                
-                # 수동 설치된 ChromeDriver 사용 시도
-                chromedriver_path = Path(__file__).parent / 'chromedriver' / 'chromedriver.exe'
-                if not chromedriver_path.exists():
-                    print("✗ ChromeDriver를 찾을 수 없습니다.")
-                    return False
-                    
-                service = Service(executable_path=str(chromedriver_path))
-                self.driver = webdriver.Chrome(service=service, options=options)
-                print("✓ 수동 설치된 ChromeDriver 설정 완료")
-            
-            # 페이지 로드 타임아웃 설정
-            self.driver.set_page_load_timeout(30)
-            
-            # JavaScript 코드 실행하여 웹드라이버 감지 방지
-            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-                'source': '''
-                    Object.defineProperty(navigator, 'webdriver', {
-                        get: () => undefined
-                    })
-                '''
-            })
-            
-            print("✓ WebDriver 설정 완료")
+            self.driver, fresh = self.driver_provider.acquire()
+            self.waiter = StepWaiter(self.driver, self.wait_timeouts)
+            if fresh:
+                # 새 브라우저는 로그인 상태를 다시 확인해야 함
+                self.session.reset()
+                print("✓ WebDriver 설정 완료")
+            else:
+                print("✓ 실행 중인 WebDriver 재사용")
             return True
             
         except Exception as e:
             print(f"✗ 웹드라이버 설정 실패: {e}")
-            if self.driver:
-                try:
-                    self.driver.quit()
-                except:
-                    pass
+            self.driver = None
             return False
 
+    @timed('login')
     def login(self):
         """네이버에 로그인합니다."""
         try:
@@ -114,28 +152,21 @@ class BlogPoster:
             
             # 네이버 로그인 페이지로 이동
             self.driver.get('https://nid.naver.com/nidlogin.login')
-            time.sleep(2)
+            self.waiter.element_present('login_form', (By.NAME, 'pw'))
             
             # JavaScript를 통한 로그인 정보 입력
             self.driver.execute_script(
                 f"document.getElementsByName('id')[0].value='{self.username}'")
-            time.sleep(0.5)
-            
             self.driver.execute_script(
                 f"document.getElementsByName('pw')[0].value='{self.password}'")
-            time.sleep(0.5)
             
             # 로그인 버튼 클릭
-            login_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CLASS_NAME, 'btn_login'))
-            )
+            login_button = self.waiter.element_clickable('login_button', (By.CLASS_NAME, 'btn_login'))
             login_button.click()
             
             # 로그인 성공 확인
             try:
-                WebDriverWait(self.driver, 5).until(
-                    lambda d: 'nid.naver.com/nidlogin.login' not in d.current_url
-                )
+                self.waiter.url_not_contains('login_redirect', 'nid.naver.com/nidlogin.login')
                 print(f"✓ 네이버 로그인 성공. 현재 URL: {self.driver.current_url}")
                 return True
             except TimeoutException:
@@ -150,8 +181,8 @@ class BlogPoster:
     def check_login_status(self):
         """현재 로그인 상태를 확인합니다."""
         try:
-            self.driver.get('https://blog.naver.com/gongnyangi')
-            time.sleep(2)
+            self.driver.get(f"{self.naver_blog_url}/{self.username}")
+            self.waiter.document_ready('page_load')
             
             # 로그인 버튼이 있는지 확인
             login_buttons = self.driver.find_elements(By.CLASS_NAME, 'log_btn')
@@ -160,27 +191,11 @@ class BlogPoster:
         except Exception:
             return False
 
-    def _call_api(self, prompt: str) -> str:
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        data = {
-            "model": "deepseek-chat",
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.7
-        }
-        
-        try:
-            response = requests.post(self.api_url, headers=headers, json=data)
-            response.raise_for_status()
-            return response.json()["choices"][0]["message"]["content"]
-        except Exception as e:
-            self.logger.error(f"API call failed: {str(e)}")
-            raise
+    def _call_api(self, prompt: Prompt) -> str:
+        return self.llm.chat(prompt)
 
-    def _generate_blog_content(self, paper: Dict[str, Any]) -> Dict[str, Any]:
-        """LLM을 호출하여 블로그 포스트 제목, 내용, 태그를 생성합니다."""
+    def _generate_blog_content(self, paper: Paper, stream: Optional[StreamingPost] = None) -> Dict[str, Any]:
+        """LLM을 호출하여 블로그 포스트 제목, 내용, 태그를 생성합니다. stream이 있으면 응답을 스트리밍으로 받습니다."""
         # LLM에 전달할 정보 준비
         title_orig = paper.get('title', 'N/A')
         url_orig = paper.get('url', 'URL 정보 없음') 
@@ -189,13 +204,8 @@ class BlogPoster:
         summary = paper.get('summary', '요약 정보 없음') # 요약 정보도 참고용
         translation = paper.get('translation', '번역 정보 없음') # 번역 정보도 참고용
         
-        prompt = f"""다음 논문 정보를 바탕으로, **깊이 있고 통찰력 있는** 블로그 포스트와 관련 태그를 생성해주세요.
-
-**원본 논문 정보:**
-*   제목: {title_orig}
-*   URL: {url_orig}
-*   분류: {classification}
-*   초록 (Abstract): {abstract_orig} 
+        # 지시문(고정)을 앞에, 논문 정보를 뒤에 두어 모든 글 생성 요청의 앞부분이 같도록 함 (프리픽스 캐시)
+        prompt = Prompt('blog', f"""아래 원본 논문 정보를 바탕으로, **깊이 있고 통찰력 있는** 블로그 포스트와 관련 태그를 생성해주세요.
 
 **요청 사항:**
 1.  **블로그 제목:**
@@ -210,10 +220,10 @@ class BlogPoster:
     *   **참고 정보:** 제공된 '초록(Abstract)' 내용을 **적극 활용**하여 깊이 있는 분석을 담아주세요.
     *   **가독성:** 친절하고 이해하기 쉬운 한글로 작성. 전문 용어는 (영어 원문) 병기.
     *   **형식:** 마크다운 사용. 원본 논문 제목 본문 내 언급. 댓글 유도 금지.
-    *   **★출처 명시★:** 본문 맨 마지막 줄에 다음 형식으로 원본 논문 출처 명시:
+    *   **★출처 명시★:** 본문 맨 마지막 줄에 다음 형식으로 원본 논문 정보의 제목과 URL을 그대로 사용해 출처 명시:
         ```
         --- 
-        원본 논문: [{title_orig}]({url_orig})
+        원본 논문: [원본 논문 제목](원본 논문 URL)
         ```
 3.  **블로그 태그:**
     *   논문의 핵심 내용(주제, 방법론, 주요 결과 등)을 가장 잘 나타내는 **관련성 높은 태그 15~20개**를 생성해주세요.
@@ -228,87 +238,160 @@ class BlogPoster:
   "blog_tags": ["태그1", "태그2", ..., "태그15"] 
 }}
 ```
-"""
+
+**원본 논문 정보:**
+*   제목: {title_orig}
+*   URL: {url_orig}
+*   분류: {classification}
+*   초록 (Abstract): {compact_abstract(abstract_orig, self.abstract_tokens)}
+""")
         try:
-            raw_response = self._call_api(prompt)
+            if stream is None:
+                raw_response = self._call_api(prompt)
+                parser = parse_partial(raw_response)
+            else:
+                # 스트리밍: 제목/본문 조각을 도착하는 대로 StreamingPost로 전달
+                parser = IncrementalJSONParser(on_field=stream.on_field, on_text=stream.on_text)
+                chunks = []
+                for chunk in self.llm.chat_stream(prompt):
+                    chunks.append(chunk)
+                    parser.feed(chunk)
+                raw_response = ''.join(chunks)
             print("--- LLM Raw Response ---")
             print(raw_response)
             print("-------------------------")
             
-            # JSON 응답 파싱 시도
+            # JSON 응답 파싱 (뒷부분이 잘리거나 깨져도 완성된 필드는 사용)
             try:
-                json_match = re.search(r'```json\n({.*?})\n```', raw_response, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(1)
-                    parsed_data = json.loads(json_str)
-                    
-                    required_keys = ['blog_title', 'blog_content', 'blog_tags']
-                    if all(key in parsed_data for key in required_keys) and isinstance(parsed_data['blog_tags'], list):
-                        print("✓ LLM 응답 JSON 파싱 성공 (제목, 본문, 태그)")
-                        
-                        # --- 태그 클리닝 --- 
-                        raw_tags = parsed_data['blog_tags']
-                        cleaned_tags = []
-                        seen_tags = set() # 중복 체크용 (소문자 기준)
-                        for tag in raw_tags:
-                            # 1. 허용 문자(한글,영문,숫자,공백) 외 제거
-                            cleaned_tag = re.sub(r'[^a-zA-Z0-9가-힣\s]', '', str(tag))
-                            # 2. 양끝 공백 제거 및 연속 공백 하나로
-                            cleaned_tag = ' '.join(cleaned_tag.split()).strip()
-                            # 3. 빈 태그 및 중복 태그 방지 (소문자 비교)
-                            if cleaned_tag and cleaned_tag.lower() not in seen_tags:
-                                cleaned_tags.append(cleaned_tag)
-                                seen_tags.add(cleaned_tag.lower())
-                                
-                        # 최대 30개로 제한
-                        final_tags = cleaned_tags[:30]
-                        print(f"- 클리닝 후 최종 태그 ({len(final_tags)}개): {final_tags}")
-                        # --------------------
-                        
-                        return {
-                            "title": parsed_data['blog_title'].strip(),
-                            "content": parsed_data['blog_content'].strip(),
-                            "tags": final_tags # 클리닝된 태그 사용
-                        }
-                    else:
-                        missing = [k for k in required_keys if k not in parsed_data]
-                        type_error = "blog_tags가 리스트가 아님" if 'blog_tags' in parsed_data and not isinstance(parsed_data['blog_tags'], list) else ""
-                        print(f"✗ LLM 응답 JSON 형식 오류 (누락 키: {missing}, 타입 오류: {type_error})")
-                        raise ValueError("LLM 응답 JSON 형식 오류")
-                else:
-                    print("✗ LLM 응답에서 JSON 블록을 찾을 수 없음")
+                parsed_data = parser.values
+                if not parser.values and parser.state == 'start':
+                    print("✗ LLM 응답에서 JSON 객체를 찾을 수 없음")
                     raise ValueError("LLM 응답 JSON 형식 오류 (JSON 블록 부재)")
+
+                blog_title = parsed_data.get('blog_title')
+                blog_content = parsed_data.get('blog_content')
+                if not (isinstance(blog_title, str) and blog_title.strip()
+                        and isinstance(blog_content, str) and blog_content.strip()):
+                    missing = [k for k in ('blog_title', 'blog_content') if not isinstance(parsed_data.get(k), str)]
+                    print(f"✗ LLM 응답 JSON 형식 오류 (누락 키: {missing}, 파싱 오류: {parser.error or '없음'})")
+                    raise ValueError("LLM 응답 JSON 형식 오류")
+
+                raw_tags = parsed_data.get('blog_tags')
+                if isinstance(raw_tags, list):
+                    print("✓ LLM 응답 JSON 파싱 성공 (제목, 본문, 태그)")
+                    if parser.error:
+                        print(f"- 태그 뒤 응답 형식 오류 무시: {parser.error}")
+                else:
+                    # 제목/본문은 완성되었으므로 생성 결과를 버리지 않고 기본 태그만 사용
+                    print(f"- blog_tags를 읽을 수 없음 ({parser.error or '누락 또는 리스트가 아님'}). 기본 태그 사용")
+                    raw_tags = DEFAULT_TAGS
+
+                # --- 태그 클리닝 --- 
+                cleaned_tags = []
+                seen_tags = set() # 중복 체크용 (소문자 기준)
+                for tag in raw_tags:
+                    # 1. 허용 문자(한글,영문,숫자,공백) 외 제거
+                    cleaned_tag = re.sub(r'[^a-zA-Z0-9가-힣\s]', '', str(tag))
+                    # 2. 양끝 공백 제거 및 연속 공백 하나로
+                    cleaned_tag = ' '.join(cleaned_tag.split()).strip()
+                    # 3. 빈 태그 및 중복 태그 방지 (소문자 비교)
+                    if cleaned_tag and cleaned_tag.lower() not in seen_tags:
+                        cleaned_tags.append(cleaned_tag)
+                        seen_tags.add(cleaned_tag.lower())
+                        
+                # 최대 30개로 제한
+                final_tags = cleaned_tags[:30]
+                print(f"- 클리닝 후 최종 태그 ({len(final_tags)}개): {final_tags}")
+                # --------------------
+                
+                return {
+                    "title": blog_title.strip(),
+                    "content": blog_content.strip(),
+                    "tags": final_tags # 클리닝된 태그 사용
+                }
                     
-            except (json.JSONDecodeError, ValueError) as e:
+            except ValueError as e:
                 print(f"✗ LLM 응답 파싱 실패: {e}. 기본 내용 사용 시도.")
+                # 파싱할 수 없는 응답은 캐시에서 제거해 재시도 시 새로 생성
+                self.llm.forget(prompt)
                 return {
                     "title": f"[요약] {title_orig}", 
                     "content": f"# {title_orig}\n\n{summary}\n\n(LLM 콘텐츠 생성 실패)",
-                    "tags": ['AI', '논문', '기술'] # 기본 태그
+                    "tags": list(DEFAULT_TAGS), # 기본 태그
+                    "fallback": True
                 }
                 
+        except CircuitOpenError as e:
+            # 제공자 장애: 오류 안내 글을 발행하지 않도록 예외를 올려 이 논문을 건너뜀
+            print(f"✗ LLM 제공자 장애로 콘텐츠 생성 건너뜀: {e}")
+            raise
         except Exception as e:
             self.logger.error(f"Error generating blog content: {str(e)}", exc_info=True)
             print(f"✗ 블로그 콘텐츠 생성 중 오류 발생: {e}")
             return {
                 "title": f"[오류] {title_orig}",
                 "content": f"# {title_orig}\n\n블로그 콘텐츠 생성 중 오류가 발생했습니다.\n\n오류: {e}",
-                "tags": ['오류', 'AI', '논문'] # 오류 시 기본 태그
+                "tags": ['오류', 'AI', '논문'], # 오류 시 기본 태그
+                "fallback": True
             }
 
-    def create_post(self, title: str, content: str, tags: List[str]) -> bool:
-        """네이버 블로그에 글을 포스팅합니다. (이전 코드 참고, iframe 처리 제거)"""
+    def _insert_streamed_body(self, stream: StreamingPost, started: float) -> Tuple[str, int]:
+        """
+        생성 중인 본문을 완성된 줄 단위로 모아 도착하는 대로 입력합니다.
+
+        줄 끝 공백은 다음 조각과 함께 입력해 최종 본문(strip)과 같은 문단 구성이 되도록 합니다.
+        Returns:
+            Tuple[str, int]: (마지막으로 사용된 입력 방식, 입력한 문자 수)
+        """
+        mode, total_chars, pending = self.body_insert_mode, 0, ''
+
+        def insert(text: str):
+            nonlocal mode, total_chars
+            if total_chars == 0:
+                add_time('publish.first_keystroke', time.perf_counter() - started)
+            # 한 번 대체된 방식은 다음 조각에도 사용
+            mode = insert_body(self.driver, text, mode, self.insertion_stats)
+            total_chars += len(text)
+
+        with span('publish.editor.type'):
+            for chunk in stream.iter_content():
+                pending += chunk
+                if total_chars == 0:
+                    pending = pending.lstrip()
+                text = pending[:pending.rfind('\n') + 1].rstrip()
+                if text:
+                    insert(text)
+                    pending = pending[len(text):]
+            pending = pending.rstrip()
+            if pending:
+                insert(pending)
+        incr('chars_typed', total_chars)
+        return mode, total_chars
+
+    @timed('publish.editor')
+    def create_post(self, title: str, content: Union[str, StreamingPost], tags: Optional[List[str]]) -> bool:
+        """
+        네이버 블로그에 글을 포스팅합니다. (이전 코드 참고, iframe 처리 제거)
+
+        content가 StreamingPost이면 생성 중인 본문을 도착하는 대로 입력하고, 태그는 생성 결과에서 가져옵니다.
+        """
+        started = time.perf_counter()
         if not self.driver:
             self.logger.error("WebDriver가 초기화되지 않았습니다.")
             return False
 
         try:
             # 1. 글쓰기 페이지로 직접 이동 (이전 코드 방식)
-            write_url = f"https://blog.naver.com/{self.username}/postwrite"
+            write_url = f"{self.naver_blog_url}/{self.username}/postwrite"
             print(f"- 글쓰기 페이지로 직접 이동 시도: {write_url}")
+            self.waiter.reset()
             self.driver.get(write_url)
-            print("- 페이지 로딩 대기 (5초)...") # 대기 시간 5초로 수정
-            time.sleep(5) 
+            print("- 페이지 로딩 대기...")
+            try:
+                self.waiter.document_ready('page_load')
+                self.waiter.network_idle('editor_ready')
+            except TimeoutException:
+                print("- 페이지 로딩 대기 시간 초과 - 계속 진행")
             current_url = self.driver.current_url
             print(f"- 현재 URL: {current_url}")
 
@@ -319,15 +402,13 @@ class BlogPoster:
             # 2. 이전 글 작성 확인 팝업 처리 (이전 코드 참고)
             try:
                 print("- 이전 글 팝업 확인 중...")
-                WebDriverWait(self.driver, 5).until(
-                     EC.presence_of_element_located((By.CLASS_NAME, 'se-popup-button-text'))
-                )
+                self.waiter.element_present('popup', (By.CLASS_NAME, 'se-popup-button-text'))
                 cancel_buttons = self.driver.find_elements(By.CLASS_NAME, 'se-popup-button-text')
                 if cancel_buttons:
                     for button in cancel_buttons:
                         if '취소' in button.text or 'cancel' in button.text.lower():
                             button.click()
-                            time.sleep(3) # 팝업 닫히는 시간
+                            self.waiter.element_gone('popup_close', (By.CLASS_NAME, 'se-popup-button-text'))
                             print("- 이전 글 '취소' 처리 완료")
                             break
             except TimeoutException:
@@ -336,7 +417,6 @@ class BlogPoster:
                 print(f"- 이전 글 팝업 처리 중 오류 (무시하고 계속): {e}")
 
             # 3. 도움말 닫기 버튼 처리 (이전 코드 참고)
-            time.sleep(2)
             try:
                 print("- 도움말 팝업 확인 중...")
                 help_buttons = self.driver.find_elements(By.XPATH, "//button[contains(text(), '닫기') or contains(@class, 'close')]")
@@ -345,7 +425,7 @@ class BlogPoster:
                          if button.is_displayed() and button.is_enabled():
                              print("- 도움말 닫기 버튼 클릭 시도...")
                              button.click()
-                             time.sleep(2)
+                             self.waiter.until('help_close', EC.invisibility_of_element(button))
                              print("- 도움말 닫기 완료")
                              break
                      except Exception as inner_e: # StaleElementReference 등 예외 처리
@@ -366,9 +446,7 @@ class BlogPoster:
                 ]
                 for i, selector in enumerate(title_selectors):
                     try:
-                        title_area = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                        )
+                        title_area = self.waiter.element_clickable('title', (By.CSS_SELECTOR, selector))
                         print(f"- 제목 영역 찾음 (선택자 {i+1}: {selector})")
                         break # 찾으면 루프 종료
                     except TimeoutException:
@@ -380,21 +458,16 @@ class BlogPoster:
                
                 # 제목 입력 수정: 클릭 -> 지우기 -> 새 제목 입력 -> Enter (이전 코드 참고)
                 title_area.click()
-                time.sleep(0.5)
                 # Ctrl+A, Delete
                 if os.name == 'nt': ActionChains(self.driver).key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL).perform()
                 else: ActionChains(self.driver).key_down(Keys.COMMAND).send_keys('a').key_up(Keys.COMMAND).perform()
-                time.sleep(0.2)
                 ActionChains(self.driver).send_keys(Keys.DELETE).perform()
-                time.sleep(0.2)
                 # 새 제목 입력
                 actions = ActionChains(self.driver) # 제목 입력을 위한 ActionChains
                 actions.send_keys(title)
-                time.sleep(0.5)
                 # Enter 키 추가 (이전 코드 참고)
                 actions.send_keys(Keys.ENTER).perform()
                 print("- 제목 입력 및 Enter 완료")
-                time.sleep(1.5) # Enter 후 본문 활성화 대기 시간 증가 (1.0 -> 1.5)
                 
                 # --- 본문 영역으로 포커스 이동 (클릭 방식 변경) --- 
                 print("- 본문 영역으로 포커스 이동 시도 (JavaScript 클릭)...")
@@ -409,15 +482,17 @@ class BlogPoster:
                 for i, selector in enumerate(body_selectors):
                     try:
                          # 요소를 먼저 찾음
-                         editor_element = WebDriverWait(self.driver, 3).until(
-                             EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                         )
+                         editor_element = self.waiter.element_present('body', (By.CSS_SELECTOR, selector))
                          print(f"- 본문 영역 찾음 (선택자 {i+1}: {selector})")
                          # JavaScript로 클릭 시도 (이전 코드 방식)
                          try:
                              self.driver.execute_script("arguments[0].scrollIntoView(true); arguments[0].click();", editor_element)
                              print("- 본문 영역 JavaScript 클릭 성공 (포커스 이동)")
-                             time.sleep(1.0) # 클릭 후 대기 시간 유지
+                             try:
+                                 self.waiter.until('body_focus', lambda d: d.execute_script(
+                                     "return !!(document.activeElement && document.activeElement.isContentEditable);"))
+                             except TimeoutException:
+                                 print("- 본문 포커스 확인 불가 - 계속 진행")
                              clicked_body = True
                              break # 성공 시 루프 종료
                          except Exception as click_e:
@@ -443,47 +518,49 @@ class BlogPoster:
             # 5. 본문 입력 (기본 content, 포커스 이동 후)
             try:
                 print("- 본문 내용 입력 시작...")
-                time.sleep(0.5) # 본문 입력 시작 전 추가 대기
-                actions = ActionChains(self.driver) # 본문 입력을 위한 ActionChains 새로 생성
-                cleaned_content = content.strip()
-                total_chars = len(cleaned_content)
-                print(f"- 총 {total_chars} 문자 입력 예정")
-
-                for i, char in enumerate(cleaned_content):
-                    if char == '\n':
-                        actions.send_keys(Keys.ENTER)
-                    else:
-                        actions.send_keys(char)
-                    actions.perform()
-                    time.sleep(0.02) # 이전 커밋에서 주석 처리됨
-
-                    if (i + 1) % 100 == 0 or (i + 1) == total_chars:
-                        print(f"  ... {i+1}/{total_chars} 문자 입력 완료")
-
-                print("- 모든 본문 문자 입력 완료.")
-                time.sleep(1)
+                if isinstance(content, StreamingPost):
+                    # 생성 중인 본문: 도착하는 대로 줄 단위로 입력
+                    print(f"- 생성 중인 본문을 도착하는 대로 입력 (방식: {self.body_insert_mode})")
+                    used_mode, total_chars = self._insert_streamed_body(content, started)
+                else:
+                    cleaned_content = content.strip()
+                    total_chars = len(cleaned_content)
+                    print(f"- 총 {total_chars} 문자 입력 예정 (방식: {self.body_insert_mode})")
+
+                    add_time('publish.first_keystroke', time.perf_counter() - started)
+                    with span('publish.editor.type'):
+                        used_mode = insert_body(self.driver, cleaned_content, self.body_insert_mode, self.insertion_stats)
+                    incr('chars_typed', total_chars)
+                self.logger.info(f"본문 입력 누적 통계: {self.insertion_stats.summary()}")
+
+                print(f"- 모든 본문 문자 입력 완료 ({total_chars}자, 사용 방식: {used_mode}).")
 
             except Exception as e:
                 print(f"✗ 본문 입력 실패: {e}")
                 return False
 
+            if isinstance(content, StreamingPost):
+                # 본문이 중간에 끊긴 생성(대체 콘텐츠)은 발행하지 않음
+                final_post = content.result()
+                if final_post.get('fallback'):
+                    print("✗ 콘텐츠 생성 실패 - 입력 중인 글을 발행하지 않고 중단")
+                    return False
+                tags = final_post['tags']
+
             # 6. 1단계 발행 버튼 클릭 (JavaScript 우선, 이전 코드 참고)
             try:
                 print("- 1단계 발행 버튼 클릭 시도 (JavaScript)... ")
                 publish_script = "document.querySelector('button.publish_btn__m9KHH').click(); return true;"
                 try:
                     self.driver.execute_script(publish_script)
-                    print("- 1단계 발행 버튼 클릭 완료 (JavaScript). 발행 설정 창 대기 (5초)...")
-                    time.sleep(5)
+                    print("- 1단계 발행 버튼 클릭 완료 (JavaScript). 발행 설정 창 대기...")
                 except Exception as js_e:
                     print(f"- JavaScript 클릭 실패 ({js_e}), Selenium 클릭 시도...")
                     publish_button_selector = 'button.publish_btn__m9KHH'
-                    publish_button = WebDriverWait(self.driver, 10).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, publish_button_selector))
-                    )
+                    publish_button = self.waiter.element_clickable('publish_dialog', (By.CSS_SELECTOR, publish_button_selector))
                     publish_button.click()
-                    print("- 1단계 발행 버튼 클릭 완료 (Selenium). 발행 설정 창 대기 (5초)...")
-                    time.sleep(5)
+                    print("- 1단계 발행 버튼 클릭 완료 (Selenium). 발행 설정 창 대기...")
+                self.waiter.element_present('publish_dialog', (By.CSS_SELECTOR, 'button.confirm_btn__WEaBq'))
             except Exception as e:
                 print(f"✗ 1단계 발행 버튼 클릭 실패: {e}")
                 return False
@@ -492,30 +569,22 @@ class BlogPoster:
             try:
                 print("- 카테고리 선택 중...")
                 category_button_selector = 'button.selectbox_button__jb1Dt'
-                category_button = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, category_button_selector))
-                )
+                category_button = self.waiter.element_clickable('category', (By.CSS_SELECTOR, category_button_selector))
                 category_button.click()
-                time.sleep(1)
                 
                 # 카테고리명 확인 필요! 'AI 연구뉴스'가 맞는지 확인하세요.
                 # 주의: for 속성값 '18'은 동적으로 변할 수 있음. 텍스트 기반이 더 나을 수 있음.
                 category_text_xpath = "//label[contains(., 'AI 연구뉴스')]"
                 try:
-                    category_label = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, category_text_xpath))
-                    )
+                    category_label = self.waiter.element_clickable('category', (By.XPATH, category_text_xpath))
                 except TimeoutException:
                     # 카테고리 ID '18' 시도 (Fallback)
                     category_label_selector = 'label[for="category-18"]'
                     print(f"- 카테고리 텍스트 선택자 실패, ID({category_label_selector}) 기반 시도...")
-                    category_label = WebDriverWait(self.driver, 5).until(
-                         EC.element_to_be_clickable((By.CSS_SELECTOR, category_label_selector))
-                    )
+                    category_label = self.waiter.element_clickable('category', (By.CSS_SELECTOR, category_label_selector))
 
                 category_label.click()
                 print("✓ 카테고리 선택 완료")
-                time.sleep(1)
             except Exception as e:
                 print(f"✗ 카테고리 선택 실패 (무시하고 진행): {e}")
 
@@ -524,16 +593,16 @@ class BlogPoster:
                 try:
                     print("- 태그 입력 시작...")
                     tag_input_selector = 'input#tag-input.tag_input__rvUB5'
-                    tag_input = WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, tag_input_selector))
-                    )
+                    tag_input = self.waiter.element_present('tag_input', (By.CSS_SELECTOR, tag_input_selector))
                     for tag in tags:
                         tag_input.clear()
-                        time.sleep(0.1)
                         tag_input.send_keys(tag)
-                        time.sleep(0.5)
                         tag_input.send_keys(Keys.ENTER)
-                        time.sleep(1)
+                        # 태그가 등록되면 입력창이 비워짐
+                        try:
+                            self.waiter.until('tag', lambda d: not tag_input.get_attribute('value'))
+                        except TimeoutException:
+                            print(f"- 태그 등록 확인 불가 (무시하고 진행): {tag}")
                     print("- 모든 태그 입력 완료")
                 except Exception as e:
                     print(f"✗ 태그 입력 실패 (무시하고 진행): {e}")
@@ -546,18 +615,20 @@ class BlogPoster:
                 final_publish_script = "document.querySelector('button.confirm_btn__WEaBq[data-testid=\"seOnePublishBtn\"]\').click(); return true;"
                 try:
                     self.driver.execute_script(final_publish_script)
-                    print("- 2단계 최종 발행 버튼 클릭 완료 (JavaScript). 포스팅 완료 대기 (7초)...")
-                    time.sleep(7)
+                    print("- 2단계 최종 발행 버튼 클릭 완료 (JavaScript). 포스팅 완료 대기...")
                 except Exception as js_e:
                     print(f"- JavaScript 클릭 실패 ({js_e}), Selenium 클릭 시도...")
-                    final_publish_button_selector = 'button.confirm_btn__WEaBq[data-testid=\"seOnePublishBtn\"]\''
-                    final_publish_button = WebDriverWait(self.driver, 10).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, final_publish_button_selector))
-                    )
+                    final_publish_button_selector = 'button.confirm_btn__WEaBq[data-testid="seOnePublishBtn"]'
+                    final_publish_button = self.waiter.element_clickable('publish_dialog', (By.CSS_SELECTOR, final_publish_button_selector))
                     final_publish_button.click()
-                    print("- 2단계 최종 발행 버튼 클릭 완료 (Selenium). 포스팅 완료 대기 (7초)...")
-                    time.sleep(7)
-                
+                    print("- 2단계 최종 발행 버튼 클릭 완료 (Selenium). 포스팅 완료 대기...")
+
+                try:
+                    self.waiter.url_not_contains('publish_done', 'postwrite')
+                except TimeoutException:
+                    pass
+                self.logger.info(f"포스팅 단계별 대기 시간: {self.waiter.summary()}")
+
                 if "postwrite" not in self.driver.current_url.lower():
                      print("✓ 블로그 포스팅 성공!")
                      return True
@@ -582,40 +653,100 @@ class BlogPoster:
                 print(f"- 스크린샷 저장 실패: {ss_e}")
             return False
 
-    def post_paper(self, paper: Dict[str, Any]) -> Dict[str, Any]:
-        """논문을 블로그에 포스팅합니다."""
+    def new_stream(self) -> Optional[StreamingPost]:
+        """스트리밍 생성을 사용하면 generate_post에 넘길 StreamingPost를 만듭니다."""
+        return StreamingPost() if self.stream_generation else None
+
+    @timed('generate')
+    def generate_post(self, paper: Paper, stream: Optional[StreamingPost] = None) -> Dict[str, Any]:
+        """
+        LLM으로 블로그 제목, 내용, 태그를 생성합니다. 브라우저를 사용하지 않으므로 별도 스레드에서 호출할 수 있습니다.
+
+        stream이 있으면 응답을 스트리밍으로 받아 완성되는 필드를 바로 넘기고, 끝나면 최종 결과로 finish합니다.
+        """
+        try:
+            generated_post = self._generate_post(paper, stream)
+        except Exception as e:
+            if self.store is not None and paper_key(paper):
+                self.store.fail_stage(paper_key(paper), 'generate', str(e))
+            if stream is not None:
+                stream.fail(e)
+            raise
+        if stream is not None:
+            stream.finish(generated_post)
+        return generated_post
+
+    def _generate_post(self, paper: Paper, stream: Optional[StreamingPost]) -> Dict[str, Any]:
+        key = paper_key(paper)
+        if self.store is not None and key:
+            stored = self.store.get_artifact(key, 'blog_post')
+            if stored is not None:
+                self.logger.info(f"Using stored blog content: {stored['title']}")
+                self.store.advance_stage([key], 'generated')
+                return stored
+
+        generated_post = self._generate_blog_content(paper, stream)
+        # 기본/오류 내용은 저장하지 않아 다음 실행에서 다시 생성
+        if self.store is not None and key and not generated_post.get('fallback'):
+            self.store.save_artifact(key, 'blog_post', generated_post)
+            self.store.advance_stage([key], 'generated')
+        self.logger.info(f"Generated Blog Title: {generated_post['title']}")
+        self.logger.info(f"Generated Tags: {generated_post['tags']}")
+        return generated_post
+
+    @timed('publish')
+    def publish_post(self, paper: Paper, generated_post: Union[Dict[str, Any], StreamingPost]) -> Dict[str, Any]:
+        """
+        미리 생성된 콘텐츠를 블로그에 포스팅합니다.
+
+        generated_post가 아직 생성 중인 StreamingPost이고 발행 방식이 스트리밍 입력을 지원하면(에디터),
+        제목이 완성되는 즉시 입력을 시작하고 본문은 도착하는 대로 입력합니다.
+        """
         original_title = paper.get('title', 'N/A')
         self.logger.info(f"Posting paper (Original Title): {original_title}")
 
         try:
-            # LLM 호출하여 새로운 한글 제목, 내용, 태그 생성
-            generated_post = self._generate_blog_content(paper)
-            blog_title = generated_post['title']
-            blog_content = generated_post['content']
-            tags = generated_post['tags'] # LLM이 생성한 태그 사용
-            self.logger.info(f"Generated Blog Title: {blog_title}")
-            self.logger.info(f"Generated Tags: {tags}")
+            streaming = None
+            if isinstance(generated_post, StreamingPost):
+                if not generated_post.done and getattr(self.publisher, 'streaming', False):
+                    with span('publish.title_wait'):
+                        streamed_title = generated_post.wait_title()
+                    if streamed_title:
+                        streaming = generated_post
+                if streaming is None:
+                    with span('publish.generation_wait'):
+                        generated_post = generated_post.result()
 
             # 분류 정보는 가져오기 (필요시)
             classification = paper.get('classification', paper.get('categories', ['AI Research'])[0])
-            
-            # 블로그에 포스팅 (생성된 제목, 내용, 태그 사용)
-            if not self.driver:
-                if not self._setup_driver():
-                    raise Exception("Failed to setup WebDriver")
 
-            if not self.login():
-                raise Exception("Failed to login")
+            if streaming is not None:
+                print(f"- 생성 중인 콘텐츠 발행 시작 (Title: {streamed_title})")
+                published = self.publisher.publish(streamed_title, streaming, None)
+                generated_post = streaming.result()
+            else:
+                # 블로그에 포스팅 (생성된 제목, 내용, 태그 사용)
+                published = self.publisher.publish(generated_post['title'], generated_post['content'],
+                                                   generated_post['tags'])
+            blog_title = generated_post['title']
+            blog_content = generated_post['content']
+            tags = generated_post['tags'] # LLM이 생성한 태그 사용
 
-            if not self.create_post(blog_title, blog_content, tags):
+            if not published:
                  print(f"✗ 포스팅 생성 실패 (Title: {blog_title})")
                  raise Exception("Failed to create post")
 
-            self.logger.info(f"Successfully posted paper: {original_title} (as: {blog_title})")
+            self.logger.info(f"Successfully posted paper: {original_title} (as: {blog_title}, 방식: {self.publisher.name})")
+            if self.store is not None and paper_key(paper):
+                self.store.mark_published(paper_key(paper), blog_title)
 
             # 결과 반환 (생성된 제목, 태그 포함)
             return {
-                "paper_id": paper.get("paper_id", "N/A"),
+                # 저장소/캐시/실행 작업과 같은 키 (arXiv entry URL), 정규화된 arXiv ID는 arxiv_id
+                "paper_id": paper_key(paper) or "N/A",
+                "arxiv_id": paper.get("paper_id", "N/A"),
+                "account": self.username,
+                "backend": self.publisher.name,
                 "original_title": original_title,
                 "blog_title": blog_title, 
                 "classification": classification, 
@@ -624,6 +755,16 @@ class BlogPoster:
             }
         except Exception as e:
             self.logger.error(f"Error posting paper {original_title}: {str(e)}", exc_info=True)
+            if self.store is not None and paper_key(paper):
+                # 글이 저장된 뒤의 실패만 발행 단계 실패로 기록 (저장된 글로 발행만 다시 시도할 수 있음).
+                # 발행 여부를 알 수 없는 실패는 --retry-failed로 다시 올리지 않도록 따로 기록
+                if isinstance(e, PublishUncertainError):
+                    step = 'publish_unconfirmed'
+                elif self.store.get_stage(paper_key(paper)) in ('generated', 'published'):
+                    step = 'publish'
+                else:
+                    step = 'generate'
+                self.store.mark_failed(paper_key(paper), str(e), step=step)
             try:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 screenshot_path = f'error_post_paper_{timestamp}.png'
@@ -633,7 +774,13 @@ class BlogPoster:
                 print(f"- 스크린샷 저장 실패: {ss_e}")
             raise
 
-    def save_post_to_file(self, content: str, paper: Dict[str, Any]) -> bool:
+    def post_paper(self, paper: Paper) -> Dict[str, Any]:
+        """논문을 블로그에 포스팅합니다. (콘텐츠 생성 후 바로 발행)"""
+        # LLM 호출하여 새로운 한글 제목, 내용, 태그 생성
+        generated_post = self.generate_post(paper)
+        return self.publish_post(paper, generated_post)
+
+    def save_post_to_file(self, content: str, paper: Paper) -> bool:
         """
         생성된 내용을 개별 파일로 저장합니다.
         """
@@ -709,13 +856,16 @@ class BlogPoster:
             self.logger.error(f"Error while generating RSS: {str(e)}")
 
     def close(self):
-        """WebDriver를 종료합니다."""
+        """발행 백엔드를 닫고 WebDriver를 반납합니다. (BROWSER_KEEP_WARM이면 다음 실행을 위해 브라우저를 살려 둠)"""
+        self.publisher.close()
         if self.driver:
             try:
-                print("- WebDriver 종료 중...")
-                self.driver.quit()
+                print("- WebDriver 반납 중...")
+                if self.session.has_session_cookies(self.driver):
+                    self.session.save(self.driver)
+                closed = self.driver_provider.release(self.driver)
                 self.driver = None
-                print("✓ WebDriver 종료 완료")
+                print("✓ WebDriver 종료 완료" if closed else "✓ WebDriver 반납 완료 (브라우저 유지)")
             except Exception as e:
                 print(f"✗ WebDriver 종료 중 오류 발생: {e}")
                 self.driver = None # 오류 발생 시에도 None으로 설정 
\ No newline at end of file
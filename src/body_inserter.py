@@ -0,0 +1,190 @@
+import time
+import logging
+from typing import Dict, List, Optional
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.keys import Keys
+
+# 붙여넣기 이벤트를 에디터에 직접 발생시키는 스크립트.
+# 에디터가 이벤트를 처리(preventDefault)하면 false, 처리하지 않으면 true 를 반환합니다.
+PASTE_SCRIPT = """
+const text = arguments[0];
+const target = document.activeElement || document.body;
+const data = new DataTransfer();
+data.setData('text/plain', text);
+const event = new ClipboardEvent('paste', {clipboardData: data, bubbles: true, cancelable: true});
+const notHandled = target.dispatchEvent(event);
+if (notHandled) {
+    return document.execCommand('insertText', false, text);
+}
+return true;
+"""
+
+# 현재 커서 위치에 문단 하나를 삽입하는 스크립트
+INSERT_TEXT_SCRIPT = "return document.execCommand('insertText', false, arguments[0]);"
+
+
+class InsertionStats:
+    """본문 입력 전략별 누적 입력 문자 수와 소요 시간을 기록합니다."""
+
+    def __init__(self):
+        self.totals: Dict[str, Dict[str, float]] = {}
+
+    def record(self, strategy: str, chars: int, seconds: float):
+        entry = self.totals.setdefault(strategy, {'calls': 0, 'chars': 0, 'seconds': 0.0})
+        entry['calls'] += 1
+        entry['chars'] += chars
+        entry['seconds'] += seconds
+
+    def chars_per_sec(self, strategy: str) -> float:
+        entry = self.totals.get(strategy)
+        if not entry or entry['seconds'] <= 0:
+            return 0.0
+        return entry['chars'] / entry['seconds']
+
+    def summary(self) -> str:
+        parts = []
+        for strategy, entry in self.totals.items():
+            parts.append(
+                f"{strategy}: {entry['calls']}회, {int(entry['chars'])}자, "
+                f"{entry['seconds']:.1f}초 ({self.chars_per_sec(strategy):.1f}자/초)"
+            )
+        return ", ".join(parts) if parts else "기록 없음"
+
+
+class BodyInserter:
+    """본문 입력 전략의 기본 클래스. 하위 클래스는 insert()를 구현합니다."""
+
+    name = 'base'
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.inserted_chars = 0
+
+    def insert(self, content: str):
+        raise NotImplementedError
+
+
+class CharInserter(BodyInserter):
+    """ActionChains로 한 글자씩 입력하는 기존 방식 (가장 느리지만 가장 안정적)."""
+
+    name = 'char'
+
+    def __init__(self, driver, char_delay: float = 0.02):
+        super().__init__(driver)
+        self.char_delay = char_delay
+
+    def insert(self, content: str):
+        actions = ActionChains(self.driver)
+        total_chars = len(content)
+        for i, char in enumerate(content):
+            if char == '\n':
+                actions.send_keys(Keys.ENTER)
+            else:
+                actions.send_keys(char)
+            actions.perform()
+            self.inserted_chars += 1
+            if self.char_delay:
+                time.sleep(self.char_delay)
+
+            if (i + 1) % 100 == 0 or (i + 1) == total_chars:
+                print(f"  ... {i+1}/{total_chars} 문자 입력 완료")
+
+
+class PasteInserter(BodyInserter):
+    """본문을 큰 덩어리로 나누어 에디터에 붙여넣기 이벤트로 삽입합니다."""
+
+    name = 'paste'
+
+    def __init__(self, driver, chunk_size: int = 2000):
+        super().__init__(driver)
+        self.chunk_size = chunk_size
+
+    def _split_chunks(self, content: str) -> List[str]:
+        """줄 경계를 유지하면서 chunk_size 이하의 덩어리로 나눕니다."""
+        chunks = []
+        current = ''
+        for line in content.splitlines(keepends=True):
+            if current and len(current) + len(line) > self.chunk_size:
+                chunks.append(current)
+                current = ''
+            current += line
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def insert(self, content: str):
+        chunks = self._split_chunks(content)
+        for i, chunk in enumerate(chunks, 1):
+            if not self.driver.execute_script(PASTE_SCRIPT, chunk):
+                raise RuntimeError(f"붙여넣기 이벤트 처리 실패 (덩어리 {i}/{len(chunks)})")
+            self.inserted_chars += len(chunk)
+            print(f"  ... 덩어리 {i}/{len(chunks)} 붙여넣기 완료 ({self.inserted_chars}/{len(content)} 문자)")
+
+
+class ParagraphInserter(BodyInserter):
+    """문단마다 한 번의 에디터 수준 DOM 삽입(insertText)과 Enter 입력으로 본문을 채웁니다."""
+
+    name = 'js'
+
+    def insert(self, content: str):
+        paragraphs = content.split('\n')
+        for i, paragraph in enumerate(paragraphs):
+            if paragraph:
+                if not self.driver.execute_script(INSERT_TEXT_SCRIPT, paragraph):
+                    raise RuntimeError(f"문단 삽입 실패 (문단 {i+1}/{len(paragraphs)})")
+                self.inserted_chars += len(paragraph)
+            if i < len(paragraphs) - 1:
+                ActionChains(self.driver).send_keys(Keys.ENTER).perform()
+                self.inserted_chars += 1
+        print(f"  ... {len(paragraphs)}개 문단 삽입 완료")
+
+
+INSERTERS = {
+    CharInserter.name: CharInserter,
+    PasteInserter.name: PasteInserter,
+    ParagraphInserter.name: ParagraphInserter,
+}
+
+
+def insert_body(driver, content: str, mode: str = 'paste',
+                stats: Optional[InsertionStats] = None) -> str:
+    """
+    선택한 전략으로 본문을 입력하고, 실패하면 한 글자씩 입력하는 방식으로 대체합니다.
+
+    Args:
+        driver: Selenium WebDriver (본문 영역에 포커스가 있어야 함)
+        content (str): 입력할 본문
+        mode (str): 'paste', 'js', 'char' 중 하나
+        stats (InsertionStats): 전략별 타이밍을 누적할 객체 (선택)
+
+    Returns:
+        str: 실제로 사용된 전략 이름
+    """
+    logger = logging.getLogger(__name__)
+    if mode not in INSERTERS:
+        logger.warning(f"알 수 없는 본문 입력 방식 '{mode}', 'char' 방식 사용")
+        mode = CharInserter.name
+
+    strategies = [mode] if mode == CharInserter.name else [mode, CharInserter.name]
+    for name in strategies:
+        inserter = INSERTERS[name](driver)
+        start = time.perf_counter()
+        try:
+            inserter.insert(content)
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            if inserter.inserted_chars > 0 or name == CharInserter.name:
+                # 일부가 이미 입력되었다면 대체 입력 시 본문이 중복되므로 중단
+                raise
+            print(f"- 본문 입력 방식 '{name}' 실패 ({e}), 'char' 방식으로 대체...")
+            logger.warning(f"Body insertion strategy '{name}' failed after {elapsed:.2f}s: {e}")
+            continue
+
+        elapsed = time.perf_counter() - start
+        if stats is not None:
+            stats.record(name, len(content), elapsed)
+        rate = len(content) / elapsed if elapsed > 0 else 0.0
+        logger.info(f"본문 입력 완료 [{name}]: {len(content)}자 / {elapsed:.2f}초 ({rate:.1f}자/초)")
+        return name
+
+    raise RuntimeError("모든 본문 입력 방식 실패")
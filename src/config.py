@@ -3,14 +3,11 @@ from typing import Dict
 
 # DeepSeek API 설정
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
-DEEPSEEK_API_URL = "https://api.deepseek.com/v1/chat/completions"
+DEEPSEEK_API_URL = os.getenv("DEEPSEEK_API_URL", "https://api.deepseek.com/v1/chat/completions")
 
-# 분석 프롬프트
+# 분석 프롬프트 (지시문을 앞에, 논문 정보를 뒤에 두어 같은 종류의 프롬프트끼리 앞부분이 같도록 함)
 ANALYSIS_PROMPTS = {
-    "classification": """다음 논문을 분류하고 태그를 생성해주세요:
-
-제목: {title}
-초록: {abstract}
+    "classification": """다음 논문을 분류하고 태그를 생성해주세요.
 
 분류 및 태그 생성 규칙:
 1. 분류: 논문의 주요 연구 분야를 한 문장으로 분류해주세요.
@@ -19,12 +16,12 @@ ANALYSIS_PROMPTS = {
 
 응답 형식:
 분류: [분류 내용]
-태그: [태그1], [태그2], [태그3], [태그4], [태그5]""",
-
-    "summary": """다음 논문을 분석하고 요약해주세요:
+태그: [태그1], [태그2], [태그3], [태그4], [태그5]
 
 제목: {title}
-초록: {abstract}
+초록: {abstract}""",
+
+    "summary": """다음 논문을 분석하고 요약해주세요.
 
 요약 작성 규칙:
 1. 주요 연구 내용, 연구의 중요성, 주요 기여점, 잠재적 응용 분야를 포함해주세요.
@@ -43,5 +40,91 @@ ANALYSIS_PROMPTS = {
 [내용]
 
 ### 잠재적 응용 분야
-[내용]"""
-} 
\ No newline at end of file
+[내용]
+
+제목: {title}
+초록: {abstract}""",
+
+    "translation": """다음 영어 초록을 한국어로 번역해주세요. 전문 용어는 원문(영어)을 병기해주세요:
+
+{abstract}"""
+}
+
+# 프롬프트 종류별 응답 최대 토큰 수. 형식이 짧게 정해진 응답에만 두고,
+# 길이가 논문마다 다른 요약/번역/블로그 글/배치 랭킹 JSON은 잘리지 않도록 제공자 기본값을 사용합니다.
+# 응답이 상한에서 잘리면(finish_reason == 'length') 경고를 남기고 캐시하지 않습니다.
+PROMPT_MAX_TOKENS: Dict[str, int] = {
+    "analysis.classification": 300,
+    "rank.evaluate": 100,
+    "rank.keywords": 300,
+}
+
+# Selenium 단계별 대기 제한 시간 (초). 실제 대기 시간은 로그에 기록됩니다.
+WAIT_TIMEOUTS: Dict[str, float] = {
+    "default": 10,
+    "login_form": 10,
+    "login_button": 10,
+    "login_redirect": 10,
+    "page_load": 15,
+    "editor_ready": 15,
+    "popup": 3,
+    "popup_close": 3,
+    "help_close": 2,
+    "title": 5,
+    "body": 3,
+    "body_focus": 2,
+    "publish_dialog": 10,
+    "category": 5,
+    "tag_input": 10,
+    "tag": 2,
+    "publish_done": 15,
+}
+
+# LLM 클라이언트 설정 (연결/응답 타임아웃 초, 최대 재시도 횟수, 연결 풀 크기)
+LLM_MODEL = "deepseek-chat"
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "180"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_POOL_SIZE = 10
+
+# 모든 LLM 호출이 공유하는 호출 제한
+# 초당 호출 시작 수(토큰 버킷, 0이면 제한 없음)와 순간 허용량, 동시 호출 수 시작값/하한/상한 (429/5xx/지연 증가 시 AIMD로 조정),
+# 프롬프트 종류별 평소 지연의 몇 배를 넘으면 혼잡으로 볼지
+LLM_RATE_PER_SEC = float(os.getenv("LLM_RATE_PER_SEC", "5"))
+LLM_BURST = int(os.getenv("LLM_BURST", "5"))
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", str(LLM_POOL_SIZE)))
+LLM_LATENCY_FACTOR = float(os.getenv("LLM_LATENCY_FACTOR", "3"))
+# 회로 차단기: 연속 장애(5xx/타임아웃/연결 오류) 횟수가 넘으면 지정 시간(초) 동안 호출 없이 즉시 실패
+LLM_CIRCUIT_FAILURES = int(os.getenv("LLM_CIRCUIT_FAILURES", "5"))
+LLM_CIRCUIT_RESET = float(os.getenv("LLM_CIRCUIT_RESET", "120"))
+
+# LLM 응답 캐시 설정 (LLM_CACHE_BYPASS=1 이면 캐시 조회를 건너뜀)
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "llm"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "0").lower() in ("1", "true", "yes")
+
+# 프롬프트 토큰 예산: 프롬프트에 넣는 초록의 최대 추정 토큰 수 (배치 랭킹은 논문당 더 작게),
+# 실행당 LLM 토큰(입력+출력) 한도 (0이면 제한 없음, 넘으면 새 논문 발행을 시작하지 않음)
+PROMPT_ABSTRACT_TOKENS = int(os.getenv("PROMPT_ABSTRACT_TOKENS", "400"))
+RANK_ABSTRACT_TOKENS = int(os.getenv("RANK_ABSTRACT_TOKENS", "160"))
+LLM_RUN_TOKEN_BUDGET = int(os.getenv("LLM_RUN_TOKEN_BUDGET", "0"))
+
+# 크롤러 휴리스틱 랭킹 키워드 (제목/초록에 포함된 키워드 수만큼 가점)
+RANKING_KEYWORDS = ['artificial intelligence', 'machine learning', 'deep learning', 'neural network', 'transformer', 'llm', 'gpt']
+
+# arXiv 수집 카테고리 (쉼표 구분)와 전체 쿼리를 합친 요청 간 최소 간격 (초, arXiv API 이용 약관 기준 3초)
+ARXIV_CATEGORIES = [category.strip() for category in os.getenv("ARXIV_CATEGORIES", "cs.AI,cs.LG,cs.CL,cs.CV,stat.ML").split(",") if category.strip()]
+ARXIV_REQUEST_INTERVAL = float(os.getenv("ARXIV_REQUEST_INTERVAL", "3"))
+# arXiv API 주소와 수집 상태(워터마크) 파일 디렉토리 (벤치마크 등에서 로컬 서버/임시 디렉토리로 변경)
+ARXIV_API_URL = os.getenv("ARXIV_API_URL", "https://export.arxiv.org/api/query")
+ARXIV_STATE_DIR = os.getenv("ARXIV_STATE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config"))
+
+# 완료되지 않은 이전 실행을 이어서 진행할 최대 경과 시간 (시간, 그보다 오래되면 새로 크롤링)
+JOB_RESUME_HOURS = float(os.getenv("JOB_RESUME_HOURS", "36"))
+
+# 실행별 단계 소요 시간/통계 보고서 (JSON Lines, 실행마다 한 줄 추가)
+RUN_REPORT_FILE = os.getenv("RUN_REPORT_FILE", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "run_reports.jsonl"))
@@ -0,0 +1,150 @@
+import re
+import hashlib
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+
+# 신규(2504.07936) 및 구형(cs/0101001) arXiv ID, 버전(v1 등)은 별도 그룹
+ARXIV_ID_PATTERN = re.compile(r'(\d{4}\.\d{4,5}|[a-z\-]+(?:\.[a-z]{2})?/\d{7})(v\d+)?', re.IGNORECASE)
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+# MinHash 해시 함수: (a * x + b) mod p, p는 메르센 소수 2^61 - 1
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+
+def normalize_arxiv_id(value: str) -> str:
+    """
+    논문 URL/ID를 버전과 스킴을 제거한 arXiv ID로 정규화합니다.
+
+    예: 'http://arxiv.org/abs/2504.07936v1' -> '2504.07936'
+    arXiv ID가 아니면 스킴과 끝 슬래시를 제거한 소문자 문자열을 반환합니다.
+    """
+    value = (value or '').strip()
+    match = ARXIV_ID_PATTERN.search(value)
+    if match:
+        return match.group(1).lower()
+    return re.sub(r'^[a-z]+://', '', value.lower()).rstrip('/')
+
+
+def shingles(text: str, k: int) -> Set[str]:
+    """소문자 단어 k-gram 집합을 만듭니다. 단어가 k개보다 적으면 단어 전체를 하나의 shingle로 사용합니다."""
+    words = WORD_PATTERN.findall((text or '').lower())
+    if not words:
+        return set()
+    if len(words) < k:
+        return {' '.join(words)}
+    return {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+class MinHashLSH:
+    """
+    MinHash 서명과 LSH 밴딩으로 Jaccard 유사도가 높은 문서를 빠르게 찾는 인덱스.
+
+    서명은 num_perm개의 정수이고, bands개의 밴드로 나누어 버킷에 넣습니다.
+    조회 시 같은 버킷의 후보만 서명을 비교하므로 항목 수와 무관하게 빠릅니다.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.8, k: int = 3, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.k = k
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+        self.signatures: Dict[str, np.ndarray] = {}
+        self.buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        items = shingles(text, self.k)
+        if not items:
+            return None
+        # 프로세스마다 달라지는 hash() 대신 고정된 32비트 해시 사용
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=4).digest(), 'little') for item in items),
+            dtype=np.uint64, count=len(items)
+        )
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key: str, text: str):
+        signature = self.signature(text)
+        if signature is None:
+            return
+        self.signatures[key] = signature
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self.buckets[band].setdefault(band_key, set()).add(key)
+
+    def query(self, text: str) -> Optional[Tuple[str, float]]:
+        """가장 유사한 항목과 추정 Jaccard 유사도를 반환합니다. threshold 미만이면 None."""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        candidates: Set[str] = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates |= self.buckets[band].get(band_key, set())
+        best = None
+        for candidate in candidates:
+            similarity = float(np.mean(self.signatures[candidate] == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (candidate, similarity)
+        return best
+
+
+class DedupIndex:
+    """
+    포스팅된 논문의 중복 감지 인덱스.
+
+    1) 정규화된 arXiv ID (버전/스킴 무시) 정확 일치
+    2) 제목 MinHash 유사도 (교차 등록, 제목만 약간 바뀐 개정판)
+    3) 초록 MinHash 유사도
+    순서로 확인합니다.
+    """
+
+    def __init__(self, title_threshold: float = 0.9, abstract_threshold: float = 0.8):
+        self.ids: Set[str] = set()
+        self.titles = MinHashLSH(threshold=title_threshold, k=2)
+        self.abstracts = MinHashLSH(threshold=abstract_threshold, k=3)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def has_id(self, paper_id: str) -> bool:
+        return normalize_arxiv_id(paper_id) in self.ids
+
+    def add(self, paper_id: str, title: Optional[str] = None, abstract: Optional[str] = None):
+        key = normalize_arxiv_id(paper_id)
+        if not key:
+            return
+        self.ids.add(key)
+        if title:
+            self.titles.add(key, title)
+        if abstract:
+            self.abstracts.add(key, abstract)
+
+    def find_duplicate(self, paper_id: Optional[str], title: Optional[str] = None,
+                       abstract: Optional[str] = None) -> Optional[Tuple[str, str, float]]:
+        """
+        중복으로 보이는 기존 항목을 찾습니다.
+
+        Returns:
+            Optional[Tuple[str, str, float]]: (기존 ID, 사유 'id'/'title'/'abstract', 유사도) 또는 None
+        """
+        if paper_id:
+            key = normalize_arxiv_id(paper_id)
+            if key in self.ids:
+                return key, 'id', 1.0
+        if title:
+            match = self.titles.query(title)
+            if match:
+                return match[0], 'title', match[1]
+        if abstract:
+            match = self.abstracts.query(abstract)
+            if match:
+                return match[0], 'abstract', match[1]
+        return None
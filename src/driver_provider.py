@@ -0,0 +1,256 @@
+import os
+import json
+import atexit
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.159 Safari/537.36'
+DRIVER_PATH_CACHE = Path(__file__).parent.parent / 'cache' / 'chromedriver_path.json'
+MANUAL_DRIVER_PATH = Path(__file__).parent / 'chromedriver' / 'chromedriver.exe'
+
+_driver_path_lock = threading.Lock()
+_driver_path: Optional[str] = None
+
+
+def resolve_driver_path() -> Optional[str]:
+    """
+    ChromeDriver 실행 파일 경로를 반환합니다.
+
+    한 번 찾은 경로는 프로세스 안에서, 그리고 cache/chromedriver_path.json에 저장해 다음 실행에서도 재사용하므로
+    webdriver_manager의 버전 확인/다운로드는 경로 파일이 없거나 실행 파일이 사라졌을 때만 일어납니다.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+        try:
+            with open(DRIVER_PATH_CACHE, 'r', encoding='utf-8') as f:
+                cached = json.load(f).get('path')
+            if cached and os.path.exists(cached):
+                _driver_path = cached
+                return _driver_path
+        except (OSError, ValueError):
+            pass
+
+        try:
+            _driver_path = ChromeDriverManager().install()
+            print("✓ ChromeDriver 자동 설치 완료")
+        except Exception as e:
+            print(f"✗ ChromeDriver 자동 설치 실패: {e}")
+            if not MANUAL_DRIVER_PATH.exists():
+                print("✗ ChromeDriver를 찾을 수 없습니다.")
+                return None
+            print("- 수동 설치된 ChromeDriver 사용")
+            _driver_path = str(MANUAL_DRIVER_PATH)
+
+        try:
+            DRIVER_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            with open(DRIVER_PATH_CACHE, 'w', encoding='utf-8') as f:
+                json.dump({'path': _driver_path}, f)
+        except OSError as e:
+            logging.getLogger(__name__).warning(f"ChromeDriver 경로 캐시 저장 실패: {e}")
+        return _driver_path
+
+
+def build_options(profile_dir: Optional[str] = None, headless: bool = False,
+                  light: bool = False) -> webdriver.ChromeOptions:
+    """
+    Chrome 옵션을 만듭니다.
+
+    Args:
+        profile_dir (str): 로그인 상태를 유지할 Chrome 프로필 디렉토리
+        headless (bool): 창 없이 실행
+        light (bool): 이미지/웹 폰트 로드를 끄고 불필요한 백그라운드 기능 비활성화 (에디터 동작에는 영향 없음)
+    """
+    options = webdriver.ChromeOptions()
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    if headless:
+        options.add_argument('--headless=new')
+        options.add_argument('--window-size=1920,1080')
+    else:
+        options.add_argument('--start-maximized')
+    if light:
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--disable-remote-fonts')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-background-networking')
+    if profile_dir:
+        options.add_argument(f'--user-data-dir={profile_dir}')
+    options.add_argument(f'--user-agent={USER_AGENT}')
+    return options
+
+
+class DriverProvider:
+    """
+    WebDriver를 만들어 빌려주고, 반납된 브라우저를 다음 작업(다음 스케줄 실행 포함)까지 살려 두는 제공자.
+
+    빌려줄 때 간단한 스크립트 실행으로 상태를 확인해 죽은 브라우저는 새로 만들고,
+    max_uses번 발행했거나 JS 힙 사용량이 max_heap_mb를 넘으면 브라우저를 재시작(recycle)합니다.
+    """
+
+    def __init__(self, profile_dir: Optional[str] = None, headless: bool = False, light: bool = False,
+                 keep_warm: bool = True, max_uses: int = 20, max_heap_mb: float = 1024,
+                 page_load_timeout: float = 30):
+        """
+        Args:
+            profile_dir (str): Chrome 프로필 디렉토리
+            headless (bool): 창 없이 실행
+            light (bool): 이미지/웹 폰트 비활성화
+            keep_warm (bool): 반납된 브라우저를 종료하지 않고 재사용
+            max_uses (int): 이 횟수만큼 발행하면 브라우저 재시작
+            max_heap_mb (float): JS 힙 사용량(MB)이 이 값을 넘으면 브라우저 재시작
+            page_load_timeout (float): 페이지 로드 타임아웃 (초)
+        """
+        self.profile_dir = profile_dir
+        self.headless = headless
+        self.light = light
+        self.keep_warm = keep_warm
+        self.max_uses = max_uses
+        self.max_heap_mb = max_heap_mb
+        self.page_load_timeout = page_load_timeout
+        self.driver = None
+        self.uses = 0
+        self.stats = {'launched': 0, 'reused': 0, 'recycled': 0}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def _launch(self):
+        driver_path = resolve_driver_path()
+        if not driver_path:
+            raise RuntimeError("ChromeDriver를 찾을 수 없습니다.")
+        options = build_options(self.profile_dir, self.headless, self.light)
+        driver = webdriver.Chrome(service=Service(executable_path=driver_path), options=options)
+        driver.set_page_load_timeout(self.page_load_timeout)
+        # 웹드라이버 감지 방지
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+            'source': '''
+                Object.defineProperty(navigator, 'webdriver', {
+                    get: () => undefined
+                })
+            '''
+        })
+        self.stats['launched'] += 1
+        self.uses = 0
+        return driver
+
+    def _is_alive(self) -> bool:
+        try:
+            return self.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def _quit(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+    def acquire(self) -> Tuple[webdriver.Chrome, bool]:
+        """
+        사용할 WebDriver를 반환합니다.
+
+        Returns:
+            Tuple[WebDriver, bool]: (드라이버, 새로 실행한 브라우저인지 여부)
+        """
+        with self._lock:
+            if self.driver is not None and self._is_alive():
+                self.stats['reused'] += 1
+                return self.driver, False
+            if self.driver is not None:
+                self.logger.warning("웹드라이버 응답 없음 -> 브라우저 재시작")
+                self._quit()
+            self.driver = self._launch()
+            return self.driver, True
+
+    def heap_mb(self) -> Optional[float]:
+        """현재 페이지의 JS 힙 사용량 (MB). Chrome 외에는 None."""
+        try:
+            used = self.driver.execute_script('return performance.memory ? performance.memory.usedJSHeapSize : null')
+            return used / (1024 * 1024) if used else None
+        except Exception:
+            return None
+
+    def record_use(self) -> bool:
+        """
+        발행 1회를 기록하고, 재시작 조건에 걸리면 브라우저를 종료합니다.
+
+        Returns:
+            bool: 브라우저를 종료했으면 True (다음 acquire에서 새로 실행)
+        """
+        with self._lock:
+            if self.driver is None:
+                return False
+            self.uses += 1
+            heap = self.heap_mb()
+            if self.uses >= self.max_uses or (heap is not None and heap > self.max_heap_mb):
+                reason = f"{self.uses}회 사용" if self.uses >= self.max_uses else f"JS 힙 {heap:.0f}MB"
+                self.logger.info(f"브라우저 재시작 ({reason})")
+                self._quit()
+                self.stats['recycled'] += 1
+                return True
+            return False
+
+    def release(self, driver) -> bool:
+        """
+        작업이 끝난 드라이버를 반납합니다. keep_warm이면 브라우저를 살려 둡니다.
+
+        Returns:
+            bool: 브라우저를 종료했으면 True
+        """
+        with self._lock:
+            if driver is not self.driver:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+                return True
+            if self.keep_warm and self._is_alive():
+                return False
+            self._quit()
+            return True
+
+    def shutdown(self):
+        with self._lock:
+            self._quit()
+
+
+_providers: Dict[Tuple, DriverProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_provider(account: Optional[str] = None, profile_dir: Optional[str] = None, headless: bool = False,
+                 light: bool = False, keep_warm: bool = True, max_uses: int = 20,
+                 max_heap_mb: float = 1024) -> DriverProvider:
+    """
+    같은 (계정, 프로필, 실행 옵션)에 대해 프로세스 전체에서 하나의 DriverProvider를 반환합니다.
+    스케줄러가 같은 프로세스에서 작업을 반복 실행하므로, 브라우저가 실행 간에 재사용됩니다.
+    """
+    key = (account, profile_dir, headless, light)
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None:
+            provider = DriverProvider(profile_dir, headless, light, keep_warm, max_uses, max_heap_mb)
+            _providers[key] = provider
+        else:
+            provider.keep_warm, provider.max_uses, provider.max_heap_mb = keep_warm, max_uses, max_heap_mb
+        return provider
+
+
+@atexit.register
+def shutdown_all():
+    """프로세스 종료 시 살아 있는 브라우저를 모두 종료합니다."""
+    with _providers_lock:
+        for provider in _providers.values():
+            provider.shutdown()
@@ -0,0 +1,108 @@
+import json
+import time
+import uuid
+import logging
+import functools
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """정렬되지 않은 값 목록의 백분위수 (가장 가까운 순위 방식, 값이 없으면 0)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class RunRecorder:
+    """
+    한 번의 작업 실행(run_posting_job) 동안 단계별 소요 시간과 카운터를 모읍니다 (스레드 안전).
+
+    단계(span) 이름은 'publish.editor.type'처럼 점으로 구분하며, 같은 이름의 구간은 횟수/합계/최대/p50/p95로 합쳐집니다.
+    여러 스레드에서 동시에 실행된 구간은 각각 더해지므로, 단계 합계가 전체 실행 시간보다 클 수 있습니다.
+    sleep 같은 대기 시간은 add_time으로 직접 기록합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, run_id: Optional[str] = None):
+        """새 실행을 시작합니다."""
+        with self._lock:
+            self.run_id = run_id or uuid.uuid4().hex[:12]
+            self.started_at = datetime.now().astimezone().isoformat(timespec='seconds')
+            self._start = time.perf_counter()
+            self.stages: Dict[str, List[float]] = {}
+            self.counters: Dict[str, float] = {}
+
+    def add_time(self, name: str, seconds: float):
+        with self._lock:
+            self.stages.setdefault(name, []).append(seconds)
+
+    def incr(self, name: str, amount: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """with 블록의 소요 시간을 name 단계로 기록합니다 (예외가 나도 기록)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def timed(self, name: str) -> Callable:
+        """함수 호출 시간을 name 단계로 기록하는 데코레이터."""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def report(self, **extra: Any) -> Dict[str, Any]:
+        """실행 간 비교(diff)하기 쉽도록 키를 정렬한 보고서를 만듭니다."""
+        with self._lock:
+            stages = {
+                name: {'count': len(samples), 'total_s': round(sum(samples), 3), 'max_s': round(max(samples), 3),
+                       'p50_s': round(percentile(samples, 50), 3), 'p95_s': round(percentile(samples, 95), 3)}
+                for name, samples in sorted(self.stages.items())
+            }
+            counters = dict(sorted(self.counters.items()))
+            report = {
+                'run_id': self.run_id,
+                'started_at': self.started_at,
+                'duration_s': round(time.perf_counter() - self._start, 3),
+                'stages': stages,
+                'counters': counters,
+            }
+        report.update(extra)
+        return report
+
+    def write(self, path: Union[str, Path], **extra: Any) -> Dict[str, Any]:
+        """보고서를 JSON Lines 파일에 한 줄로 추가하고 반환합니다."""
+        report = self.report(**extra)
+        try:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(report, ensure_ascii=False, sort_keys=True) + '\n')
+        except OSError as e:
+            logging.getLogger(__name__).error(f"실행 보고서 저장 실패 ({path}): {e}")
+        return report
+
+
+# 프로세스 전체에서 공유하는 현재 실행 기록 (run_posting_job 시작 시 reset)
+RUN = RunRecorder()
+span = RUN.span
+timed = RUN.timed
+add_time = RUN.add_time
+incr = RUN.incr
@@ -0,0 +1,242 @@
+import logging
+from typing import Dict, List, Optional
+from paper_crawler import PaperCrawler
+from paper import Paper
+from blog_poster import BlogPoster, account_configs
+from post_cache import PostCache
+from paper_store import PaperStore, paper_key
+from posting_pipeline import PostingPipeline, AccountLimiter
+from llm_client import METRICS as LLM_METRICS, CACHE as LLM_CACHE, GUARD as LLM_GUARD
+from instrumentation import RUN
+from config import RUN_REPORT_FILE, JOB_RESUME_HOURS
+
+
+class PostingJob:
+    """
+    체크포인트 기반 논문 포스팅 작업 (스케줄 실행 한 번).
+
+    논문별 처리 단계(수집 -> 후보 선정 -> 글 생성 -> 발행)를 PaperStore에 기록하고, 각 단계는 저장된 결과가 있으면
+    다시 하지 않습니다 (수집/점수는 upsert, 생성은 저장된 'blog_post' 재사용, 발행된 논문은 건너뜀).
+    이전 실행이 완료 기록 없이 끝났으면(브라우저 오류, 프로세스 종료 등) 다시 크롤링하지 않고
+    그 실행의 후보 목록 중 아직 발행되지 않은 논문부터 이어서 진행합니다.
+    retry_failed는 크롤링/생성 없이 발행 단계에서 실패한 논문만 저장된 글로 다시 발행합니다.
+    """
+
+    def __init__(self, config: Dict, use_cache: bool = True):
+        self.config = config
+        self.use_cache = use_cache
+        self.logger = logging.getLogger(__name__)
+        self.resume_hours = float(config.get('JOB_RESUME_HOURS') or JOB_RESUME_HOURS)
+        self.max_posts = int(config.get('MAX_POSTS') or 10)
+        # 실행당 LLM 토큰 한도: 넘으면 새 논문의 글 생성/발행을 시작하지 않음 (진행 중인 발행은 마침)
+        self.token_budget = int(config.get('LLM_RUN_TOKEN_BUDGET') or 0)
+        self.store: Optional[PaperStore] = None
+        self.cache: Optional[PostCache] = None
+        self.posters: List[BlogPoster] = []
+        self.limiters: List[AccountLimiter] = []
+        self.job_id: Optional[int] = None
+        self.job_paper_ids: List[str] = []
+        self.mode = 'run'
+        self.status = 'error'
+        self.posted = 0
+        self.processed = 0
+        self._stopped = {'budget': False, 'circuit': False}
+
+    # --- 실행 ---
+    def run(self) -> str:
+        """후보 선정(또는 중단된 실행 이어가기)부터 발행까지 진행하고 실행 상태를 반환합니다."""
+        self.logger.info("=== 논문 포스팅 작업 시작 ===")
+        self._begin()
+        try:
+            if LLM_GUARD.breaker.is_open:
+                # 제공자 장애 중에는 새로 시작하거나 이어가지 않음 (중단된 실행은 회로가 복구된 뒤의 실행에서 이어서 진행)
+                self.logger.error("LLM 제공자 장애로 호출이 차단됨 - 이번 실행 건너뜀")
+                self.status = 'circuit_open'
+                return self.status
+            self._open_store()
+            papers = self._resume()
+            if papers is None:
+                papers = self._fetch_and_rank()
+            if not papers:
+                self.logger.warning("크롤링할 논문이 없습니다.")
+                self.status = 'no_papers'
+                return self.status
+            self._build_posters()
+            self._publish(papers)
+        except Exception as e:
+            self.logger.critical(f"✗ 작업 실행 중 치명적 오류 발생: {str(e)}", exc_info=True)
+        finally:
+            self._finish()
+        return self.status
+
+    def retry_failed(self) -> str:
+        """발행 단계에서 실패한 논문만 저장된 글로 다시 발행합니다 (LLM 호출 없음)."""
+        self.logger.info("=== 발행 실패 논문 재발행 시작 ===")
+        self.mode = 'retry_failed'
+        self._begin()
+        try:
+            self._open_store()
+            papers = self.store.failed_publishes(limit=self.max_posts)
+            if not papers:
+                self.logger.info("다시 발행할 논문이 없습니다.")
+                self.status = 'no_papers'
+                return self.status
+            self.logger.info(f"발행 단계에서 실패한 논문 {len(papers)}개를 저장된 글로 다시 발행합니다.")
+            self._build_posters()
+            self._publish(papers)
+        except Exception as e:
+            self.logger.critical(f"✗ 재발행 중 치명적 오류 발생: {str(e)}", exc_info=True)
+        finally:
+            self._finish()
+        return self.status
+
+    # --- 단계 ---
+    def _begin(self):
+        # 이번 실행의 단계별 시간/통계 기록 시작 (LLM 통계도 실행 단위로 초기화)
+        RUN.reset()
+        LLM_METRICS.reset()
+
+    def _open_store(self):
+        # 논문 저장소 초기화 (후보, 점수, LLM 결과물, 발행 상태, 처리 단계)
+        self.store = PaperStore(self.config.get('PAPER_DB_FILE') or 'papers.db')
+        self.logger.info(f"논문 저장소 열기: {self.store.db_path}")
+        self.logger.info("포스트 캐시 초기화 중...")
+        self.cache = PostCache(self.config.get('POST_CACHE_FILE') or 'posted_papers.txt', store=self.store)
+        self.logger.info("포스트 캐시 초기화 완료.")
+
+    def _resume(self) -> Optional[List[Paper]]:
+        """완료되지 않은 최근 실행이 있으면 그 후보 중 아직 발행되지 않은 논문을 순위순으로 반환합니다."""
+        job = self.store.resumable_job(self.resume_hours)
+        if job is None:
+            return None
+        remaining = [paper_id for paper_id in job['paper_ids'] if self.store.get_stage(paper_id) != 'published']
+        papers = self.store.get_papers(remaining)
+        if not papers:
+            self.logger.info(f"중단된 실행 {job['job_id']}의 후보가 모두 발행됨 - 완료 처리 후 새로 시작")
+            self.store.finish_job(job['job_id'], 'completed')
+            return None
+        self.job_id, self.job_paper_ids = job['job_id'], job['paper_ids']
+        self.store.finish_job(self.job_id, 'running')
+        RUN.incr('job.resumed')
+        self.logger.info(f"중단된 실행 {self.job_id} 이어서 진행 (시작: {job['started_at']} UTC, "
+                         f"남은 후보 {len(papers)}/{len(job['paper_ids'])}개, 단계: "
+                         f"{self.store.stage_counts(job['paper_ids'])}) - 크롤링 생략")
+        return papers
+
+    def _fetch_and_rank(self) -> List[Paper]:
+        """최근 논문을 수집/랭킹하고 후보 목록을 새 실행으로 기록합니다."""
+        self.logger.info("논문 크롤러 초기화 중...")
+        crawler = PaperCrawler(self.config, store=self.store)
+        self.logger.info("논문 크롤러 초기화 완료.")
+        self.logger.info("최근 상위 논문 검색 시작...")
+        papers = [paper for paper in crawler.get_daily_papers() if paper_key(paper)]
+        if not papers:
+            return []
+        self.logger.info(f"상위 {len(papers)}개 논문 검색 완료.")
+        self.store.upsert_papers(papers)
+        self.job_paper_ids = [paper_key(paper) for paper in papers]
+        self.job_id = self.store.start_job(self.job_paper_ids)
+        self.store.advance_stage(self.job_paper_ids, 'ranked', job_id=self.job_id)
+        self.logger.info(f"실행 {self.job_id} 시작: 후보 {len(papers)}개 기록")
+        return papers
+
+    def _build_posters(self):
+        # 블로그 포스터 초기화 (계정마다 별도 브라우저/프로필/쿠키)
+        self.logger.info("블로그 포스터 초기화 중...")
+        post_interval = float(self.config.get('POST_INTERVAL') or 10)
+        for account_config in account_configs(self.config):
+            try:
+                self.posters.append(BlogPoster(account_config, store=self.store))
+            except Exception as e:
+                self.logger.error(f"✗ 블로그 포스터 초기화 실패 (계정: {account_config.get('NAVER_USERNAME')}): {e}")
+                continue
+            self.limiters.append(AccountLimiter(
+                float(account_config.get('MIN_POST_INTERVAL') or post_interval),
+                account_config.get('MAX_POSTS_PER_ACCOUNT')
+            ))
+        if not self.posters:
+            raise RuntimeError("사용할 수 있는 블로그 계정이 없습니다.")
+        self.logger.info(f"블로그 포스터 초기화 완료 ({len(self.posters)}개 계정).")
+
+    def _should_post(self, rank: int, paper: Paper) -> bool:
+        if self.token_budget and LLM_METRICS.total_tokens >= self.token_budget:
+            if not self._stopped['budget']:
+                self._stopped['budget'] = True
+                self.logger.warning(f"실행당 LLM 토큰 한도({self.token_budget}) 도달 "
+                                    f"(사용 {LLM_METRICS.total_tokens}) - 새 논문 발행 중단")
+            return False
+        # LLM 제공자 장애(회로 열림) 중에는 논문마다 생성 실패를 기다리지 않고 새 논문 선정을 중단
+        if LLM_GUARD.breaker.is_open:
+            if not self._stopped['circuit']:
+                self._stopped['circuit'] = True
+                self.logger.error("LLM 제공자 장애로 호출이 차단됨 - 새 논문 발행 중단")
+            return False
+        paper_id = paper.get('url')
+        if not paper_id:
+            self.logger.warning(f"논문 ID(URL) 없음 (순위: {rank}): {paper.get('title')}")
+            return False
+        if self.use_cache:
+            duplicate = self.cache.find_duplicate(paper_id, paper.get('title'), paper.get('abstract'))
+            if duplicate:
+                existing_id, reason, similarity = duplicate
+                self.logger.info(f"이미 포스팅됨 (순위: {rank}, ID: {paper_id}, 기존: {existing_id}, "
+                                 f"기준: {reason} {similarity:.2f}): {paper.get('title')}")
+                return False
+        return True
+
+    def _on_posted(self, paper: Paper, result: Dict):
+        if self.use_cache:
+            try:
+                self.cache.add_paper(paper.get('url'), paper.get('title'), paper.get('abstract'))
+            except OSError as e:
+                # 발행은 성공했으므로 실패로 세지 않음 (저장소가 있으면 발행 기록은 저장소에 남음)
+                self.logger.error(f"발행한 논문을 캐시 파일에 기록하지 못함 ({paper.get('url')}): {e}")
+
+    def _publish(self, papers: List[Paper]):
+        # 다음 논문들의 LLM 콘텐츠 생성을 현재 논문 발행과 동시에 진행, 계정별 브라우저가 동시에 발행
+        prefetch = int(self.config.get('GENERATION_PREFETCH') or 3)
+        concurrency = int(self.config.get('PUBLISH_CONCURRENCY') or len(self.posters))
+        self.logger.info(f"새 논문 포스팅 시작 (최대 {self.max_posts}개 목표, 미리 생성 {prefetch}개, "
+                         f"동시 발행 {concurrency}개)...")
+        pipeline = PostingPipeline(self.posters, prefetch=prefetch, max_concurrency=concurrency, limiters=self.limiters)
+        with RUN.span('pipeline'):
+            self.posted, self.processed = pipeline.run(papers, self.max_posts, self._should_post, self._on_posted)
+        # 제공자 장애로 중단했으면 다음 실행에서 남은 후보를 이어서 진행
+        self.status = 'interrupted' if self._stopped['circuit'] else 'ok'
+        if self.posted >= self.max_posts:
+            self.logger.info(f"목표 포스팅 개수({self.max_posts}개)에 도달하여 종료합니다.")
+        self.logger.info(f"총 {self.processed}개 논문 처리, {self.posted}개 신규 포스팅 완료.")
+        if self.processed == len(papers) and self.posted < self.max_posts:
+            self.logger.warning(f"가져온 모든 논문을 확인했지만 목표({self.max_posts}개)보다 적게 포스팅했습니다.")
+
+    def _finish(self):
+        """리소스를 정리하고 실행 상태와 보고서를 기록합니다. 완료되지 않은 실행은 다음 실행에서 이어집니다."""
+        for poster in self.posters:
+            self.logger.info(f"블로그 포스터 리소스 정리 중 (계정: {poster.username})...")
+            poster.close()
+        self.logger.info("블로그 포스터 리소스 정리 완료.")
+        stages = {}
+        if self.store is not None:
+            if self.job_id is not None:
+                self.store.finish_job(self.job_id, 'completed' if self.status == 'ok' else self.status)
+                stages = self.store.stage_counts(self.job_paper_ids)
+            self.store.close()
+        self.logger.info(f"LLM 호출 통계: {LLM_METRICS.summary()}")
+        self.logger.info(f"LLM 캐시 통계: {LLM_CACHE.summary()}")
+        typing = {}
+        for poster in self.posters:
+            for strategy, entry in poster.insertion_stats.totals.items():
+                total = typing.setdefault(strategy, {'calls': 0, 'chars': 0, 'seconds': 0.0})
+                for field in total:
+                    total[field] += entry[field]
+        report = RUN.write(
+            RUN_REPORT_FILE,
+            status=self.status,
+            posted=self.posted,
+            processed=self.processed,
+            job={'id': self.job_id, 'mode': self.mode, 'stages': stages},
+            llm={**LLM_METRICS.snapshot(), 'guard': LLM_GUARD.snapshot()},
+            typing={strategy: {**entry, 'seconds': round(entry['seconds'], 3)} for strategy, entry in typing.items()},
+        )
+        self.logger.info(f"실행 보고서 저장: {RUN_REPORT_FILE} (실행 {report['run_id']}, {report['duration_s']:.1f}초)")
+        self.logger.info("=== 논문 포스팅 작업 종료 ===")
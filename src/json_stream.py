@@ -0,0 +1,208 @@
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+# JSON 문자열 이스케이프 -> 문자
+ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+WHITESPACE = ' \t\r\n'
+
+
+class IncrementalJSONParser:
+    """
+    LLM 응답을 조각 단위로 받아 최상위 JSON 객체의 필드를 완성되는 대로 꺼내는 파서.
+
+    첫 '{' 앞의 텍스트(예: ```json 코드 블록 시작)는 무시하고, 그 객체가 닫힐 때까지만 읽습니다.
+    문자열 값은 디코딩된 조각을 도착하는 대로 on_text(key, delta)로 넘기고,
+    값이 완성되면 on_field(key, value)를 호출합니다. 배열/객체/숫자 값은 완성된 뒤 한 번에 json.loads합니다.
+    LLM이 흔히 내는 문자열 안의 실제 줄바꿈(제어 문자)은 허용합니다.
+    뒷부분이 잘리거나 깨져도 그 전까지 완성된 필드는 values에 남고, 오류는 error에 기록됩니다.
+    """
+
+    def __init__(self, on_field: Optional[Callable[[str, Any], None]] = None,
+                 on_text: Optional[Callable[[str, str], None]] = None):
+        self.on_field = on_field
+        self.on_text = on_text
+        self.values: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.state = 'start'
+        self.key: Optional[str] = None
+        self._chars: List[str] = []  # 디코딩 중인 키/문자열 값
+        self._raw: List[str] = []    # 읽는 중인 문자열 외 값의 원문
+        self._depth = 0
+        self._in_string = False       # 원문 값 안의 문자열 여부
+        self._escape = False
+        self._unicode: Optional[str] = None
+        self._high_surrogate: Optional[int] = None
+        self._pending = 0             # 아직 on_text로 넘기지 않은 문자열 값 문자 수
+
+    @property
+    def done(self) -> bool:
+        """객체가 닫혔는지 여부."""
+        return self.state == 'done'
+
+    def partial(self, key: str) -> Optional[str]:
+        """완성되었거나 읽는 중인 문자열 값 (없으면 None)."""
+        if key in self.values:
+            return self.values[key]
+        if self.state == 'string' and self.key == key:
+            return ''.join(self._chars)
+        return None
+
+    def feed(self, chunk: str):
+        for ch in chunk:
+            if self.state in ('done', 'error'):
+                break
+            self._step(ch)
+        self._flush_text()
+
+    def _fail(self, message: str):
+        self._flush_text()
+        self.error = message
+        self.state = 'error'
+
+    def _flush_text(self):
+        if self.state == 'string' and self._pending:
+            delta = ''.join(self._chars[-self._pending:])
+            self._pending = 0
+            if self.on_text is not None:
+                self.on_text(self.key, delta)
+
+    def _set(self, key: str, value: Any):
+        self.values[key] = value
+        if self.on_field is not None:
+            self.on_field(key, value)
+
+    def _decode(self, ch: str) -> Optional[bool]:
+        """문자열 안의 문자 하나를 처리합니다. 문자열이 끝나면 True, 문자를 추가했으면 False, 아니면 None."""
+        if self._unicode is not None:
+            self._unicode += ch
+            if len(self._unicode) < 4:
+                return None
+            try:
+                code = int(self._unicode, 16)
+            except ValueError:
+                self._fail(f"잘못된 유니코드 이스케이프: \\u{self._unicode}")
+                return None
+            self._unicode = None
+            if 0xD800 <= code < 0xDC00:
+                self._high_surrogate = code
+                return None
+            if 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+                code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+            self._high_surrogate = None
+            self._chars.append(chr(code))
+            return False
+        if self._escape:
+            self._escape = False
+            if ch == 'u':
+                self._unicode = ''
+                return None
+            if ch not in ESCAPES:
+                self._fail(f"잘못된 이스케이프: \\{ch}")
+                return None
+            self._chars.append(ESCAPES[ch])
+            return False
+        if ch == '\\':
+            self._escape = True
+            return None
+        if ch == '"':
+            return True
+        self._chars.append(ch)
+        return False
+
+    def _finish_raw(self) -> bool:
+        text = ''.join(self._raw).strip()
+        self._raw = []
+        try:
+            value = json.loads(text)
+        except ValueError:
+            self._fail(f"'{self.key}' 값을 해석할 수 없음: {text[:50]}")
+            return False
+        self._set(self.key, value)
+        self.state = 'after_value'
+        return True
+
+    def _step(self, ch: str):
+        state = self.state
+        if state == 'start':
+            if ch == '{':
+                self.state = 'key_or_end'
+        elif state == 'key_or_end':
+            if ch in WHITESPACE:
+                return
+            if ch == '"':
+                self._chars = []
+                self.state = 'key'
+            elif ch == '}':
+                self.state = 'done'
+            else:
+                self._fail(f"키가 와야 할 위치에 '{ch}'")
+        elif state == 'key':
+            if self._decode(ch):
+                self.key = ''.join(self._chars)
+                self.state = 'colon'
+        elif state == 'colon':
+            if ch == ':':
+                self.state = 'value'
+            elif ch not in WHITESPACE:
+                self._fail(f"':'가 와야 할 위치에 '{ch}'")
+        elif state == 'value':
+            if ch in WHITESPACE:
+                return
+            if ch == '"':
+                self._chars = []
+                self._pending = 0
+                self.state = 'string'
+            else:
+                self._raw = [ch]
+                self._depth = 1 if ch in '[{' else 0
+                self._in_string = False
+                self._escape = False
+                self.state = 'raw'
+        elif state == 'string':
+            before = len(self._chars)
+            ended = self._decode(ch)
+            if ended:
+                self._flush_text()
+                self._set(self.key, ''.join(self._chars))
+                self.state = 'after_value'
+            else:
+                self._pending += len(self._chars) - before
+        elif state == 'raw':
+            if self._depth == 0:
+                # 숫자/true/false/null: 구분자가 나오면 끝
+                if ch in ',}' or ch in WHITESPACE:
+                    if self._finish_raw():
+                        self._step(ch)
+                    return
+                self._raw.append(ch)
+                return
+            self._raw.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in '[{':
+                self._depth += 1
+            elif ch in ']}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_raw()
+        elif state == 'after_value':
+            if ch == ',':
+                self.state = 'key_or_end'
+            elif ch == '}':
+                self.state = 'done'
+            elif ch not in WHITESPACE:
+                self._fail(f"',' 또는 '}}'가 와야 할 위치에 '{ch}'")
+
+
+def parse_partial(text: str) -> IncrementalJSONParser:
+    """전체 텍스트를 한 번에 넣은 파서를 반환합니다 (완성된 필드는 values, 오류는 error)."""
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser
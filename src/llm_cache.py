@@ -0,0 +1,140 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+class ResponseCache:
+    """
+    프롬프트 해시 기반의 디스크 LLM 응답 캐시.
+
+    (모델, temperature, 프롬프트)의 SHA-256 해시를 파일 이름으로 사용하며,
+    TTL이 지난 항목은 무시하고, 항목 수/전체 크기 제한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다 (LRU).
+    bypass가 켜져 있으면 캐시를 읽지 않고 새 응답만 저장합니다.
+    """
+
+    def __init__(self, cache_dir: Path, ttl: float = 7 * 24 * 3600, max_entries: int = 2000,
+                 max_bytes: int = 200 * 1024 * 1024, bypass: bool = False):
+        """
+        Args:
+            cache_dir (Path): 캐시 파일을 저장할 디렉토리
+            ttl (float): 항목 유효 시간 (초)
+            max_entries (int): 최대 항목 수
+            max_bytes (int): 최대 전체 크기 (바이트)
+            bypass (bool): True면 캐시 조회를 건너뜀
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'writes': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Tuple[float, int]]] = None  # 키 -> (마지막 사용 시각, 크기)
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def make_key(model: str, temperature: float, prompt: str) -> str:
+        payload = json.dumps([model, temperature, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> Dict[str, Tuple[float, int]]:
+        """디스크의 캐시 파일 목록으로 LRU 인덱스를 한 번만 구성합니다."""
+        if self._index is None:
+            self._index = {}
+            if self.cache_dir.exists():
+                for path in self.cache_dir.glob('*/*.json'):
+                    stat = path.stat()
+                    self._index[path.stem] = (stat.st_mtime, stat.st_size)
+        return self._index
+
+    def get(self, model: str, temperature: float, prompt: str) -> Optional[str]:
+        """캐시된 응답을 반환합니다. 없거나 만료되었으면 None."""
+        if self.bypass:
+            return None
+        key = self.make_key(model, temperature, prompt)
+        path = self._path(key)
+        with self._lock:
+            index = self._load_index()
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self.stats['misses'] += 1
+                return None
+
+            if time.time() - entry.get('created', 0) > self.ttl:
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                self._remove(key)
+                return None
+
+            # 사용 시각 갱신 (LRU)
+            now = time.time()
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+            index[key] = (now, index.get(key, (now, path.stat().st_size))[1])
+            self.stats['hits'] += 1
+            return entry['response']
+
+    def put(self, model: str, temperature: float, prompt: str, response: str):
+        """응답을 캐시에 저장하고, 제한을 넘으면 오래된 항목을 정리합니다."""
+        key = self.make_key(model, temperature, prompt)
+        path = self._path(key)
+        entry = {'created': time.time(), 'model': model, 'temperature': temperature, 'response': response}
+        with self._lock:
+            index = self._load_index()
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix('.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                self.logger.error(f"LLM 캐시 저장 중 오류 발생 ({path}): {e}")
+                return
+            index[key] = (time.time(), path.stat().st_size)
+            self.stats['writes'] += 1
+            self._evict()
+
+    def discard(self, model: str, temperature: float, prompt: str):
+        """잘못된 응답(파싱 실패 등)을 캐시에서 제거합니다."""
+        with self._lock:
+            self._load_index()
+            self._remove(self.make_key(model, temperature, prompt))
+
+    def _remove(self, key: str):
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+        if self._index is not None:
+            self._index.pop(key, None)
+
+    def _evict(self):
+        """항목 수/크기 제한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다."""
+        index = self._index
+        total_bytes = sum(size for _, size in index.values())
+        if len(index) <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+        for key, (_, size) in sorted(index.items(), key=lambda item: item[1][0]):
+            if len(index) <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            self._remove(key)
+            total_bytes -= size
+            self.stats['evictions'] += 1
+
+    def summary(self) -> str:
+        lookups = self.stats['hits'] + self.stats['misses']
+        hit_rate = self.stats['hits'] / lookups * 100 if lookups else 0.0
+        return (f"적중 {self.stats['hits']} / 미적중 {self.stats['misses']} ({hit_rate:.0f}%), "
+                f"만료 {self.stats['expired']}, 저장 {self.stats['writes']}, 삭제 {self.stats['evictions']}")
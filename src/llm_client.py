@@ -0,0 +1,382 @@
+import json
+import time
+import random
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+from config import (DEEPSEEK_API_URL, LLM_MODEL, LLM_CONNECT_TIMEOUT, LLM_READ_TIMEOUT,
+                    LLM_MAX_RETRIES, LLM_POOL_SIZE, LLM_CACHE_DIR, LLM_CACHE_TTL,
+                    LLM_CACHE_MAX_ENTRIES, LLM_CACHE_MAX_BYTES, LLM_CACHE_BYPASS, LLM_RATE_PER_SEC, LLM_BURST,
+                    LLM_CONCURRENCY, LLM_MIN_CONCURRENCY, LLM_MAX_CONCURRENCY, LLM_LATENCY_FACTOR,
+                    LLM_CIRCUIT_FAILURES, LLM_CIRCUIT_RESET)
+from llm_cache import ResponseCache
+from llm_limits import (LLMGuard, CallPermit, CircuitOpenError, OK, THROTTLED, FAILED, REJECTED, CANCELLED)
+from instrumentation import add_time, incr, percentile
+from prompts import Prompt
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class LLMMetrics:
+    """
+    LLM 호출별 지연 시간, 토큰 사용량, 재시도 횟수를 누적합니다 (스레드 안전).
+
+    토큰은 프롬프트 종류(Prompt.kind)별로도 집계하며, 입력 토큰 중 제공자 프리픽스 캐시에 적중한 토큰과
+    로컬 추정치를 함께 기록해 추정 정확도를 확인할 수 있게 합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record(self, latency: float, prompt_tokens: int, completion_tokens: int, retries: int, ok: bool,
+               kind: Optional[str] = None, estimated_tokens: int = 0, cached_tokens: int = 0):
+        with self._lock:
+            self.latencies.append(latency)
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cached_tokens += cached_tokens
+            self.retries += retries
+            if not ok:
+                self.failures += 1
+            if kind and ok:
+                usage = self.by_kind.setdefault(kind, {'calls': 0, 'estimated_prompt_tokens': 0, 'prompt_tokens': 0,
+                                                       'cached_tokens': 0, 'completion_tokens': 0})
+                usage['calls'] += 1
+                usage['estimated_prompt_tokens'] += estimated_tokens
+                usage['prompt_tokens'] += prompt_tokens
+                usage['cached_tokens'] += cached_tokens
+                usage['completion_tokens'] += completion_tokens
+
+    def reset(self):
+        with self._lock:
+            self.latencies: List[float] = []
+            self.prompt_tokens = self.completion_tokens = self.cached_tokens = 0
+            self.retries = self.failures = 0
+            self.by_kind: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def total_tokens(self) -> int:
+        with self._lock:
+            return self.prompt_tokens + self.completion_tokens
+
+    def percentile(self, pct: float) -> float:
+        with self._lock:
+            values = list(self.latencies)
+        return percentile(values, pct)
+
+    def snapshot(self) -> Dict[str, float]:
+        """실행 보고서용 통계."""
+        with self._lock:
+            calls, failures, retries = len(self.latencies), self.failures, self.retries
+            prompt_tokens, completion_tokens = self.prompt_tokens, self.completion_tokens
+            cached_tokens = self.cached_tokens
+            by_kind = {kind: dict(usage) for kind, usage in sorted(self.by_kind.items())}
+        return {
+            'calls': calls, 'failures': failures, 'retries': retries,
+            'latency_p50_s': round(self.percentile(50), 3), 'latency_p95_s': round(self.percentile(95), 3),
+            'latency_max_s': round(self.percentile(100), 3),
+            'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+            'cached_prompt_tokens': cached_tokens, 'by_kind': by_kind,
+        }
+
+    def summary(self) -> str:
+        return (f"{len(self.latencies)}회 호출 (실패 {self.failures}, 재시도 {self.retries}), "
+                f"지연 p50={self.percentile(50):.2f}s p95={self.percentile(95):.2f}s, "
+                f"토큰 입력 {self.prompt_tokens} (캐시 적중 {self.cached_tokens}) / 출력 {self.completion_tokens}")
+
+
+# 모든 클라이언트가 공유하는 호출 통계, 응답 캐시, 호출 제한(토큰 버킷 + AIMD 동시성 + 회로 차단기)
+METRICS = LLMMetrics()
+CACHE = ResponseCache(LLM_CACHE_DIR, ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES,
+                      max_bytes=LLM_CACHE_MAX_BYTES, bypass=LLM_CACHE_BYPASS)
+GUARD = LLMGuard(LLM_RATE_PER_SEC, LLM_BURST, LLM_CONCURRENCY, LLM_MIN_CONCURRENCY, LLM_MAX_CONCURRENCY,
+                 LLM_LATENCY_FACTOR, LLM_CIRCUIT_FAILURES, LLM_CIRCUIT_RESET)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환합니다."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _outcome(status: Optional[int]) -> str:
+    """실패한 시도의 HTTP 상태 코드(연결 오류/타임아웃은 None)를 호출 제한에 알릴 결과로 변환합니다."""
+    if status is None or status >= 500:
+        return FAILED
+    return THROTTLED if status == 429 else REJECTED
+
+
+def _as_prompt(prompt: Union[str, Prompt]) -> Prompt:
+    return prompt if isinstance(prompt, Prompt) else Prompt('other', prompt, system=None)
+
+
+class LLMClient:
+    """
+    DeepSeek(OpenAI 호환) Chat Completions API 공용 클라이언트.
+
+    연결 풀(keep-alive)을 사용하는 Session 하나를 공유하고, 일관된 타임아웃과
+    지터가 있는 지수 백오프 재시도(429의 Retry-After 준수)를 적용합니다.
+    각 시도는 공유 호출 제한(guard)의 허가를 받아야 하며, 제공자 장애로 회로가 열려 있으면
+    재시도하며 기다리지 않고 CircuitOpenError로 즉시 실패합니다.
+    chat은 전체 응답을, chat_stream은 SSE 스트리밍으로 받은 조각을 차례로 반환합니다.
+    """
+
+    def __init__(self, api_key: str, api_url: str = DEEPSEEK_API_URL, model: str = LLM_MODEL,
+                 timeout: Tuple[float, float] = (LLM_CONNECT_TIMEOUT, LLM_READ_TIMEOUT),
+                 max_retries: int = LLM_MAX_RETRIES, backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 cache: Optional[ResponseCache] = CACHE, guard: LLMGuard = GUARD):
+        if not api_key:
+            raise ValueError("DEEPSEEK_API_KEY is not set")
+        self.api_key = api_key
+        self.api_url = api_url
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache = cache
+        self.guard = guard
+        self.logger = logging.getLogger(__name__)
+
+        # 재시도는 이 클래스에서 직접 처리하므로 어댑터 재시도는 사용하지 않음
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=LLM_POOL_SIZE, pool_maxsize=LLM_POOL_SIZE, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
+
+    def _backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """지터가 있는 지수 백오프 대기 시간. Retry-After가 있으면 그보다 짧게 기다리지 않습니다."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _post(self, data: Dict, start: float, kind: str,
+              stream: bool = False) -> Tuple[requests.Response, int, CallPermit]:
+        """
+        요청을 보내고 (성공 응답, 재시도 횟수, 호출 허가)를 반환합니다. 연결 오류와 재시도할 상태 코드는 백오프 후 재시도합니다.
+
+        호출자는 응답을 끝까지 받은 뒤 허가를 self.guard.release로 반납해야 합니다.
+        """
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                permit = self.guard.acquire(kind)
+            except CircuitOpenError:
+                if attempt:
+                    METRICS.record(time.perf_counter() - start, 0, 0, attempt, False)
+                raise
+            try:
+                response = self.session.post(self.api_url, json=data, timeout=self.timeout, stream=stream)
+                if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                    retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                    response.close()
+                    raise requests.exceptions.HTTPError(f"{response.status_code} 응답", response=response)
+                response.raise_for_status()
+                return response, attempt, permit
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                    requests.exceptions.HTTPError) as e:
+                status = e.response.status_code if e.response is not None else None
+                self.guard.release(permit, _outcome(status), retry_after)
+                retryable = status is None or status in RETRY_STATUS_CODES
+                if not retryable or attempt >= self.max_retries:
+                    METRICS.record(time.perf_counter() - start, 0, 0, attempt, False)
+                    self.logger.error(f"API 호출 실패 (시도 {attempt + 1}/{self.max_retries + 1}): {str(e)}")
+                    raise
+                if self.guard.breaker.is_open:
+                    # 장애로 판단됨: 백오프하며 기다리지 않고 바로 실패
+                    METRICS.record(time.perf_counter() - start, 0, 0, attempt, False)
+                    raise CircuitOpenError(f"LLM 제공자 장애로 회로 열림 (마지막 오류: {str(e)})") from e
+                wait_time = self._backoff(attempt, retry_after)
+                self.logger.warning(f"API 호출 실패 (시도 {attempt + 1}/{self.max_retries + 1}): {str(e)}. "
+                                    f"{wait_time:.1f}초 후 재시도...")
+                time.sleep(wait_time)
+                add_time('llm.backoff_wait', wait_time)
+                attempt += 1
+            except Exception as e:
+                self.guard.release(permit, FAILED)
+                METRICS.record(time.perf_counter() - start, 0, 0, attempt, False)
+                self.logger.error(f"예상치 못한 API 호출 오류: {str(e)}")
+                raise
+
+    def _request(self, prompt: Prompt, model: str, temperature: float) -> Dict:
+        data = {
+            "model": model,
+            "messages": prompt.messages(),
+            "temperature": temperature
+        }
+        if prompt.max_tokens:
+            data["max_tokens"] = prompt.max_tokens
+        return data
+
+    def _cached(self, model: str, temperature: float, prompt: Prompt) -> Optional[str]:
+        cached = self.cache.get(model, temperature, prompt.cache_text())
+        if cached is not None:
+            self.logger.info("LLM 응답 캐시 적중 - API 호출 생략")
+            incr('llm.cache_hits')
+        return cached
+
+    def _completed(self, model: str, temperature: float, prompt: Prompt, content: str, usage: Dict,
+                   start: float, attempt: int, use_cache: bool, first_token: Optional[float] = None,
+                   finish_reason: Optional[str] = None):
+        """성공한 호출의 지연/토큰 사용량을 기록하고 응답을 캐시합니다. max_tokens에서 잘린 응답은 캐시하지 않습니다."""
+        latency = time.perf_counter() - start
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        # DeepSeek: prompt_cache_hit_tokens, OpenAI: prompt_tokens_details.cached_tokens
+        cached_tokens = (usage.get("prompt_cache_hit_tokens")
+                         or (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0)
+        METRICS.record(latency, prompt_tokens, completion_tokens, attempt, True,
+                       kind=prompt.kind, estimated_tokens=prompt.estimated_tokens, cached_tokens=cached_tokens)
+        first = f", 첫 토큰 {first_token:.2f}초" if first_token is not None else ""
+        self.logger.info(f"API 호출 완료 [{prompt.kind}]: {latency:.2f}초{first}, 토큰 입력 {prompt_tokens} "
+                         f"(추정 {prompt.estimated_tokens}, 캐시 적중 {cached_tokens}) / 출력 {completion_tokens}"
+                         f" (재시도 {attempt}회)")
+        if finish_reason == 'length':
+            incr('llm.truncated')
+            self.logger.warning(f"응답이 최대 토큰 수({prompt.max_tokens or '제공자 기본값'})에서 잘림 [{prompt.kind}] "
+                                f"- 캐시하지 않음")
+            return
+        if use_cache:
+            self.cache.put(model, temperature, prompt.cache_text(), content)
+
+    def chat(self, prompt: Union[str, Prompt], temperature: float = 0.7, model: Optional[str] = None,
+             use_cache: bool = True) -> str:
+        """
+        프롬프트 하나를 보내고 응답 텍스트를 반환합니다. 같은 프롬프트의 캐시된 응답이 있으면 재사용합니다.
+
+        문자열 프롬프트는 시스템 메시지 없이 보내고 토큰 사용량을 'other' 종류로 집계합니다.
+        """
+        prompt = _as_prompt(prompt)
+        model = model or self.model
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            cached = self._cached(model, temperature, prompt)
+            if cached is not None:
+                return cached
+
+        data = self._request(prompt, model, temperature)
+
+        start = time.perf_counter()
+        response, attempt, permit = self._post(data, start, prompt.kind)
+        try:
+            body = response.json()
+            choice = body["choices"][0]
+            content = choice["message"]["content"]
+        except Exception as e:
+            self.guard.release(permit, FAILED)
+            METRICS.record(time.perf_counter() - start, 0, 0, attempt, False)
+            self.logger.error(f"예상치 못한 API 호출 오류: {str(e)}")
+            raise
+        self.guard.release(permit, OK)
+
+        self._completed(model, temperature, prompt, content, body.get("usage") or {}, start, attempt, use_cache,
+                        finish_reason=choice.get("finish_reason"))
+        return content
+
+    def chat_stream(self, prompt: Union[str, Prompt], temperature: float = 0.7, model: Optional[str] = None,
+                    use_cache: bool = True) -> Iterator[str]:
+        """
+        SSE 스트리밍으로 요청하고 응답 텍스트 조각을 도착하는 대로 내보냅니다.
+
+        재시도는 첫 조각을 받기 전(연결/상태 코드 단계)에만 하며, 수신 도중 끊기면 예외를 그대로 올립니다.
+        캐시 적중이나 스트리밍을 지원하지 않는 서버(JSON 응답)는 전체 텍스트를 한 조각으로 내보냅니다.
+        """
+        prompt = _as_prompt(prompt)
+        model = model or self.model
+        use_cache = use_cache and self.cache is not None
+        if use_cache:
+            cached = self._cached(model, temperature, prompt)
+            if cached is not None:
+                yield cached
+                return
+
+        data = self._request(prompt, model, temperature)
+        data["stream"] = True
+        data["stream_options"] = {"include_usage": True}
+
+        start = time.perf_counter()
+        response, attempt, permit = self._post(data, start, prompt.kind, stream=True)
+        parts: List[str] = []
+        usage: Dict = {}
+        first_token = None
+        finish_reason = None
+        # 호출자가 수신 도중 그만두면(GeneratorExit) 제공자 상태와 무관하므로 신호 없이 허가만 반납
+        outcome = CANCELLED
+        try:
+            with response:
+                if 'text/event-stream' not in response.headers.get('Content-Type', ''):
+                    body = response.json()
+                    usage = body.get("usage") or {}
+                    finish_reason = body["choices"][0].get("finish_reason")
+                    parts.append(body["choices"][0]["message"]["content"])
+                    first_token = time.perf_counter() - start
+                    yield parts[0]
+                else:
+                    for line in response.iter_lines():
+                        if not line.startswith(b'data:'):
+                            continue
+                        payload = line[5:].strip()
+                        if payload == b'[DONE]':
+                            break
+                        event = json.loads(payload)
+                        usage = event.get("usage") or usage
+                        for choice in event.get("choices") or []:
+                            finish_reason = choice.get("finish_reason") or finish_reason
+                            delta = (choice.get("delta") or {}).get("content")
+                            if not delta:
+                                continue
+                            if first_token is None:
+                                first_token = time.perf_counter() - start
+                                add_time('llm.first_token', first_token)
+                            parts.append(delta)
+                            yield delta
+            outcome = OK
+        except Exception as e:
+            outcome = FAILED
+            METRICS.record(time.perf_counter() - start, 0, 0, attempt, False)
+            self.logger.error(f"스트리밍 응답 수신 중 오류 ({len(parts)}개 조각 수신 후): {str(e)}")
+            raise
+        finally:
+            self.guard.release(permit, outcome)
+
+        self._completed(model, temperature, prompt, ''.join(parts), usage, start, attempt, use_cache, first_token,
+                        finish_reason)
+
+    def forget(self, prompt: Union[str, Prompt], temperature: float = 0.7, model: Optional[str] = None):
+        """사용할 수 없는 응답으로 판명된 프롬프트의 캐시 항목을 제거합니다."""
+        if self.cache is not None:
+            self.cache.discard(model or self.model, temperature, _as_prompt(prompt).cache_text())
+
+
+_clients: Dict[Tuple[str, str], LLMClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key: str, api_url: str = DEEPSEEK_API_URL) -> LLMClient:
+    """(API 키, URL)별로 하나의 공유 클라이언트를 반환합니다."""
+    key = (api_key, api_url)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = LLMClient(api_key, api_url)
+        return _clients[key]
@@ -0,0 +1,238 @@
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional
+from instrumentation import add_time, incr
+
+# 호출 결과 (AdaptiveConcurrency / CircuitBreaker에 전달)
+OK = 'ok'                  # 성공
+THROTTLED = 'throttled'    # 429: 동시성 감소, 장애로 보지 않음
+FAILED = 'failed'          # 5xx, 타임아웃, 연결 오류, 응답 수신 중 끊김: 동시성 감소 + 장애 카운트
+REJECTED = 'rejected'      # 그 밖의 4xx: 제공자는 응답했으므로 성공으로 보되 동시성 신호는 없음
+CANCELLED = 'cancelled'    # 호출자가 스트리밍 수신을 중단함: 신호 없음
+
+
+class CircuitOpenError(RuntimeError):
+    """제공자 장애로 회로가 열려 있어 호출하지 않고 즉시 실패할 때 발생합니다."""
+
+
+class TokenBucket:
+    """
+    초당 rate개, 최대 burst개까지 쌓이는 토큰 버킷 (스레드 안전).
+
+    429의 Retry-After처럼 제공자가 대기를 요구하면 pause로 모든 호출자를 함께 멈춥니다.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def acquire(self) -> float:
+        """토큰 하나를 얻을 때까지 기다리고 대기 시간(초)을 반환합니다."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                else:
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD(가산 증가/승산 감소) 방식의 동시 호출 수 제한 (스레드 안전).
+
+    성공할 때마다 한도를 1/한도씩 늘려 한도만큼 성공하면 1 증가하고,
+    429/5xx/타임아웃이나 프롬프트 종류별 평소 지연(EWMA)의 latency_factor배를 넘는 응답이 오면 decrease배로 줄입니다.
+    한 번의 혼잡에 여러 호출이 동시에 실패해도 한 번만 줄이도록, 감소 후 cooldown초 동안은 다시 줄이지 않습니다.
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 16, latency_factor: float = 2.0,
+                 decrease: float = 0.5, cooldown: float = 2.0):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.latency_factor = latency_factor
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.decreases = 0
+        self._baselines: Dict[str, float] = {}
+        self._samples: Dict[str, int] = {}
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> float:
+        """자리가 날 때까지 기다리고 대기 시간(초)을 반환합니다."""
+        start = time.perf_counter()
+        with self._cond:
+            self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return time.perf_counter() - start
+
+    def _slow(self, kind: str, latency: float) -> bool:
+        """프롬프트 종류별 평소 지연보다 크게 느린 응답인지 판단하고 평소 지연을 갱신합니다."""
+        baseline = self._baselines.get(kind)
+        samples = self._samples.get(kind, 0)
+        self._samples[kind] = samples + 1
+        slow = baseline is not None and samples >= 5 and latency > baseline * self.latency_factor
+        if not slow:
+            self._baselines[kind] = latency if baseline is None else baseline * 0.8 + latency * 0.2
+        return slow
+
+    def release(self, outcome: str, latency: float = 0.0, kind: str = 'other'):
+        with self._cond:
+            self.in_flight -= 1
+            congested = outcome in (THROTTLED, FAILED) or (outcome == OK and self._slow(kind, latency))
+            now = time.monotonic()
+            if congested:
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self._last_decrease = now
+                    self.decreases += 1
+            elif outcome == OK:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class CircuitBreaker:
+    """
+    연속 장애가 failure_threshold번 나면 회로를 열어 reset_timeout초 동안 호출하지 않고 즉시 실패시킵니다.
+
+    시간이 지나면 반열림(half-open) 상태에서 시험 호출 하나만 보내고, 성공하면 닫고 실패하면 다시 엽니다.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def is_open(self) -> bool:
+        """
+        회로가 열려 있고 재시도 시간이 아직 지나지 않았는지.
+
+        시간이 지났으면 False를 반환해 호출자가 다음 호출(before_call에서 반열림 시험 호출)을 시도하게 합니다.
+        """
+        with self._lock:
+            return self.state == self.OPEN and time.monotonic() < self.opened_at + self.reset_timeout
+
+    def before_call(self):
+        """호출해도 되는지 확인합니다. 회로가 열려 있으면 CircuitOpenError를 발생시킵니다."""
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self.opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    raise CircuitOpenError(f"LLM 제공자 장애로 회로 열림 ({remaining:.0f}초 후 재시도)")
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    raise CircuitOpenError("LLM 제공자 복구 확인 중 (시험 호출 진행 중)")
+                self._probing = True
+
+    def record(self, outcome: str):
+        with self._lock:
+            if outcome == FAILED:
+                self.failures += 1
+                if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                    if self.state != self.OPEN:
+                        self.opens += 1
+                        self.logger.error(f"LLM 호출 연속 실패 {self.failures}회 - {self.reset_timeout:.0f}초 동안 호출 중단")
+                    self.state = self.OPEN
+                    self.opened_at = time.monotonic()
+                    self._probing = False
+            elif outcome in (OK, REJECTED):
+                if self.state != self.CLOSED:
+                    self.logger.info("LLM 제공자 복구 확인 - 호출 재개")
+                self.state = self.CLOSED
+                self.failures = 0
+                self._probing = False
+            elif self.state == self.HALF_OPEN:
+                # 429, 수신 중단 등 판단할 수 없는 결과: 다음 호출이 다시 시험하도록 함
+                self._probing = False
+
+
+class CallPermit:
+    """LLMGuard.acquire가 돌려주는 호출 허가. release로 결과를 알려야 합니다."""
+
+    __slots__ = ('kind', 'started', 'released')
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.released = False
+
+
+class LLMGuard:
+    """
+    모든 LLM 호출이 공유하는 회로 차단기 + 토큰 버킷 + AIMD 동시성 제한.
+
+    호출(재시도 포함 각 시도)마다 acquire로 허가를 받고, 응답을 끝까지 받은 뒤 release로 결과를 알립니다.
+    """
+
+    def __init__(self, rate: float, burst: int, concurrency: int, min_concurrency: int, max_concurrency: int,
+                 latency_factor: float, failure_threshold: int, reset_timeout: float):
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = AdaptiveConcurrency(concurrency, min_concurrency, max_concurrency, latency_factor)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+    def acquire(self, kind: str = 'other') -> CallPermit:
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            incr('llm.circuit_rejections')
+            raise
+        waited = self.bucket.acquire()
+        if waited:
+            add_time('llm.rate_wait', waited)
+        waited = self.concurrency.acquire()
+        if waited > 0.001:
+            add_time('llm.concurrency_wait', waited)
+        return CallPermit(kind)
+
+    def release(self, permit: CallPermit, outcome: str, retry_after: Optional[float] = None):
+        if permit.released:
+            return
+        permit.released = True
+        if outcome == THROTTLED:
+            incr('llm.throttled')
+            if retry_after:
+                self.bucket.pause(retry_after)
+        self.concurrency.release(outcome, time.perf_counter() - permit.started, permit.kind)
+        self.breaker.record(outcome)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """실행 보고서용 상태."""
+        return {
+            'concurrency_limit': round(self.concurrency.limit, 2),
+            'concurrency_decreases': self.concurrency.decreases,
+            'circuit_state': self.breaker.state,
+            'circuit_opens': self.breaker.opens,
+        }
@@ -0,0 +1,230 @@
+import re
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+from dedup_index import normalize_arxiv_id
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+class Paper:
+    """
+    크롤러, 분석기, 랭커, 포스터가 주고받는 논문 레코드.
+
+    __slots__로 필드를 고정해 논문마다 dict를 만들지 않고, 키 오타를 AttributeError로 드러냅니다.
+    (dataclass(slots=True)는 Python 3.10부터라 직접 __slots__를 선언합니다.)
+    카테고리 문자열은 intern하여 논문 간에 공유하고, 정규화된 arXiv ID, 소문자 제목/초록,
+    토큰 수는 처음 사용할 때 한 번만 계산합니다.
+
+    기존 dict 기반 코드와의 호환을 위해 paper['title'], paper.get('url'), 'tags' in paper,
+    {**paper} 같은 dict 방식 접근을 지원합니다. 기본 메타데이터 키는 항상 있고(값은 None일 수 있음),
+    분석/랭킹 필드는 값이 있을 때만 있는 키로 취급하며, 정의되지 않은 키는 extra에 보관됩니다.
+    'paper_id'는 정규화된 arXiv ID(없으면 url)를 돌려줍니다.
+    """
+
+    # 기본 메타데이터 (to_dict에 항상 포함)
+    BASE_FIELDS = ('title', 'authors', 'abstract', 'url', 'pdf_url', 'published', 'categories',
+                   'doi', 'comment', 'score')
+    # 분석/랭킹 단계에서 채워지는 필드 (값이 있을 때만 포함)
+    OPTIONAL_FIELDS = ('classification', 'tags', 'summary', 'translation', 'keywords')
+    FIELDS = BASE_FIELDS + OPTIONAL_FIELDS
+    _BASE_SET = frozenset(BASE_FIELDS)
+    _OPTIONAL_SET = frozenset(OPTIONAL_FIELDS)
+    # 이전 형식의 키 -> 필드 (읽을 때만 사용)
+    ALIASES = {'original_abstract': 'abstract'}
+
+    __slots__ = ('_title', 'authors', '_abstract', '_url', 'pdf_url', 'published', '_categories',
+                 'doi', 'comment', 'score', 'classification', 'tags', 'summary', 'translation',
+                 'keywords', 'extra', '_arxiv_id', '_title_lower', '_abstract_lower', '_token_count')
+
+    def __init__(self, title: str = '', authors: Optional[List[str]] = None, abstract: str = '',
+                 url: Optional[str] = None, pdf_url: Optional[str] = None, published: Optional[str] = None,
+                 categories: Optional[Iterable[str]] = None, doi: Optional[str] = None,
+                 comment: Optional[str] = None, score: float = 0, classification: Optional[str] = None,
+                 tags: Optional[List[str]] = None, summary: Optional[str] = None,
+                 translation: Optional[str] = None, keywords: Optional[List[str]] = None,
+                 extra: Optional[Dict[str, Any]] = None):
+        self._arxiv_id = self._title_lower = self._abstract_lower = self._token_count = None
+        self.title = title
+        self.authors = authors if authors is not None else []
+        self.abstract = abstract
+        self.url = url
+        self.pdf_url = pdf_url
+        self.published = published
+        self.categories = categories if categories is not None else []
+        self.doi = doi
+        self.comment = comment
+        self.score = score
+        self.classification = classification
+        self.tags = tags
+        self.summary = summary
+        self.translation = translation
+        self.keywords = keywords
+        self.extra = extra
+
+    # --- 파생 값이 있는 필드 (값이 바뀌면 캐시 무효화) ---
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @title.setter
+    def title(self, value: str):
+        self._title = value
+        self._title_lower = self._token_count = None
+
+    @property
+    def abstract(self) -> str:
+        return self._abstract
+
+    @abstract.setter
+    def abstract(self, value: str):
+        self._abstract = value
+        self._abstract_lower = self._token_count = None
+
+    @property
+    def url(self) -> Optional[str]:
+        return self._url
+
+    @url.setter
+    def url(self, value: Optional[str]):
+        self._url = value
+        self._arxiv_id = None
+
+    @property
+    def categories(self) -> List[str]:
+        return self._categories
+
+    @categories.setter
+    def categories(self, value: Iterable[str]):
+        self._categories = [sys.intern(category) for category in value or ()]
+
+    # --- 지연 계산 필드 ---
+    @property
+    def arxiv_id(self) -> Optional[str]:
+        """버전과 스킴을 제거한 arXiv ID (예: '2504.07936')."""
+        if self._arxiv_id is None and self._url:
+            self._arxiv_id = normalize_arxiv_id(self._url)
+        return self._arxiv_id
+
+    @property
+    def paper_id(self) -> Optional[str]:
+        return self.arxiv_id or self._url
+
+    @property
+    def title_lower(self) -> str:
+        if self._title_lower is None:
+            self._title_lower = (self._title or '').lower()
+        return self._title_lower
+
+    @property
+    def abstract_lower(self) -> str:
+        if self._abstract_lower is None:
+            self._abstract_lower = (self._abstract or '').lower()
+        return self._abstract_lower
+
+    @property
+    def token_count(self) -> int:
+        """제목과 초록의 단어 수."""
+        if self._token_count is None:
+            self._token_count = len(TOKEN_PATTERN.findall(self._title or '')) + len(TOKEN_PATTERN.findall(self._abstract or ''))
+        return self._token_count
+
+    # --- 직렬화 ---
+    def to_dict(self) -> Dict[str, Any]:
+        data = {field: getattr(self, field) for field in self.BASE_FIELDS}
+        for field in self.OPTIONAL_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'Paper':
+        paper = cls()
+        for key, value in data.items():
+            paper[key] = value
+        return paper
+
+    @classmethod
+    def coerce(cls, paper: Union['Paper', Mapping[str, Any]]) -> 'Paper':
+        """Paper는 그대로, dict는 Paper로 변환합니다."""
+        return paper if isinstance(paper, cls) else cls.from_dict(paper)
+
+    def copy(self, **changes) -> 'Paper':
+        """얕은 복사본을 만들고 changes의 키를 덮어씁니다."""
+        paper = Paper.__new__(Paper)
+        for slot in self.__slots__:
+            object.__setattr__(paper, slot, getattr(self, slot))
+        paper.authors = list(self.authors)
+        paper.extra = dict(self.extra) if self.extra else None
+        for key, value in changes.items():
+            paper[key] = value
+        return paper
+
+    # --- dict 호환 ---
+    def __getitem__(self, key: str) -> Any:
+        if key in self._BASE_SET:
+            return getattr(self, key)
+        if key in self._OPTIONAL_SET or key == 'paper_id':
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key == 'paper_id':
+            # 이전 형식: 식별자만 있는 경우 url로 사용
+            if not self._url:
+                self.url = value
+        elif key in self.ALIASES:
+            if not getattr(self, self.ALIASES[key]):
+                setattr(self, self.ALIASES[key], value)
+        elif key in self._BASE_SET or key in self._OPTIONAL_SET:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> List[str]:
+        return list(self.to_dict().keys())
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return list(self.to_dict().items())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def update(self, other: Union['Paper', Mapping[str, Any], None] = None, **changes):
+        for key, value in (other.items() if other is not None else ()):
+            self[key] = value
+        for key, value in changes.items():
+            self[key] = value
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Paper):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Paper({self.paper_id!r}, {self._title!r})"
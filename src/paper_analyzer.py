@@ -1,15 +1,21 @@
 import json
-import requests
-from typing import Dict, Any, List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Union
 import time
 import logging
-from config import DEEPSEEK_API_KEY, DEEPSEEK_API_URL, ANALYSIS_PROMPTS
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from config import (DEEPSEEK_API_KEY, DEEPSEEK_API_URL, ANALYSIS_PROMPTS, LLM_MAX_CONCURRENCY,
+                    PROMPT_MAX_TOKENS, PROMPT_ABSTRACT_TOKENS)
+from llm_client import get_client
+from prompts import Prompt, compact_abstract
+from paper import Paper
+from paper_store import PaperStore, paper_key
+from instrumentation import timed
 
 class PaperAnalyzer:
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, store: Optional[PaperStore] = None):
         self.config = config
+        self.store = store
         self.logger = logging.getLogger(__name__)
         
         if not DEEPSEEK_API_KEY:
@@ -17,51 +23,12 @@ class PaperAnalyzer:
         self.api_key = DEEPSEEK_API_KEY
         self.api_url = DEEPSEEK_API_URL
         
-        # 세션 설정
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=3,  # 최대 3번 재시도
-            backoff_factor=1,  # 재시도 간격 (1, 2, 4초)
-            status_forcelist=[500, 502, 503, 504]  # 재시도할 HTTP 상태 코드
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-
-    def _call_api(self, prompt: str, max_retries: int = 3) -> str:
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        data = {
-            "model": "deepseek-chat",
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.7
-        }
-        
-        for attempt in range(max_retries):
-            try:
-                self.logger.info(f"API 호출 시도 {attempt + 1}/{max_retries}")
-                response = self.session.post(
-                    self.api_url,
-                    headers=headers,
-                    json=data,
-                    timeout=30  # 30초 타임아웃
-                )
-                response.raise_for_status()
-                return response.json()["choices"][0]["message"]["content"]
-            except requests.exceptions.RequestException as e:
-                self.logger.warning(f"API 호출 실패 (시도 {attempt + 1}/{max_retries}): {str(e)}")
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # 지수 백오프
-                    self.logger.info(f"{wait_time}초 후 재시도...")
-                    time.sleep(wait_time)
-                else:
-                    self.logger.error(f"API 호출 최대 재시도 횟수 초과: {str(e)}")
-                    raise
-            except Exception as e:
-                self.logger.error(f"예상치 못한 API 호출 오류: {str(e)}")
-                raise
+        self.llm = get_client(self.api_key, self.api_url)
+        # 프롬프트에 넣는 초록의 최대 추정 토큰 수
+        self.abstract_tokens = int(config.get('PROMPT_ABSTRACT_TOKENS') or PROMPT_ABSTRACT_TOKENS)
+
+    def _call_api(self, prompt: Prompt) -> str:
+        return self.llm.chat(prompt)
 
     def _parse_classification(self, response: str) -> Dict[str, Any]:
         lines = response.split("\n")
@@ -97,65 +64,128 @@ class PaperAnalyzer:
         
         return "\n".join(cleaned_lines)
 
+    def _prompt(self, name: str, title: str, abstract: str) -> Prompt:
+        """ANALYSIS_PROMPTS[name]에 정리/예산 적용한 초록을 채운 프롬프트."""
+        kind = f"analysis.{name}"
+        text = ANALYSIS_PROMPTS[name].format(title=' '.join(title.split()),
+                                             abstract=compact_abstract(abstract, self.abstract_tokens))
+        return Prompt(kind, text, max_tokens=PROMPT_MAX_TOKENS.get(kind))
+
+    def _translation_prompt(self, abstract: str) -> Prompt:
+        return self._prompt("translation", "", abstract)
+
     def _translate_abstract(self, abstract: str) -> str:
-        prompt = f"다음 영어 초록을 한국어로 번역해주세요. 전문 용어는 원문(영어)을 병기해주세요:\n\n{abstract}"
-        return self._call_api(prompt)
+        return self._call_api(self._translation_prompt(abstract))
 
-    def _analyze_paper_content(self, title: str, abstract: str) -> Dict[str, Any]:
-        # 분류 및 태그 생성
-        classification_prompt = ANALYSIS_PROMPTS["classification"].format(
-            title=title,
-            abstract=abstract
+    def _executor(self) -> ThreadPoolExecutor:
+        """
+        블로킹 API 호출을 실행할 스레드 풀.
+
+        호출 속도/동시 호출 수는 LLM 클라이언트가 공유하는 호출 제한(LLM_GUARD)이 정하므로,
+        스레드 수는 그 동시성 상한에 맞춰 스레드 풀이 따로 제한하지 않도록 합니다.
+        """
+        return ThreadPoolExecutor(max_workers=LLM_MAX_CONCURRENCY, thread_name_prefix='analyze')
+
+    async def _call_api_async(self, prompt: Prompt, executor: ThreadPoolExecutor) -> str:
+        """블로킹 API 호출을 스레드 풀로 실행합니다."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self._call_api, prompt)
+
+    async def _analyze_paper_content_async(self, title: str, abstract: str,
+                                           executor: ThreadPoolExecutor) -> Dict[str, Any]:
+        """분류, 요약, 초록 번역 세 프롬프트를 동시에 호출합니다."""
+        classification_prompt = self._prompt("classification", title, abstract)
+        summary_prompt = self._prompt("summary", title, abstract)
+        classification_response, summary_response, translation = await asyncio.gather(
+            self._call_api_async(classification_prompt, executor),
+            self._call_api_async(summary_prompt, executor),
+            self._call_api_async(self._translation_prompt(abstract), executor),
         )
-        classification_response = self._call_api(classification_prompt)
         classification_result = self._parse_classification(classification_response)
         
-        # 요약 생성
-        summary_prompt = ANALYSIS_PROMPTS["summary"].format(
-            title=title,
-            abstract=abstract
-        )
-        summary_response = self._call_api(summary_prompt)
-        cleaned_summary = self._clean_response(summary_response)
-        
-        # 초록 번역
-        translation = self._translate_abstract(abstract)
-        
         return {
             "classification": classification_result["classification"],
             "tags": classification_result["tags"],
-            "summary": cleaned_summary,
+            "summary": self._clean_response(summary_response),
             "translation": translation
         }
 
-    def analyze_paper(self, paper: Dict[str, Any]) -> Dict[str, Any]:
-        """논문을 분석하고 결과를 반환합니다."""
+    def _analyze_paper_content(self, title: str, abstract: str) -> Dict[str, Any]:
+        async def _run():
+            with self._executor() as executor:
+                return await self._analyze_paper_content_async(title, abstract, executor)
+        return asyncio.run(_run())
+
+    def _build_result(self, paper: Paper, analysis_result: Dict[str, Any]) -> Paper:
+        return paper.copy(
+            classification=analysis_result["classification"],
+            tags=analysis_result["tags"],
+            summary=analysis_result["summary"],
+            translation=analysis_result["translation"]
+        )
+
+    def _stored_result(self, paper: Paper) -> Optional[Paper]:
+        """저장소에 이전 분석 결과가 있으면 반환합니다."""
+        if self.store is None:
+            return None
+        stored = self.store.get_artifact(paper_key(paper), 'analysis')
+        if stored is None:
+            return None
+        self.logger.info(f"Using stored analysis: {paper.title}")
+        # 이전 형식(paper_id/original_abstract만 있는 결과)도 원본 메타데이터와 합쳐서 반환
+        return paper.copy(**stored)
+
+    def _store_result(self, paper: Paper, result: Paper):
+        if self.store is not None:
+            self.store.save_artifact(paper_key(paper), 'analysis', result.to_dict())
+
+    @timed('analyze')
+    def analyze_paper(self, paper: Union[Paper, Dict[str, Any]]) -> Paper:
+        """논문을 분석하고 결과(분류, 태그, 요약, 번역이 채워진 Paper)를 반환합니다."""
+        paper = Paper.coerce(paper)
+        stored = self._stored_result(paper)
+        if stored is not None:
+            return stored
         self.logger.info(f"Analyzing paper: {paper['title']}")
         
         try:
             analysis_result = self._analyze_paper_content(paper["title"], paper["abstract"])
-            
-            return {
-                "paper_id": paper["paper_id"],
-                "title": paper["title"],
-                "classification": analysis_result["classification"],
-                "tags": analysis_result["tags"],
-                "summary": analysis_result["summary"],
-                "translation": analysis_result["translation"],
-                "original_abstract": paper["abstract"]
-            }
+            result = self._build_result(paper, analysis_result)
+            self._store_result(paper, result)
+            return result
         except Exception as e:
-            self.logger.error(f"Error analyzing paper {paper['paper_id']}: {str(e)}")
+            self.logger.error(f"Error analyzing paper {paper.paper_id}: {str(e)}")
             raise
 
-    def analyze_papers(self, papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def analyze_papers_async(self, papers: List[Union[Paper, Dict[str, Any]]]) -> List[Paper]:
+        """여러 논문을 동시에 분석합니다. 결과 순서는 입력 순서와 같고, 실패한 논문은 제외됩니다."""
+        papers = [Paper.coerce(paper) for paper in papers]
+        with self._executor() as executor:
+            async def _analyze(paper: Paper) -> Paper:
+                stored = self._stored_result(paper)
+                if stored is not None:
+                    return stored
+                self.logger.info(f"Analyzing paper: {paper.title}")
+                analysis_result = await self._analyze_paper_content_async(paper["title"], paper["abstract"], executor)
+                result = self._build_result(paper, analysis_result)
+                self._store_result(paper, result)
+                return result
+
+            outcomes = await asyncio.gather(*(_analyze(paper) for paper in papers), return_exceptions=True)
+
         results = []
-        for paper in papers:
-            try:
-                result = self.analyze_paper(paper)
-                results.append(result)
-                time.sleep(1)  # API 호출 간 딜레이
-            except Exception as e:
-                self.logger.error(f"Failed to analyze paper {paper['paper_id']}: {str(e)}")
+        for paper, outcome in zip(papers, outcomes):
+            if isinstance(outcome, Exception):
+                self.logger.error(f"Failed to analyze paper {paper.paper_id}: {str(outcome)}")
                 continue
-        return results 
\ No newline at end of file
+            results.append(outcome)
+        return results
+
+    @timed('analyze.batch')
+    def analyze_papers(self, papers: List[Union[Paper, Dict[str, Any]]]) -> List[Paper]:
+        start = time.perf_counter()
+        results = asyncio.run(self.analyze_papers_async(papers))
+        self.logger.info(f"{len(results)}/{len(papers)}개 논문 분석 완료 ({time.perf_counter() - start:.1f}초, "
+                         f"동시 호출 한도 {self.llm.guard.concurrency.limit:.1f})")
+        return results
+
@@ -1,6 +1,13 @@
+import re
+import json
 import logging
-from typing import List, Dict, Any
-from config import DEEPSEEK_API_KEY, DEEPSEEK_API_URL
+from typing import List, Dict, Any, Optional, Tuple, Union
+from config import (DEEPSEEK_API_KEY, DEEPSEEK_API_URL, PROMPT_MAX_TOKENS, PROMPT_ABSTRACT_TOKENS,
+                    RANK_ABSTRACT_TOKENS)
+from llm_client import get_client
+from prompts import Prompt, compact_abstract
+from paper import Paper
+from instrumentation import timed
 
 class PaperRanker:
     def __init__(self):
@@ -9,34 +16,20 @@ class PaperRanker:
         self.api_key = DEEPSEEK_API_KEY
         self.api_url = DEEPSEEK_API_URL
         self.logger = logging.getLogger(__name__)
+        self.llm = get_client(self.api_key, self.api_url)
 
-    def _call_api(self, prompt: str) -> str:
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        data = {
-            "model": "deepseek-chat",
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.7
-        }
-        
-        try:
-            response = requests.post(self.api_url, headers=headers, json=data)
-            response.raise_for_status()
-            return response.json()["choices"][0]["message"]["content"]
-        except Exception as e:
-            self.logger.error(f"API call failed: {str(e)}")
-            raise
+    def _call_api(self, prompt: Prompt) -> str:
+        return self.llm.chat(prompt)
 
-    def _extract_keywords(self, paper: Dict[str, Any]) -> List[str]:
+    @staticmethod
+    def _prompt(kind: str, text: str, max_tokens: Optional[int] = None) -> Prompt:
+        return Prompt(kind, text, max_tokens=max_tokens or PROMPT_MAX_TOKENS.get(kind))
+
+    def _extract_keywords(self, paper: Paper) -> List[str]:
         """
         논문에서 핵심 키워드를 추출합니다.
         """
-        prompt = f"""다음 논문에서 핵심 키워드를 추출해주세요:
-
-제목: {paper['title']}
-초록: {paper['abstract']}
+        prompt = self._prompt('rank.keywords', f"""다음 논문에서 핵심 키워드를 추출해주세요.
 
 키워드 추출 규칙:
 1. 기술적 용어와 개념을 우선적으로 추출
@@ -47,7 +40,10 @@ class PaperRanker:
 
 응답 형식:
 키워드: [키워드1], [키워드2], [키워드3], ...
-"""
+
+제목: {paper['title']}
+초록: {compact_abstract(paper['abstract'], PROMPT_ABSTRACT_TOKENS)}
+""")
         try:
             response = self._call_api(prompt)
             keywords_str = response.split("키워드:")[1].strip()
@@ -57,16 +53,11 @@ class PaperRanker:
             self.logger.error(f"Error extracting keywords from paper {paper['title']}: {str(e)}")
             return []
 
-    def _evaluate_paper(self, paper: Dict[str, Any]) -> float:
+    def _evaluate_paper(self, paper: Paper) -> float:
         """
         논문의 중요도와 관련성을 평가하여 점수를 매깁니다.
         """
-        prompt = f"""다음 논문의 중요도와 관련성을 평가해주세요:
-
-제목: {paper['title']}
-초록: {paper['abstract']}
-분류: {paper['classification']}
-태그: {', '.join(paper['tags'])}
+        prompt = self._prompt('rank.evaluate', f"""다음 논문의 중요도와 관련성을 평가해주세요.
 
 평가 기준:
 1. 연구의 혁신성과 독창성 (0-30점)
@@ -77,7 +68,12 @@ class PaperRanker:
 각 기준에 대한 점수를 0-100 사이의 정수로 평가해주세요.
 응답 형식:
 총점: [점수]
-"""
+
+제목: {paper['title']}
+초록: {compact_abstract(paper['abstract'], PROMPT_ABSTRACT_TOKENS)}
+분류: {paper['classification']}
+태그: {', '.join(paper['tags'])}
+""")
         try:
             response = self._call_api(prompt)
             score = float(response.split("총점:")[1].strip())
@@ -86,32 +82,153 @@ class PaperRanker:
             self.logger.error(f"Error evaluating paper {paper['title']}: {str(e)}")
             return 0.0
 
-    def rank_papers(self, papers: List[Dict[str, Any]], top_n: int = 10) -> List[Dict[str, Any]]:
+    def _chunk_papers(self, papers: List[Paper], batch_size: int,
+                      max_batch_chars: int) -> List[List[Tuple[int, Dict[str, Any]]]]:
+        """
+        논문들을 (인덱스, 논문) 묶음으로 나눕니다. 묶음 하나의 논문 수와 프롬프트 길이를 제한합니다.
+        """
+        batches = []
+        current: List[Tuple[int, Dict[str, Any]]] = []
+        current_chars = 0
+        for index, paper in enumerate(papers):
+            abstract = compact_abstract(paper.get('abstract'), RANK_ABSTRACT_TOKENS)
+            paper_chars = len(paper.get('title', '')) + len(abstract) + 200
+            if current and (len(current) >= batch_size or current_chars + paper_chars > max_batch_chars):
+                batches.append(current)
+                current, current_chars = [], 0
+            current.append((index, paper))
+            current_chars += paper_chars
+        if current:
+            batches.append(current)
+        return batches
+
+    def _batch_prompt(self, batch: List[Tuple[int, Dict[str, Any]]]) -> Prompt:
+        """배치 평가 프롬프트. 지시문을 앞에 두고, 초록은 논문당 RANK_ABSTRACT_TOKENS 이하로 줄여 뒤에 붙입니다."""
+        items = []
+        for item_id, (_, paper) in enumerate(batch, 1):
+            item = f"""[{item_id}]
+제목: {paper.get('title', '')}
+초록: {compact_abstract(paper.get('abstract'), RANK_ABSTRACT_TOKENS)}"""
+            if paper.get('classification'):
+                item += f"\n분류: {paper['classification']}"
+            if paper.get('tags'):
+                item += f"\n태그: {', '.join(paper['tags'])}"
+            items.append(item)
+        papers_text = "\n\n".join(items)
+        return self._prompt('rank.batch', f"""아래 논문들 각각의 중요도와 관련성을 평가하고 핵심 키워드를 추출해주세요.
+
+평가 기준:
+1. 연구의 혁신성과 독창성 (0-30점)
+2. 기술적 영향력과 실용성 (0-30점)
+3. 연구 분야의 중요성 (0-20점)
+4. 결과의 명확성과 검증 가능성 (0-20점)
+
+키워드 추출 규칙:
+1. 기술적 용어, 연구 방법론, 평가 지표, 분야의 특수 용어 위주
+2. 논문마다 최소 5개, 최대 10개
+
+응답 형식 (JSON 배열만, 논문마다 객체 하나):
+```json
+[
+  {{"id": 1, "score": [0-100 사이 정수 총점], "keywords": ["키워드1", "키워드2", ...]}}
+]
+```
+
+평가할 논문 ({len(batch)}개):
+
+{papers_text}
+""")
+
+    def _parse_batch_response(self, response: str, batch_len: int) -> Dict[int, Tuple[float, List[str]]]:
+        """
+        배치 응답을 항목별로 파싱합니다. 전체 JSON이 깨져도 파싱 가능한 객체는 살립니다.
+
+        Returns:
+            Dict[int, Tuple[float, List[str]]]: 항목 번호(1부터) -> (점수, 키워드)
+        """
+        match = re.search(r'```(?:json)?\s*(.*?)```', response, re.DOTALL)
+        body = match.group(1) if match else response
+
+        try:
+            start, end = body.index('['), body.rindex(']') + 1
+            items = json.loads(body[start:end])
+            if not isinstance(items, list):
+                raise ValueError("JSON 배열이 아님")
+        except ValueError:
+            # 배열 전체 파싱 실패 시 중첩 없는 객체 단위로 개별 파싱
+            items = []
+            for obj_str in re.findall(r'\{[^{}]*\}', body):
+                try:
+                    items.append(json.loads(obj_str))
+                except ValueError:
+                    continue
+
+        results = {}
+        for item in items:
+            try:
+                item_id = int(item['id'])
+                score = float(item['score'])
+                keywords = item.get('keywords', [])
+                if not (1 <= item_id <= batch_len) or not (0 <= score <= 100) or not isinstance(keywords, list):
+                    continue
+                results[item_id] = (score, [str(kw).strip() for kw in keywords if str(kw).strip()])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return results
+
+    def _evaluate_batch(self, batch: List[Tuple[int, Dict[str, Any]]]) -> Dict[int, Tuple[float, List[str]]]:
+        """
+        묶음 하나를 한 번의 API 호출로 평가합니다.
+
+        Returns:
+            Dict[int, Tuple[float, List[str]]]: 원래 인덱스 -> (점수, 키워드). 파싱에 실패한 논문은 빠집니다.
+        """
+        try:
+            response = self._call_api(self._batch_prompt(batch))
+        except Exception as e:
+            self.logger.error(f"Batch evaluation failed ({len(batch)} papers): {str(e)}")
+            return {}
+        parsed = self._parse_batch_response(response, len(batch))
+        return {batch[item_id - 1][0]: value for item_id, value in parsed.items()}
+
+    @timed('rank.llm')
+    def rank_papers(self, papers: List[Union[Paper, Dict[str, Any]]], top_n: int = 10, batch_size: int = 20,
+                    max_batch_chars: int = 24000) -> List[Paper]:
         """
         논문들을 평가하여 상위 n개를 선별합니다.
+
+        여러 논문을 하나의 JSON 프롬프트로 묶어 평가하고(batch_size <= 1이면 논문별 평가),
+        배치 응답에서 파싱하지 못한 논문만 기존 방식으로 개별 평가합니다.
         """
         self.logger.info(f"Ranking {len(papers)} papers...")
+        papers = [Paper.coerce(paper) for paper in papers]
         
-        # 각 논문에 대한 점수 계산 및 키워드 추출
+        evaluated: Dict[int, Tuple[float, List[str]]] = {}
+        if batch_size > 1:
+            batches = self._chunk_papers(papers, batch_size, max_batch_chars)
+            for batch in batches:
+                evaluated.update(self._evaluate_batch(batch))
+            self.logger.info(f"Batch-evaluated {len(evaluated)}/{len(papers)} papers in {len(batches)} calls")
+
+        # 각 논문에 대한 점수 계산 및 키워드 추출 (배치에서 빠진 논문만 개별 호출)
         scored_papers = []
-        for paper in papers:
+        for index, paper in enumerate(papers):
             try:
-                score = self._evaluate_paper(paper)
-                keywords = self._extract_keywords(paper)
-                scored_papers.append({
-                    **paper,
-                    "score": score,
-                    "keywords": keywords
-                })
+                if index in evaluated:
+                    score, keywords = evaluated[index]
+                else:
+                    score = self._evaluate_paper(paper)
+                    keywords = self._extract_keywords(paper)
+                scored_papers.append(paper.copy(score=score, keywords=keywords))
             except Exception as e:
                 self.logger.error(f"Failed to evaluate paper {paper['title']}: {str(e)}")
                 continue
         
         # 점수 기준으로 정렬
-        ranked_papers = sorted(scored_papers, key=lambda x: x["score"], reverse=True)
+        ranked_papers = sorted(scored_papers, key=lambda x: x.score, reverse=True)
         
         # 상위 n개 선택
         top_papers = ranked_papers[:top_n]
         
         self.logger.info(f"Selected top {len(top_papers)} papers")
-        return top_papers 
\ No newline at end of file
+        return top_papers
@@ -0,0 +1,411 @@
+import json
+import sqlite3
+import logging
+import datetime
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+import pytz
+from paper import Paper
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    paper_id   TEXT PRIMARY KEY,
+    title      TEXT NOT NULL,
+    abstract   TEXT,
+    authors    TEXT,
+    pdf_url    TEXT,
+    published  TEXT,
+    categories TEXT,
+    doi        TEXT,
+    comment    TEXT,
+    fetched_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_papers_published ON papers (published);
+
+CREATE TABLE IF NOT EXISTS scores (
+    paper_id        TEXT PRIMARY KEY REFERENCES papers (paper_id),
+    heuristic_score REAL,
+    llm_score       REAL,
+    keywords        TEXT,
+    scored_at       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scores_heuristic ON scores (heuristic_score);
+
+CREATE TABLE IF NOT EXISTS artifacts (
+    paper_id   TEXT NOT NULL,
+    kind       TEXT NOT NULL,
+    content    TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (paper_id, kind)
+);
+
+CREATE TABLE IF NOT EXISTS publish_status (
+    paper_id   TEXT PRIMARY KEY,
+    status     TEXT NOT NULL,
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    blog_title TEXT,
+    last_error TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_publish_status ON publish_status (status);
+
+CREATE TABLE IF NOT EXISTS paper_stages (
+    paper_id    TEXT PRIMARY KEY,
+    stage       TEXT NOT NULL,
+    job_id      INTEGER,
+    failed_step TEXT,
+    last_error  TEXT,
+    updated_at  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_paper_stages ON paper_stages (stage, failed_step);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id     INTEGER PRIMARY KEY AUTOINCREMENT,
+    status     TEXT NOT NULL,
+    paper_ids  TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+"""
+
+# 논문별 처리 단계 (앞으로만 진행): 수집 -> 실행 후보로 선정 -> 블로그 글 생성(저장) -> 발행
+STAGES = ('fetched', 'ranked', 'generated', 'published')
+
+
+def _stage_order(column: str) -> str:
+    """단계 이름 컬럼을 순서 번호로 바꾸는 SQL 식."""
+    return f"CASE {column} " + " ".join(f"WHEN '{stage}' THEN {i}" for i, stage in enumerate(STAGES)) + " END"
+
+
+# 더 뒤의 단계로만 바꾸고, 같거나 뒤의 단계에 도달하면 이전 실패 기록을 지움
+ADVANCE_STAGE_SQL = f"""
+    INSERT INTO paper_stages (paper_id, stage, job_id, updated_at) VALUES (?, ?, ?, ?)
+    ON CONFLICT (paper_id) DO UPDATE SET
+        stage = CASE WHEN {_stage_order('excluded.stage')} > {_stage_order('paper_stages.stage')}
+                     THEN excluded.stage ELSE paper_stages.stage END,
+        job_id = COALESCE(excluded.job_id, paper_stages.job_id),
+        failed_step = CASE WHEN {_stage_order('excluded.stage')} >= {_stage_order('paper_stages.stage')}
+                           THEN NULL ELSE paper_stages.failed_step END,
+        last_error = CASE WHEN {_stage_order('excluded.stage')} >= {_stage_order('paper_stages.stage')}
+                          THEN NULL ELSE paper_stages.last_error END,
+        updated_at = excluded.updated_at
+"""
+
+PUBLISHED_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def paper_key(paper: Union[Paper, Mapping[str, Any]]) -> Optional[str]:
+    """논문(Paper 또는 dict)의 식별자(arXiv entry URL, 없으면 paper_id)를 반환합니다."""
+    return paper.get('url') or paper.get('paper_id')
+
+
+def _now() -> str:
+    return datetime.datetime.now(pytz.UTC).strftime(PUBLISHED_FORMAT)
+
+
+class PaperStore:
+    """
+    논문 후보, 점수, LLM 결과물(분석/블로그 글), 발행 상태를 저장하는 SQLite 저장소.
+
+    크롤러, 분석기, 포스터, 포스트 캐시가 같은 파일을 읽고 써서
+    재실행 시 저장된 상태에서 이어서 진행할 수 있게 합니다.
+    논문별 처리 단계(STAGES)와 실행(job)별 후보 목록도 기록해, 중단된 실행을 같은 후보로 이어가거나
+    발행 단계에서 실패한 논문만 저장된 글로 다시 발행할 수 있습니다.
+    여러 스레드에서 사용할 수 있도록 연결 하나를 잠금으로 보호합니다.
+    """
+
+    def __init__(self, db_file: str = 'papers.db'):
+        """
+        Args:
+            db_file (str): 데이터베이스 파일 경로 (기본값: 'papers.db', 프로젝트 루트에 생성)
+        """
+        self.db_path = Path(db_file) if Path(db_file).is_absolute() else Path(__file__).parent.parent / db_file
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def _execute(self, sql: str, params: Iterable = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            rows = self.conn.execute(sql, tuple(params)).fetchall()
+            self.conn.commit()
+            return rows
+
+    # --- 논문 ---
+    def upsert_papers(self, papers: Iterable[Union[Paper, Mapping[str, Any]]]) -> int:
+        """논문들을 저장합니다. 이미 있는 논문은 메타데이터만 갱신합니다."""
+        rows = []
+        fetched_at = _now()
+        for paper in papers:
+            key = paper_key(paper)
+            if not key:
+                continue
+            rows.append((
+                key, paper.get('title', ''), paper.get('abstract'),
+                json.dumps(paper.get('authors', []), ensure_ascii=False), paper.get('pdf_url'),
+                paper.get('published'), json.dumps(paper.get('categories', [])),
+                paper.get('doi'), paper.get('comment'), fetched_at
+            ))
+        with self._lock:
+            self.conn.executemany("""
+                INSERT INTO papers (paper_id, title, abstract, authors, pdf_url, published, categories, doi, comment, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (paper_id) DO UPDATE SET
+                    title = excluded.title, abstract = excluded.abstract, authors = excluded.authors,
+                    pdf_url = excluded.pdf_url, published = excluded.published,
+                    categories = excluded.categories, doi = excluded.doi, comment = excluded.comment
+            """, rows)
+            self.conn.executemany("""
+                INSERT INTO paper_stages (paper_id, stage, updated_at) VALUES (?, 'fetched', ?)
+                ON CONFLICT (paper_id) DO NOTHING
+            """, [(row[0], fetched_at) for row in rows])
+            self.conn.commit()
+        return len(rows)
+
+    @staticmethod
+    def _row_to_paper(row: sqlite3.Row) -> Paper:
+        paper = Paper(
+            title=row['title'],
+            authors=json.loads(row['authors'] or '[]'),
+            abstract=row['abstract'],
+            url=row['paper_id'],
+            pdf_url=row['pdf_url'],
+            published=row['published'],
+            categories=json.loads(row['categories'] or '[]'),
+            doi=row['doi'],
+            comment=row['comment'],
+            score=0
+        )
+        if 'heuristic_score' in row.keys() and row['heuristic_score'] is not None:
+            paper.score = row['heuristic_score']
+        return paper
+
+    def get_paper(self, paper_id: str) -> Optional[Paper]:
+        rows = self._execute("SELECT * FROM papers WHERE paper_id = ?", (paper_id,))
+        return self._row_to_paper(rows[0]) if rows else None
+
+    def get_papers(self, paper_ids: List[str]) -> List[Paper]:
+        """ID 목록의 논문을 (크롤러 점수와 함께) 목록 순서대로 반환합니다. 없는 논문은 빠집니다."""
+        if not paper_ids:
+            return []
+        placeholders = ', '.join('?' * len(paper_ids))
+        rows = self._execute(f"""
+            SELECT p.*, s.heuristic_score FROM papers p
+            LEFT JOIN scores s ON s.paper_id = p.paper_id
+            WHERE p.paper_id IN ({placeholders})
+        """, paper_ids)
+        by_id = {row['paper_id']: self._row_to_paper(row) for row in rows}
+        return [by_id[paper_id] for paper_id in paper_ids if paper_id in by_id]
+
+    def get_papers_since(self, hours: float) -> List[Paper]:
+        """최근 hours 시간 내에 제출된 논문을 최신순으로 반환합니다."""
+        cutoff = (datetime.datetime.now(pytz.UTC) - datetime.timedelta(hours=hours)).strftime(PUBLISHED_FORMAT)
+        rows = self._execute("SELECT * FROM papers WHERE published >= ? ORDER BY published DESC", (cutoff,))
+        return [self._row_to_paper(row) for row in rows]
+
+    def iter_papers_since(self, hours: float, page_size: int = 500) -> Iterator[Paper]:
+        """get_papers_since와 같은 순서로, page_size개씩 나눠 읽어 내보냅니다 (전체 목록을 만들지 않음)."""
+        cutoff = (datetime.datetime.now(pytz.UTC) - datetime.timedelta(hours=hours)).strftime(PUBLISHED_FORMAT)
+        last = None
+        while True:
+            # 읽는 사이에 다른 스레드가 잠금을 쓸 수 있도록 커서 대신 (published, paper_id) 기준으로 다음 페이지를 조회
+            if last is None:
+                rows = self._execute("SELECT * FROM papers WHERE published >= ? "
+                                     "ORDER BY published DESC, paper_id DESC LIMIT ?", (cutoff, page_size))
+            else:
+                rows = self._execute("SELECT * FROM papers WHERE published >= ? AND (published, paper_id) < (?, ?) "
+                                     "ORDER BY published DESC, paper_id DESC LIMIT ?", (cutoff, *last, page_size))
+            for row in rows:
+                yield self._row_to_paper(row)
+            if len(rows) < page_size:
+                return
+            last = (rows[-1]['published'], rows[-1]['paper_id'])
+
+    # --- 점수 ---
+    def save_scores(self, paper_id: str, heuristic_score: Optional[float] = None,
+                    llm_score: Optional[float] = None, keywords: Optional[List[str]] = None):
+        """점수를 저장합니다. None인 값은 기존 값을 유지합니다."""
+        self._execute("""
+            INSERT INTO scores (paper_id, heuristic_score, llm_score, keywords, scored_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (paper_id) DO UPDATE SET
+                heuristic_score = COALESCE(excluded.heuristic_score, scores.heuristic_score),
+                llm_score = COALESCE(excluded.llm_score, scores.llm_score),
+                keywords = COALESCE(excluded.keywords, scores.keywords),
+                scored_at = excluded.scored_at
+        """, (paper_id, heuristic_score, llm_score,
+              json.dumps(keywords, ensure_ascii=False) if keywords is not None else None, _now()))
+
+    def save_heuristic_scores(self, papers: Iterable[Union[Paper, Mapping[str, Any]]]):
+        """크롤러가 계산한 점수를 한 번에 저장합니다."""
+        now = _now()
+        rows = [(paper_key(paper), paper.get('score', 0), now) for paper in papers if paper_key(paper)]
+        with self._lock:
+            self.conn.executemany("""
+                INSERT INTO scores (paper_id, heuristic_score, scored_at) VALUES (?, ?, ?)
+                ON CONFLICT (paper_id) DO UPDATE SET
+                    heuristic_score = excluded.heuristic_score, scored_at = excluded.scored_at
+            """, rows)
+            self.conn.commit()
+
+    # --- LLM 결과물 ---
+    def save_artifact(self, paper_id: str, kind: str, content: Dict[str, Any]):
+        """LLM 결과물(예: 'analysis', 'blog_post')을 저장합니다."""
+        self._execute("""
+            INSERT INTO artifacts (paper_id, kind, content, created_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT (paper_id, kind) DO UPDATE SET content = excluded.content, created_at = excluded.created_at
+        """, (paper_id, kind, json.dumps(content, ensure_ascii=False), _now()))
+
+    def get_artifact(self, paper_id: str, kind: str) -> Optional[Dict[str, Any]]:
+        rows = self._execute("SELECT content FROM artifacts WHERE paper_id = ? AND kind = ?", (paper_id, kind))
+        return json.loads(rows[0]['content']) if rows else None
+
+    def delete_artifact(self, paper_id: str, kind: str):
+        self._execute("DELETE FROM artifacts WHERE paper_id = ? AND kind = ?", (paper_id, kind))
+
+    # --- 발행 상태 ---
+    def _set_status(self, paper_id: str, status: str, blog_title: Optional[str] = None,
+                    error: Optional[str] = None, count_attempt: bool = True):
+        self._execute("""
+            INSERT INTO publish_status (paper_id, status, attempts, blog_title, last_error, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (paper_id) DO UPDATE SET
+                status = excluded.status,
+                attempts = publish_status.attempts + excluded.attempts,
+                blog_title = COALESCE(excluded.blog_title, publish_status.blog_title),
+                last_error = excluded.last_error,
+                updated_at = excluded.updated_at
+        """, (paper_id, status, 1 if count_attempt else 0, blog_title, error, _now()))
+
+    def mark_published(self, paper_id: str, blog_title: Optional[str] = None, count_attempt: bool = True):
+        self._set_status(paper_id, 'published', blog_title=blog_title, count_attempt=count_attempt)
+        self.advance_stage([paper_id], 'published')
+
+    def mark_failed(self, paper_id: str, error: str, step: str = 'publish'):
+        """발행 시도 실패를 기록합니다. step은 실패한 단계('generate', 'publish', 발행 여부를 알 수 없으면 'publish_unconfirmed')입니다."""
+        self._set_status(paper_id, 'failed', error=error)
+        self.fail_stage(paper_id, step, error)
+
+    def is_published(self, paper_id: str) -> bool:
+        rows = self._execute("SELECT 1 FROM publish_status WHERE paper_id = ? AND status = 'published'", (paper_id,))
+        return bool(rows)
+
+    def published_ids(self) -> List[str]:
+        rows = self._execute("SELECT paper_id FROM publish_status WHERE status = 'published'")
+        return [row['paper_id'] for row in rows]
+
+    def published_papers(self) -> List[Paper]:
+        """발행된 논문의 ID, 제목, 초록을 반환합니다 (중복 감지 인덱스 구성용)."""
+        rows = self._execute("""
+            SELECT ps.paper_id, p.title, p.abstract FROM publish_status ps
+            LEFT JOIN papers p ON p.paper_id = ps.paper_id
+            WHERE ps.status = 'published'
+        """)
+        return [Paper(title=row['title'] or '', abstract=row['abstract'] or '', url=row['paper_id']) for row in rows]
+
+    def unposted_top_papers(self, hours: float = 72, limit: int = 20) -> List[Paper]:
+        """최근 hours 시간 내 아직 발행되지 않은 논문을 점수순으로 반환합니다."""
+        cutoff = (datetime.datetime.now(pytz.UTC) - datetime.timedelta(hours=hours)).strftime(PUBLISHED_FORMAT)
+        rows = self._execute("""
+            SELECT p.*, s.heuristic_score FROM papers p
+            JOIN scores s ON s.paper_id = p.paper_id
+            LEFT JOIN publish_status ps ON ps.paper_id = p.paper_id
+            WHERE p.published >= ? AND (ps.status IS NULL OR ps.status != 'published')
+            ORDER BY s.heuristic_score DESC
+            LIMIT ?
+        """, (cutoff, limit))
+        return [self._row_to_paper(row) for row in rows]
+
+    # --- 처리 단계 ---
+    def advance_stage(self, paper_ids: Iterable[str], stage: str, job_id: Optional[int] = None):
+        """
+        논문들을 stage 단계로 진행합니다. 이미 더 뒤의 단계인 논문은 그대로 두므로 여러 번 호출해도 됩니다.
+        """
+        if stage not in STAGES:
+            raise ValueError(f"알 수 없는 단계: {stage}")
+        now = _now()
+        rows = [(paper_id, stage, job_id, now) for paper_id in paper_ids if paper_id]
+        with self._lock:
+            self.conn.executemany(ADVANCE_STAGE_SQL, rows)
+            self.conn.commit()
+
+    def fail_stage(self, paper_id: str, step: str, error: str):
+        """단계는 그대로 두고 실패한 단계와 오류를 기록합니다."""
+        self._execute("""
+            INSERT INTO paper_stages (paper_id, stage, failed_step, last_error, updated_at)
+            VALUES (?, 'fetched', ?, ?, ?)
+            ON CONFLICT (paper_id) DO UPDATE SET
+                failed_step = excluded.failed_step, last_error = excluded.last_error, updated_at = excluded.updated_at
+        """, (paper_id, step, error, _now()))
+
+    def get_stage(self, paper_id: str) -> Optional[str]:
+        rows = self._execute("SELECT stage FROM paper_stages WHERE paper_id = ?", (paper_id,))
+        return rows[0]['stage'] if rows else None
+
+    def stage_counts(self, paper_ids: List[str]) -> Dict[str, int]:
+        """논문 목록의 단계별 논문 수 (발행 실패한 논문은 'failed.publish' 등으로도 셈)."""
+        if not paper_ids:
+            return {}
+        placeholders = ', '.join('?' * len(paper_ids))
+        rows = self._execute(f"""
+            SELECT stage, failed_step, COUNT(*) AS n FROM paper_stages
+            WHERE paper_id IN ({placeholders}) GROUP BY stage, failed_step
+        """, paper_ids)
+        counts: Dict[str, int] = {}
+        for row in rows:
+            counts[row['stage']] = counts.get(row['stage'], 0) + row['n']
+            if row['failed_step']:
+                key = f"failed.{row['failed_step']}"
+                counts[key] = counts.get(key, 0) + row['n']
+        return counts
+
+    def failed_publishes(self, limit: int = 20) -> List[Paper]:
+        """글은 생성·저장되었지만 발행 단계에서 실패한 논문을 오래된 순으로 반환합니다."""
+        rows = self._execute("""
+            SELECT p.*, s.heuristic_score FROM paper_stages st
+            JOIN papers p ON p.paper_id = st.paper_id
+            JOIN artifacts a ON a.paper_id = st.paper_id AND a.kind = 'blog_post'
+            LEFT JOIN scores s ON s.paper_id = st.paper_id
+            WHERE st.stage = 'generated' AND st.failed_step = 'publish'
+            ORDER BY st.updated_at
+            LIMIT ?
+        """, (limit,))
+        return [self._row_to_paper(row) for row in rows]
+
+    # --- 실행 기록 ---
+    def start_job(self, paper_ids: List[str]) -> int:
+        """순위순 후보 목록으로 새 실행을 기록하고 실행 ID를 반환합니다."""
+        now = _now()
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO jobs (status, paper_ids, started_at, updated_at) VALUES ('running', ?, ?, ?)",
+                (json.dumps(paper_ids), now, now))
+            self.conn.commit()
+            return cursor.lastrowid
+
+    def resumable_job(self, max_age_hours: float) -> Optional[Dict[str, Any]]:
+        """최근 max_age_hours 시간 내에 시작해 끝나지 않은(중단/실패한) 가장 최근 실행을 반환합니다."""
+        cutoff = (datetime.datetime.now(pytz.UTC) - datetime.timedelta(hours=max_age_hours)).strftime(PUBLISHED_FORMAT)
+        rows = self._execute("""
+            SELECT * FROM jobs WHERE status != 'completed' AND started_at >= ?
+            ORDER BY job_id DESC LIMIT 1
+        """, (cutoff,))
+        if not rows:
+            return None
+        row = rows[0]
+        return {'job_id': row['job_id'], 'status': row['status'], 'paper_ids': json.loads(row['paper_ids']),
+                'started_at': row['started_at']}
+
+    def finish_job(self, job_id: int, status: str):
+        """실행 상태를 기록합니다 ('completed'가 아니면 다음 실행에서 이어서 진행)."""
+        self._execute("UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?", (status, _now(), job_id))
@@ -1,68 +1,217 @@
 import os
 import logging
-from typing import Set
+from typing import Optional, Set, Tuple
 from pathlib import Path
+from paper_store import PaperStore
+from dedup_index import DedupIndex
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+
+class _FileLock:
+    """다른 프로세스(예: 스케줄러 두 개)와 캐시 파일을 동시에 수정하지 않도록 하는 배타적 파일 잠금."""
+
+    def __init__(self, lock_path: Path):
+        self.lock_path = lock_path
+        self._file = None
+
+    def __enter__(self):
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.lock_path, 'a+')
+        if os.name == 'nt':
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if os.name == 'nt':
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
 
 class PostCache:
     """
     포스팅된 논문의 ID를 관리하여 중복 포스팅을 방지하는 클래스.
     논문 ID는 파일에 저장됩니다.
+
+    캐시 파일은 한 줄에 ID 하나인 추가 전용(append-only) 저널입니다.
+    새 ID는 파일 끝에 한 줄만 추가하고 fsync하므로 O(1)이며, 쓰는 도중 종료되어도 기존 내용은 보존됩니다.
+    중복/손상 줄이 쌓이면 임시 파일에 정리본을 쓴 뒤 원자적으로 교체(compaction)합니다.
+    기존의 정렬된 일반 텍스트 캐시 파일도 같은 형식이므로 그대로 읽힙니다.
+
+    중복 확인은 정규화된 arXiv ID(버전/스킴 무시)로 하며, 저장소가 있으면
+    발행된 논문의 제목/초록 MinHash로 교차 등록된 같은 연구도 찾아냅니다 (find_duplicate).
     """
-    def __init__(self, cache_file: str = 'posted_papers.txt'):
+    def __init__(self, cache_file: str = 'posted_papers.txt', store: Optional[PaperStore] = None,
+                 compact_threshold: int = 100):
         """
         캐시를 초기화합니다.
 
         Args:
             cache_file (str): 캐시 파일의 경로 (기본값: 'posted_papers.txt').
                               파일은 프로젝트 루트에 생성됩니다.
+            store (PaperStore): 발행 상태를 함께 기록/조회할 저장소 (선택)
+            compact_threshold (int): 불필요한 줄이 이 수를 넘으면 파일을 정리
         """
+        self.store = store
         self.cache_file_path = Path(__file__).parent.parent / cache_file
-        self.posted_ids: Set[str] = self._load_cache()
+        self.lock_path = self.cache_file_path.with_name(self.cache_file_path.name + '.lock')
+        self.compact_threshold = compact_threshold
         self.logger = logging.getLogger(__name__)
+        self.posted_ids: Set[str] = set()
+        self.dedup = DedupIndex()
+        self._journal_lines = 0  # 파일의 전체 줄 수 (중복/손상 포함)
+        self._offset = 0         # 지금까지 읽은 바이트 위치
+        self._file_id = None     # compaction으로 파일이 교체되었는지 확인용 (st_ino)
+        with _FileLock(self.lock_path):
+            self._refresh()
+            self._maybe_compact()
+        if self.store is not None:
+            for paper in self.store.published_papers():
+                self.dedup.add(paper.url, paper.title, paper.abstract)
         self.logger.info(f"캐시 파일 로드: {self.cache_file_path}. 총 {len(self.posted_ids)}개 ID 로드됨.")
 
-    def _load_cache(self) -> Set[str]:
-        """캐시 파일에서 포스팅된 ID들을 로드합니다."""
-        if not self.cache_file_path.exists():
-            return set()
+    def _refresh(self):
+        """다른 프로세스가 추가한 줄을 읽어옵니다. 파일이 교체되었으면 처음부터 다시 읽습니다."""
         try:
-            with open(self.cache_file_path, 'r', encoding='utf-8') as f:
+            stat = self.cache_file_path.stat()
+        except FileNotFoundError:
+            return
+        try:
+            if stat.st_ino != self._file_id or stat.st_size < self._offset:
+                self.posted_ids = set()
+                self._journal_lines = 0
+                self._offset = 0
+                self._file_id = stat.st_ino
+            if stat.st_size == self._offset:
+                return
+            with open(self.cache_file_path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+            # 처음 읽을 때는 마지막 줄에 개행이 없어도(기존 파일) 포함, 이후에는 완성된 줄만 읽음
+            if self._offset > 0 and not data.endswith(b'\n'):
+                data = data[:data.rfind(b'\n') + 1]
+            self._offset += len(data)
+            for line in data.decode('utf-8', errors='replace').splitlines():
+                self._journal_lines += 1
                 # 각 줄의 ID를 읽고, 앞뒤 공백 제거 후 빈 줄은 제외
-                return {line.strip() for line in f if line.strip()}
+                if line.strip():
+                    self.posted_ids.add(line.strip())
+                    self.dedup.add(line.strip())
         except Exception as e:
-            logging.error(f"캐시 파일 로드 중 오류 발생 ({self.cache_file_path}): {e}")
-            return set()
+            self.logger.error(f"캐시 파일 로드 중 오류 발생 ({self.cache_file_path}): {e}")
+
+    def _append(self, paper_id: str):
+        """ID 한 줄을 파일 끝에 추가하고 디스크에 기록될 때까지 기다립니다."""
+        self.cache_file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file_path, 'ab') as f:
+            prefix = b''
+            if f.tell() > 0:
+                # 이전에 중간에 끊긴 줄이 있으면 이어 붙이지 않도록 개행 추가
+                with open(self.cache_file_path, 'rb') as rf:
+                    rf.seek(-1, os.SEEK_END)
+                    if rf.read(1) != b'\n':
+                        prefix = b'\n'
+            f.write(prefix + f"{paper_id}\n".encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+            self._offset = f.tell()
+        self._file_id = self.cache_file_path.stat().st_ino
+        self._journal_lines += 1 + (1 if prefix else 0)
 
-    def _save_cache(self):
-        """현재 캐시 상태를 파일에 저장합니다."""
+    def _maybe_compact(self):
+        if self._journal_lines - len(self.posted_ids) > self.compact_threshold:
+            self._compact()
+
+    def _compact(self):
+        """정리된 캐시를 임시 파일에 쓰고 원자적으로 교체합니다. 잠금을 잡은 상태에서 호출해야 합니다."""
+        tmp_path = self.cache_file_path.with_name(self.cache_file_path.name + '.tmp')
         try:
-            # 파일 경로의 디렉토리가 없으면 생성
-            self.cache_file_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.cache_file_path, 'w', encoding='utf-8') as f:
-                for paper_id in sorted(list(self.posted_ids)): # 정렬해서 저장
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for paper_id in sorted(self.posted_ids): # 정렬해서 저장
                     f.write(f"{paper_id}\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.cache_file_path)
+            stat = self.cache_file_path.stat()
+            self._offset = stat.st_size
+            self._file_id = stat.st_ino
+            self.logger.info(f"캐시 파일 정리 완료: {self._journal_lines}줄 -> {len(self.posted_ids)}줄")
+            self._journal_lines = len(self.posted_ids)
         except Exception as e:
-            self.logger.error(f"캐시 파일 저장 중 오류 발생 ({self.cache_file_path}): {e}")
+            self.logger.error(f"캐시 파일 정리 중 오류 발생 ({self.cache_file_path}): {e}")
+
+    def compact(self):
+        """캐시 파일을 즉시 정리합니다."""
+        with _FileLock(self.lock_path):
+            self._refresh()
+            self._compact()
+
+    def add_paper(self, paper_id: str, title: Optional[str] = None, abstract: Optional[str] = None):
+        """
+        포스팅된 논문 ID를 캐시에 추가하고 파일 끝에 기록합니다. 제목/초록은 유사 중복 감지에 사용됩니다.
 
-    def add_paper(self, paper_id: str):
-        """포스팅된 논문 ID를 캐시에 추가하고 파일을 업데이트합니다."""
+        Raises:
+            OSError: 파일에 기록하지 못했을 때 (캐시와 저장소에는 추가하지 않음)
+        """
         if not paper_id:
             self.logger.warning("추가하려는 논문 ID가 비어있습니다.")
             return
 
         paper_id = paper_id.strip()
-        if paper_id not in self.posted_ids:
+        with _FileLock(self.lock_path):
+            self._refresh()
+            if paper_id in self.posted_ids:
+                self.logger.debug(f"논문 ID가 이미 캐시에 존재합니다: {paper_id}")
+                self.dedup.add(paper_id, title, abstract)
+                return
+            try:
+                self._append(paper_id)
+            except OSError as e:
+                self.logger.error(f"캐시 파일 저장 중 오류 발생 ({self.cache_file_path}): {e}")
+                raise
             self.posted_ids.add(paper_id)
-            self._save_cache()
-            self.logger.info(f"캐시에 새 논문 ID 추가: {paper_id}")
-        else:
-            self.logger.debug(f"논문 ID가 이미 캐시에 존재합니다: {paper_id}")
+            self.dedup.add(paper_id, title, abstract)
+            self._maybe_compact()
+        self.logger.info(f"캐시에 새 논문 ID 추가: {paper_id}")
+        if self.store is not None and not self.store.is_published(paper_id):
+            self.store.mark_published(paper_id, count_attempt=False)
 
     def is_posted(self, paper_id: str) -> bool:
         """주어진 논문 ID가 이미 포스팅되었는지 확인합니다."""
         if not paper_id:
             return False
-        return paper_id.strip() in self.posted_ids
+        paper_id = paper_id.strip()
+        if paper_id not in self.posted_ids:
+            # 다른 프로세스가 추가했을 수 있으므로 새 줄 확인
+            with _FileLock(self.lock_path):
+                self._refresh()
+        if paper_id in self.posted_ids or self.dedup.has_id(paper_id):
+            return True
+        return self.store is not None and self.store.is_published(paper_id)
+
+    def find_duplicate(self, paper_id: Optional[str], title: Optional[str] = None,
+                       abstract: Optional[str] = None) -> Optional[Tuple[str, str, float]]:
+        """
+        이미 포스팅된 논문과 같은(버전만 다르거나 교차 등록된) 논문인지 확인합니다.
+
+        Returns:
+            Optional[Tuple[str, str, float]]: (기존 ID, 사유, 유사도) 또는 None
+        """
+        if paper_id and self.is_posted(paper_id):
+            return paper_id.strip(), 'id', 1.0
+        return self.dedup.find_duplicate(paper_id, title, abstract)
 
     def get_posted_count(self) -> int:
         """캐시에 저장된 포스팅된 논문의 총 개수를 반환합니다."""
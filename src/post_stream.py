@@ -0,0 +1,77 @@
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class StreamingPost:
+    """
+    생성 중인 블로그 포스트. LLM 스트리밍 응답에서 완성되는 필드를 발행 스레드에 넘겨줍니다.
+
+    생성 스레드는 IncrementalJSONParser의 콜백(on_field, on_text)으로 채우고 마지막에 finish/fail을 호출합니다.
+    발행 스레드는 제목이 완성되는 즉시 에디터 입력을 시작하고(wait_title),
+    본문은 도착하는 대로 받아 입력하며(iter_content), 태그와 최종 결과는 result()로 받습니다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self.title: Optional[str] = None
+        self._content: List[str] = []
+        self.content_complete = False
+        self.done = False
+        self._result: Optional[Dict[str, Any]] = None
+        self._error: Optional[BaseException] = None
+
+    def on_text(self, key: str, delta: str):
+        if key == 'blog_content':
+            with self._cond:
+                self._content.append(delta)
+                self._cond.notify_all()
+
+    def on_field(self, key: str, value: Any):
+        with self._cond:
+            if key == 'blog_title' and isinstance(value, str):
+                self.title = value.strip()
+            elif key == 'blog_content':
+                self.content_complete = True
+            self._cond.notify_all()
+
+    def finish(self, result: Dict[str, Any]):
+        """생성이 끝났을 때 (대체 콘텐츠 포함) 최종 결과로 호출합니다."""
+        with self._cond:
+            self._result = result
+            self.done = True
+            self._cond.notify_all()
+
+    def fail(self, error: BaseException):
+        with self._cond:
+            self._error = error
+            self.done = True
+            self._cond.notify_all()
+
+    def wait_title(self, timeout: Optional[float] = None) -> Optional[str]:
+        """제목이 완성될 때까지 기다립니다. 제목 없이 생성이 끝나면 None."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.title or self.done, timeout)
+            return self.title or None
+
+    def iter_content(self) -> Iterator[str]:
+        """본문 조각을 도착하는 대로 내보냅니다. 본문이 완성되거나 생성이 끝나면 멈춥니다."""
+        index = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: len(self._content) > index or self.content_complete or self.done)
+                chunks = self._content[index:]
+                index = len(self._content)
+                finished = self.content_complete or self.done
+            if chunks:
+                yield ''.join(chunks)
+            if finished and index == len(self._content):
+                return
+
+    def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """생성 결과(title, content, tags)를 기다려 반환합니다. 생성이 예외로 끝났으면 그 예외를 올립니다."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.done, timeout):
+                raise TimeoutError("콘텐츠 생성 대기 시간 초과")
+            if self._error is not None:
+                raise self._error
+            return self._result
@@ -0,0 +1,212 @@
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from instrumentation import add_time
+
+
+class AccountLimiter:
+    """
+    계정(블로그)별 발행 속도 제한.
+
+    같은 계정의 연속 발행 사이에 min_interval초를 두고, 한 번의 실행에서 max_posts개까지만 발행합니다.
+    """
+
+    def __init__(self, min_interval: float = 10, max_posts: Optional[int] = None):
+        self.min_interval = min_interval
+        self.max_posts = max_posts
+        self.posted = 0
+        self._last_post = None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.max_posts is not None and self.posted >= self.max_posts
+
+    def wait(self):
+        """마지막 발행 후 min_interval초가 지날 때까지 기다립니다."""
+        if self._last_post is not None and self.min_interval:
+            delay = self._last_post + self.min_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+                add_time('publish.rate_limit_wait', delay)
+
+    def record(self):
+        self.posted += 1
+        self._last_post = time.monotonic()
+
+
+class PostingPipeline:
+    """
+    LLM 콘텐츠 생성과 Selenium 발행을 분리한 생산자/소비자 파이프라인.
+
+    다음 prefetch개 논문의 콘텐츠를 스레드 풀에서 미리 생성하는 동안,
+    계정별 브라우저 워커(포스터당 스레드 하나)가 공유 작업 대기열에서 논문을 꺼내 발행합니다.
+    생성 대기열은 prefetch개로 제한되어, 발행이 밀리면 새 생성 요청을 넣지 않습니다 (back-pressure).
+    포스터가 스트리밍 생성(new_stream)을 지원하면, 워커가 꺼낸 논문의 생성이 아직 끝나지 않았을 때
+    생성 완료를 기다리지 않고 StreamingPost를 넘겨 제목/본문이 도착하는 대로 발행을 진행합니다.
+    동시에 발행하는 브라우저 수는 max_concurrency개로 제한되고, 계정마다 AccountLimiter가 적용됩니다.
+    """
+
+    def __init__(self, posters: Union[Any, Sequence[Any]], prefetch: int = 3, post_interval: float = 10,
+                 max_concurrency: Optional[int] = None, limiters: Optional[Sequence[AccountLimiter]] = None):
+        """
+        Args:
+            posters (BlogPoster | Sequence[BlogPoster]): generate_post / publish_post를 제공하는 포스터 (계정당 하나)
+            prefetch (int): 동시에 생성(또는 생성 완료 후 대기)할 수 있는 최대 논문 수
+            post_interval (float): 같은 계정에서 발행 성공 후 다음 발행까지 대기 시간 (초, limiters가 없을 때)
+            max_concurrency (int): 동시에 발행하는 최대 브라우저 수 (기본값: 포스터 수)
+            limiters (Sequence[AccountLimiter]): 포스터별 발행 속도 제한 (기본값: post_interval 간격)
+        """
+        self.posters: List[Any] = list(posters) if isinstance(posters, (list, tuple)) else [posters]
+        self.prefetch = max(1, prefetch)
+        self.post_interval = post_interval
+        self.max_concurrency = max(1, max_concurrency or len(self.posters))
+        self.limiters = list(limiters) if limiters else [AccountLimiter(post_interval) for _ in self.posters]
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def poster(self):
+        """콘텐츠 생성은 계정과 무관하므로 첫 번째 포스터를 사용합니다."""
+        return self.posters[0]
+
+    def run(self, papers: Iterable[Dict[str, Any]], max_posts: int,
+            should_post: Callable[[int, Dict[str, Any]], bool],
+            on_posted: Callable[[Dict[str, Any], Dict[str, Any]], None]) -> Tuple[int, int]:
+        """
+        논문들을 순위 순서대로 꺼내 발행합니다 (여러 계정이면 동시에).
+
+        should_post와 on_posted는 같은 잠금 안에서 호출되므로 스레드 안전하지 않은 캐시를 사용해도 됩니다.
+
+        Args:
+            papers: 순위순 논문 목록
+            max_posts (int): 전체 최대 발행 개수
+            should_post (Callable): (순위, 논문) -> 발행 대상 여부
+            on_posted (Callable): 발행 성공 시 (논문, 결과)로 호출
+
+        Returns:
+            Tuple[int, int]: (발행 성공 수, 확인한 논문 수)
+        """
+        jobs: queue.Queue = queue.Queue(maxsize=self.prefetch)  # (순위, 논문, future, StreamingPost 또는 None)
+        state = {'posted': 0, 'reserved': 0, 'processed': 0}
+        lock = threading.Condition()
+        done = threading.Event()      # 목표 달성 또는 워커 종료 -> 더 이상 선정/발행하지 않음
+        finished = threading.Event()  # 논문 목록을 끝까지 확인함
+        publish_slots = threading.Semaphore(self.max_concurrency)
+        new_stream = getattr(self.poster, 'new_stream', None)
+
+        def produce(executor: ThreadPoolExecutor):
+            try:
+                for rank, paper in enumerate(papers, 1):
+                    if done.is_set():
+                        break
+                    with lock:
+                        state['processed'] = rank
+                        wanted = should_post(rank, paper)
+                    if not wanted:
+                        continue
+                    stream = new_stream() if new_stream is not None else None
+                    if stream is not None:
+                        future = executor.submit(self.poster.generate_post, paper, stream)
+                    else:
+                        future = executor.submit(self.poster.generate_post, paper)
+                    job = (rank, paper, future, stream)
+                    while not done.is_set():
+                        try:
+                            jobs.put(job, timeout=0.5)
+                            break
+                        except queue.Full:
+                            continue
+                    else:
+                        job[2].cancel()
+            except Exception as e:
+                self.logger.error(f"✗ 발행 대상 선정 중 예외 발생: {str(e)}", exc_info=True)
+            finally:
+                finished.set()
+
+        def reserve() -> bool:
+            """발행 자리를 예약합니다. 진행 중인 발행이 실패할 수 있으므로 목표를 넘지 않게 기다립니다."""
+            with lock:
+                while state['reserved'] >= max_posts and state['posted'] < max_posts:
+                    lock.wait()
+                if state['posted'] >= max_posts:
+                    return False
+                state['reserved'] += 1
+                return True
+
+        def work(poster, limiter: AccountLimiter):
+            account = getattr(poster, 'username', None) or '-'
+            # 계정 한도에 도달하면 작업을 꺼내지 않고 종료 (남은 작업은 다른 계정이 발행)
+            while not done.is_set() and not limiter.exhausted:
+                try:
+                    rank, paper, future, stream = jobs.get(timeout=0.2)
+                except queue.Empty:
+                    if finished.is_set() and jobs.empty():
+                        return
+                    continue
+                title = paper.get('title')
+                if not reserve():
+                    future.cancel()
+                    continue
+                success = False
+                try:
+                    if stream is not None and not future.done():
+                        # 생성 중 -> 완료를 기다리지 않고 스트리밍으로 발행 (발행 방식이 지원하지 않으면 publish_post에서 대기)
+                        generated_post = stream
+                        self.logger.info(f"콘텐츠 생성 중 - 스트리밍 발행 (순위: {rank}): {title}")
+                    else:
+                        wait_start = time.perf_counter()
+                        generated_post = future.result()
+                        waited = time.perf_counter() - wait_start
+                        add_time('publish.generation_wait', waited)
+                        self.logger.info(f"콘텐츠 생성 대기 {waited:.2f}초 (순위: {rank}): {title}")
+
+                    limiter.wait()
+                    with publish_slots:
+                        self.logger.info(f"포스팅 시도 (순위: {rank}, 계정: {account}, "
+                                         f"목표: {state['posted'] + 1}/{max_posts}): {title}")
+                        result = poster.publish_post(paper, generated_post)
+                    if result:
+                        success = True
+                        limiter.record()
+                        with lock:
+                            state['posted'] += 1
+                            self.logger.info(f"✓ 포스팅 성공 ({state['posted']}/{max_posts}, 계정: {account}): {title}")
+                            on_posted(paper, result)
+                            if state['posted'] >= max_posts:
+                                done.set()
+                    else:
+                        self.logger.error(f"✗ 포스팅 실패: {title}")
+                except Exception as e:
+                    self.logger.error(f"✗ 포스팅 중 예외 발생 ({title}): {str(e)}", exc_info=True)
+                finally:
+                    with lock:
+                        if not success:
+                            state['reserved'] -= 1
+                        lock.notify_all()
+
+        with ThreadPoolExecutor(max_workers=self.prefetch, thread_name_prefix='generate') as executor:
+            producer = threading.Thread(target=produce, args=(executor,), name='select', daemon=True)
+            workers = [
+                threading.Thread(target=work, args=(poster, limiter), name=f'publish-{i}', daemon=True)
+                for i, (poster, limiter) in enumerate(zip(self.posters, self.limiters))
+            ]
+            producer.start()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            # 모든 워커가 끝났으면 더 발행할 수 없음 -> 생산자 정지 후 남은 생성 작업 취소
+            done.set()
+            producer.join()
+            while True:
+                try:
+                    _, _, future, _ = jobs.get_nowait()
+                except queue.Empty:
+                    break
+                future.cancel()
+
+        if state['posted'] >= max_posts:
+            self.logger.info(f"목표 포스팅 개수({max_posts}개)에 도달했습니다.")
+        return state['posted'], state['processed']
@@ -0,0 +1,113 @@
+import re
+from typing import Any, Dict, List, Optional
+from config import PROMPT_ABSTRACT_TOKENS
+
+# 모든 LLM 호출이 공유하는 시스템 메시지.
+# 요청마다 같은 내용이 맨 앞에 오므로 제공자 측 프리픽스(컨텍스트) 캐시가 적중합니다. 내용을 바꾸면 캐시가 초기화됩니다.
+SYSTEM_PREFIX = """당신은 최신 AI 연구 논문을 읽고 한국어 독자에게 정확하고 이해하기 쉽게 전달하는 연구 해설가입니다.
+- 제공된 논문 정보(제목, 초록, 분석 결과)만 근거로 답하고, 논문에 없는 사실을 지어내지 않습니다.
+- 전문 용어는 한글 설명과 함께 영어 원문을 병기합니다.
+- 요청된 응답 형식을 정확히 지키고, 형식 밖의 인사말이나 부연 설명은 쓰지 않습니다."""
+
+# 토큰 수 추정: 영문/숫자는 약 4자당 1토큰, 한글 등 비ASCII 문자는 글자당 약 1토큰 (보수적으로 추정)
+ASCII_CHARS_PER_TOKEN = 4.0
+NON_ASCII_TOKENS_PER_CHAR = 1.0
+NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+# 초록의 LaTeX 표기 정리
+LATEX_REFERENCE = re.compile(r'~?\\(?:cite[a-z]*|ref|eqref|label|footnote)\s*\{[^{}]*\}')
+LATEX_FORMAT = re.compile(r'\\(?:text(?:bf|it|tt|rm|sc)?|emph|math(?:rm|bf|cal|bb|it|sf|tt)|operatorname|url)\s*\{([^{}]*)\}')
+LATEX_ESCAPED = re.compile(r'\\([%&#_$])')
+LATEX_COMMAND = re.compile(r'\\([a-zA-Z]+)\*?')
+MATH_DELIMITER = re.compile(r'(?<!\\)\$')
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+SPACE_BEFORE_PUNCT = re.compile(r'\s+([,.;:])')
+ELLIPSIS = ' …'
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """토크나이저 없이 텍스트의 토큰 수를 추정합니다."""
+    if not text:
+        return 0
+    non_ascii = len(NON_ASCII.findall(text))
+    return int((len(text) - non_ascii) / ASCII_CHARS_PER_TOKEN + non_ascii * NON_ASCII_TOKENS_PER_CHAR) + 1
+
+
+def normalize_abstract(text: Optional[str]) -> str:
+    """초록의 LaTeX 잡음(인용, 서식 명령, 수식 구분자, 중괄호)을 정리하고 공백을 하나로 합칩니다."""
+    if not text:
+        return ''
+    text = LATEX_REFERENCE.sub('', text)
+    text = MATH_DELIMITER.sub('', text)
+    # 중첩된 서식 명령(\mathbf{\mathcal{X}})은 안쪽부터 벗겨냄
+    previous = None
+    while previous != text:
+        previous, text = text, LATEX_FORMAT.sub(r'\1', text)
+    text = LATEX_ESCAPED.sub(r'\1', text)
+    text = text.replace('\\\\', ' ')
+    # \alpha, \times 같은 기호 명령은 이름만 남김
+    text = LATEX_COMMAND.sub(r'\1', text)
+    text = text.replace('{', '').replace('}', '')
+    return SPACE_BEFORE_PUNCT.sub(r'\1', ' '.join(text.split()))
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """추정 토큰 수가 max_tokens 이하가 되도록 문장 단위로 자릅니다 (첫 문장도 넘치면 글자 단위)."""
+    if max_tokens <= 0 or estimate_tokens(text) <= max_tokens:
+        return text
+    # 생략 표시가 들어갈 자리를 남김
+    max_tokens = max(1, max_tokens - estimate_tokens(ELLIPSIS))
+    kept: List[str] = []
+    used = 0
+    for sentence in SENTENCE_END.split(text):
+        tokens = estimate_tokens(sentence)
+        if used + tokens > max_tokens:
+            break
+        kept.append(sentence)
+        used += tokens
+    if not kept:
+        # 비율로 줄인 뒤 예산 안에 들 때까지 조금씩 더 자름
+        cut = max(1, int(len(text) * max_tokens / estimate_tokens(text)))
+        while cut > 1 and estimate_tokens(text[:cut]) > max_tokens:
+            cut = int(cut * 0.9)
+        return text[:cut].rstrip() + ELLIPSIS
+    return ' '.join(kept) + ELLIPSIS
+
+
+def compact_abstract(text: Optional[str], max_tokens: int = PROMPT_ABSTRACT_TOKENS) -> str:
+    """프롬프트에 넣을 초록: 정리 후 토큰 예산에 맞게 자릅니다."""
+    return trim_to_tokens(normalize_abstract(text), max_tokens)
+
+
+class Prompt:
+    """
+    LLM에 보낼 프롬프트 하나.
+
+    kind는 토큰 사용량 집계 단위('analysis.summary', 'blog' 등)이고, max_tokens는 응답 길이 상한입니다.
+    system은 기본적으로 모든 프롬프트가 공유하는 SYSTEM_PREFIX이며, 변하는 내용(논문 정보)은 text 뒤쪽에 둡니다.
+    """
+
+    __slots__ = ('kind', 'text', 'system', 'max_tokens', 'estimated_tokens')
+
+    def __init__(self, kind: str, text: str, max_tokens: Optional[int] = None,
+                 system: Optional[str] = SYSTEM_PREFIX):
+        self.kind = kind
+        self.text = text
+        self.system = system
+        self.max_tokens = max_tokens
+        self.estimated_tokens = estimate_tokens(system) + estimate_tokens(text)
+
+    def messages(self) -> List[Dict[str, Any]]:
+        messages = [{"role": "system", "content": self.system}] if self.system else []
+        messages.append({"role": "user", "content": self.text})
+        return messages
+
+    def cache_text(self) -> str:
+        """응답 캐시 키에 사용할 텍스트 (시스템 메시지 포함)."""
+        return f"{self.system}\n\n{self.text}" if self.system else self.text
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"Prompt({self.kind!r}, ~{self.estimated_tokens} tokens, max_tokens={self.max_tokens})"
@@ -0,0 +1,248 @@
+import os
+import html
+import json
+import pickle
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import requests
+from urllib3.exceptions import NewConnectionError, SSLError
+from session_manager import SESSION_COOKIES
+from instrumentation import span, timed, incr
+
+
+class PublishError(Exception):
+    """발행 백엔드가 글을 올리지 못했을 때 발생합니다 (세션 만료, HTTP 오류, 실패 응답 등)."""
+
+
+class PublishUncertainError(PublishError):
+    """
+    요청은 전송되었지만 결과를 알 수 없을 때 발생합니다 (응답 대기 타임아웃, 수신 중 연결 끊김, 5xx).
+
+    글이 실제로 올라갔을 수 있으므로 다른 백엔드로 다시 발행하지 않습니다.
+    """
+
+
+def _request_not_sent(error: requests.exceptions.RequestException) -> bool:
+    """요청이 서버에 전달되기 전에 실패했는지 (연결 거부, DNS 실패, 연결 타임아웃, TLS 오류, 잘못된 URL)."""
+    if isinstance(error, (requests.exceptions.ConnectTimeout, requests.exceptions.SSLError,
+                          requests.exceptions.InvalidURL, requests.exceptions.MissingSchema,
+                          requests.exceptions.InvalidSchema)):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError):
+        # requests는 urllib3의 MaxRetryError(reason에 원인)를 감쌈
+        reason = error.args[0] if error.args else None
+        reason = getattr(reason, 'reason', reason)
+        return isinstance(reason, (NewConnectionError, SSLError))
+    return False
+
+
+class Publisher:
+    """
+    블로그 글 발행 백엔드의 공통 인터페이스.
+
+    publish는 성공하면 True, 실패하면 False를 반환하거나 PublishError를 발생시킵니다.
+    streaming이 True인 백엔드는 content로 생성 중인 StreamingPost(tags는 None)도 받습니다.
+    """
+
+    name = 'base'
+    streaming = False
+
+    def publish(self, title: str, content: str, tags: List[str]) -> bool:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SeleniumPublisher(Publisher):
+    """SmartEditor 화면을 조작하는 기존 발행 방식 (BlogPoster의 브라우저/로그인 세션 사용)."""
+
+    name = 'selenium'
+    streaming = True
+
+    def __init__(self, poster):
+        self.poster = poster
+
+    def publish(self, title: str, content: str, tags: List[str]) -> bool:
+        poster = self.poster
+        if not poster.driver:
+            if not poster._setup_driver():
+                raise PublishError("Failed to setup WebDriver")
+
+        with span('publish.login'):
+            logged_in = poster.session.ensure_logged_in(poster.driver)
+        if not logged_in:
+            raise PublishError("Failed to login")
+
+        if not poster.create_post(title, content, tags):
+            if 'nidlogin' in poster.driver.current_url.lower():
+                # 글쓰기 페이지가 로그인 페이지로 이동됨 -> 다음 시도에서 재로그인
+                poster.session.invalidate()
+            return False
+
+        if poster.driver_provider.record_use():
+            # 사용 횟수/메모리 한도 도달로 브라우저 재시작 -> 다음 발행에서 새로 실행
+            poster.driver = None
+        return True
+
+
+def render_html(content: str) -> str:
+    """본문 텍스트를 문단(<p>) HTML로 변환합니다. 빈 줄은 빈 문단으로 유지합니다."""
+    paragraphs = []
+    for line in content.strip().split('\n'):
+        paragraphs.append(f"<p>{html.escape(line)}</p>" if line.strip() else "<p><br></p>")
+    return ''.join(paragraphs)
+
+
+class HttpPublisher(Publisher):
+    """
+    브라우저 없이 글쓰기 엔드포인트에 HTTP로 직접 발행합니다.
+
+    Selenium 로그인 후 저장된 세션 쿠키(pickle)를 requests 세션에 실어 보내므로 별도 로그인은 하지 않습니다.
+    쿠키 파일이 갱신되면(예: Selenium 대체 발행에서 재로그인) 다음 발행 때 다시 읽습니다.
+    엔드포인트는 설정값이며 '{username}'을 계정 ID로 치환합니다.
+    요청은 form 필드(blogId, title, content(HTML), tags(쉼표 구분), categoryName)로 보내고,
+    2xx 응답 중 JSON 본문의 isSuccess/success가 false가 아니면 성공으로 봅니다.
+    로그인 페이지로의 리다이렉트나 401/403은 세션 만료로 취급합니다.
+    요청을 보낸 뒤 결과를 알 수 없는 실패(응답 타임아웃, 수신 중 연결 끊김, 5xx)는 PublishUncertainError입니다.
+    """
+
+    name = 'http'
+
+    def __init__(self, endpoint: str, username: str, cookies_file: Path, category: Optional[str] = None,
+                 timeout: Tuple[float, float] = (5, 30), session: Optional[requests.Session] = None):
+        """
+        Args:
+            endpoint (str): 글쓰기 엔드포인트 URL ('{username}' 치환 가능)
+            username (str): 네이버 계정 ID (blogId)
+            cookies_file (Path): Selenium 세션 쿠키 pickle 파일
+            category (str): 카테고리 이름
+            timeout (Tuple[float, float]): (연결, 읽기) 타임아웃 (초)
+        """
+        self.endpoint = endpoint.format(username=username)
+        self.username = username
+        self.cookies_file = Path(cookies_file)
+        self.category = category
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.session.headers.setdefault('Referer', f"https://blog.naver.com/{username}/postwrite")
+        self._cookies_mtime = None
+        self.logger = logging.getLogger(__name__)
+
+    def _load_cookies(self) -> bool:
+        """쿠키 파일이 바뀌었으면 다시 읽어 세션에 넣습니다. 필수 세션 쿠키가 있으면 True."""
+        try:
+            mtime = os.path.getmtime(self.cookies_file)
+        except OSError:
+            return False
+        if mtime != self._cookies_mtime:
+            try:
+                with open(self.cookies_file, 'rb') as f:
+                    cookies = pickle.load(f)
+            except Exception as e:
+                self.logger.error(f"세션 쿠키 로드 중 오류 발생 ({self.cookies_file}): {e}")
+                return False
+            self.session.cookies.clear()
+            for cookie in cookies:
+                self.session.cookies.set(cookie['name'], cookie['value'],
+                                         domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+            self._cookies_mtime = mtime
+        names = {cookie.name for cookie in self.session.cookies}
+        return all(name in names for name in SESSION_COOKIES)
+
+    @timed('publish.http')
+    def publish(self, title: str, content: str, tags: List[str]) -> bool:
+        if not self._load_cookies():
+            raise PublishError(f"세션 쿠키 없음 ({self.cookies_file})")
+
+        data = {
+            'blogId': self.username,
+            'title': title,
+            'content': render_html(content),
+            'tags': ','.join(tags or []),
+        }
+        if self.category:
+            data['categoryName'] = self.category
+        try:
+            response = self.session.post(self.endpoint, data=data, timeout=self.timeout, allow_redirects=False)
+        except requests.exceptions.RequestException as e:
+            if _request_not_sent(e):
+                raise PublishError(f"HTTP 발행 요청 실패: {e}") from e
+            raise PublishUncertainError(f"HTTP 발행 결과 확인 불가 (요청 전송 후 오류): {e}") from e
+
+        location = response.headers.get('Location', '')
+        if response.status_code in (401, 403) or 'nidlogin' in location.lower():
+            self._cookies_mtime = None
+            raise PublishError(f"세션 만료 (HTTP {response.status_code})")
+        if response.status_code >= 500:
+            raise PublishUncertainError(f"HTTP 발행 결과 확인 불가: {response.status_code} {response.text[:200]}")
+        if response.status_code >= 400:
+            raise PublishError(f"HTTP 발행 실패: {response.status_code} {response.text[:200]}")
+
+        body: Dict[str, Any] = {}
+        if 'json' in response.headers.get('Content-Type', ''):
+            try:
+                body = response.json() or {}
+            except ValueError:
+                body = {}
+        if body.get('isSuccess', body.get('success', True)) is False:
+            raise PublishError(f"HTTP 발행 실패 응답: {json.dumps(body, ensure_ascii=False)[:200]}")
+        post_url = body.get('url') or body.get('postUrl') or location
+        print(f"✓ HTTP 발행 완료{f': {post_url}' if post_url else ''}")
+        return True
+
+    def close(self):
+        self.session.close()
+
+
+class FallbackPublisher(Publisher):
+    """
+    주 백엔드가 실패하면 대체 백엔드(보통 Selenium)로 다시 발행합니다.
+
+    발행 여부를 알 수 없는 실패(PublishUncertainError)는 중복 발행을 막기 위해 대체 발행하지 않고 그대로 올립니다.
+    """
+
+    def __init__(self, primary: Publisher, fallback: Publisher):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = f"{primary.name}+{fallback.name}"
+        self.logger = logging.getLogger(__name__)
+
+    def publish(self, title: str, content: str, tags: List[str]) -> bool:
+        try:
+            if self.primary.publish(title, content, tags):
+                return True
+            self.logger.warning(f"{self.primary.name} 발행 실패 -> {self.fallback.name}로 재시도")
+        except PublishUncertainError as e:
+            self.logger.error(f"{self.primary.name} 발행 결과 확인 불가 ({e}) - 중복 발행을 막기 위해 대체 발행하지 않음")
+            raise
+        except Exception as e:
+            self.logger.warning(f"{self.primary.name} 발행 실패 ({e}) -> {self.fallback.name}로 재시도")
+        incr('publish.fallbacks')
+        return self.fallback.publish(title, content, tags)
+
+    def close(self):
+        self.primary.close()
+        self.fallback.close()
+
+
+def build_publisher(poster, config: Dict) -> Publisher:
+    """
+    PUBLISH_BACKEND 설정에 따라 발행 백엔드를 만듭니다.
+
+    'selenium'(기본값)은 에디터 화면 조작, 'http'는 PUBLISH_HTTP_URL로 직접 발행하며
+    PUBLISH_FALLBACK이 켜져 있으면(기본값) HTTP 실패 시 Selenium으로 다시 발행합니다.
+    """
+    backend = (config.get('PUBLISH_BACKEND') or 'selenium').lower()
+    selenium = SeleniumPublisher(poster)
+    if backend == 'selenium':
+        return selenium
+    if backend != 'http':
+        raise ValueError(f"알 수 없는 발행 백엔드: {backend}")
+    endpoint = config.get('PUBLISH_HTTP_URL')
+    if not endpoint:
+        raise ValueError("PUBLISH_BACKEND=http에는 PUBLISH_HTTP_URL이 필요합니다.")
+    http = HttpPublisher(endpoint, poster.username, poster.cookies_file, config.get('BLOG_CATEGORY'))
+    fallback = str(config.get('PUBLISH_FALLBACK', '1')).strip().lower() in ('1', 'true', 'yes', 'on')
+    return FallbackPublisher(http, selenium) if fallback else http
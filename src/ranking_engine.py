@@ -0,0 +1,254 @@
+import heapq
+import bisect
+import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pytz
+from config import RANKING_KEYWORDS
+from paper import Paper
+
+
+class KeywordMatcher:
+    """
+    키워드 포함 여부를 논문 열(column) 단위로 한 번에 계산하는 매처.
+
+    텍스트를 구분자(\\x00)로 이어 붙인 하나의 문자열에서 키워드마다 C 수준의 부분 문자열 검색을 하고,
+    일치 위치를 이분 탐색으로 논문 번호에 대응시킵니다. 한 논문에서 일치가 나오면 다음 논문 시작 위치로
+    건너뛰므로, 키워드당 검색 횟수는 최대 논문 수입니다.
+    """
+
+    SEPARATOR = '\x00'
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = [keyword.lower() for keyword in keywords]
+
+    def hit_matrix(self, texts: Iterable[str], already_lower: bool = False) -> np.ndarray:
+        """텍스트별 키워드 포함 여부 행렬 (텍스트 수 x 키워드 수). already_lower=True면 소문자 변환을 생략."""
+        lowered = [text or '' for text in texts] if already_lower else [(text or '').lower() for text in texts]
+        corpus = self.SEPARATOR.join(lowered)
+        starts = [0]
+        for text in lowered:
+            starts.append(starts[-1] + len(text) + 1)
+
+        hits = np.zeros((len(lowered), len(self.keywords)), dtype=bool)
+        for column, keyword in enumerate(self.keywords):
+            rows = []
+            position = corpus.find(keyword)
+            while position != -1:
+                row = bisect.bisect_right(starts, position) - 1
+                rows.append(row)
+                position = corpus.find(keyword, starts[row + 1])
+            hits[rows, column] = True
+        return hits
+
+
+def _lower_text(paper: Union[Paper, Dict[str, Any]], field: str) -> str:
+    if isinstance(paper, Paper):
+        return paper.title_lower if field == 'title' else paper.abstract_lower
+    return (paper.get(field) or '').lower()
+
+
+class PaperColumns:
+    """
+    논문 목록을 특성 계산용 열(column) 배열로 변환한 것.
+
+    Attributes:
+        hours_old (np.ndarray): 제출 후 경과 시간 (시간)
+        n_authors (np.ndarray): 저자 수
+        title_len (np.ndarray): 제목 길이 (문자 수)
+        abstract_len (np.ndarray): 초록 길이 (문자 수)
+        keyword_hits (np.ndarray): 제목 또는 초록의 키워드 포함 여부 (논문 수 x 키워드 수)
+    """
+
+    def __init__(self, papers: Sequence[Dict[str, Any]], matcher: KeywordMatcher,
+                 now: Optional[datetime.datetime] = None):
+        now = now or datetime.datetime.now(pytz.UTC)
+        now_us = np.datetime64(now.astimezone(pytz.UTC).replace(tzinfo=None), 'us')
+        published = np.array([paper['published'] for paper in papers], dtype='datetime64[us]')
+        # 마이크로초 정수 차이를 나누므로 timedelta.total_seconds()와 같은 값
+        self.hours_old = (now_us - published).astype(np.int64) / 1e6 / 3600
+        self.n_authors = np.array([len(paper.get('authors') or []) for paper in papers], dtype=np.int64)
+        self.title_len = np.array([len(paper.get('title') or '') for paper in papers], dtype=np.int64)
+        self.abstract_len = np.array([len(paper.get('abstract') or '') for paper in papers], dtype=np.int64)
+        # 제목과 초록을 각각 검사 (이어 붙이면 경계에 걸친 가짜 일치가 생김), Paper는 캐시된 소문자 텍스트 사용
+        self.keyword_hits = (matcher.hit_matrix((_lower_text(paper, 'title') for paper in papers), already_lower=True)
+                             | matcher.hit_matrix((_lower_text(paper, 'abstract') for paper in papers), already_lower=True))
+
+    def __len__(self) -> int:
+        return len(self.hours_old)
+
+
+class Feature:
+    """가중치가 있는 랭킹 특성. func는 PaperColumns를 받아 논문별 값 배열을 반환합니다."""
+
+    def __init__(self, name: str, func: Callable[[PaperColumns], np.ndarray], weight: float = 1.0):
+        self.name = name
+        self.func = func
+        self.weight = weight
+
+    def __call__(self, columns: PaperColumns) -> np.ndarray:
+        return self.weight * self.func(columns)
+
+
+def length_bucket(lengths: np.ndarray, best: tuple, good: tuple) -> np.ndarray:
+    """best 구간(양끝 포함)은 3점, good 구간(best 양옆)은 2점, 나머지는 1점."""
+    in_best = (lengths >= best[0]) & (lengths <= best[1])
+    in_good = ((lengths >= good[0]) & (lengths < best[0])) | ((lengths > best[1]) & (lengths <= good[1]))
+    return np.select([in_best, in_good], [3, 2], default=1)
+
+
+def default_features(horizon_hours: float = 72) -> List[Feature]:
+    """기존 크롤러 점수와 같은 특성 목록."""
+    return [
+        # 1. 최신성 (최근일수록 높은 점수, horizon_hours 기준)
+        Feature('recency', lambda c: np.maximum(0, horizon_hours - c.hours_old), weight=2),
+        # 2. 저자 수 (최대 5점)
+        Feature('authors', lambda c: np.minimum(c.n_authors, 5)),
+        # 3. 제목 길이 (30~100자 3점, 20~150자 2점)
+        Feature('title_length', lambda c: length_bucket(c.title_len, (30, 100), (20, 150))),
+        # 4. 초록 길이 (500~2000자 3점, 300~3000자 2점)
+        Feature('abstract_length', lambda c: length_bucket(c.abstract_len, (500, 2000), (300, 3000))),
+        # 5. AI 관련 키워드 수
+        Feature('keywords', lambda c: c.keyword_hits.sum(axis=1)),
+    ]
+
+
+class RankingEngine:
+    """
+    논문 휴리스틱 점수를 NumPy 배열 연산으로 한 번에 계산하는 랭킹 엔진.
+
+    점수는 등록된 특성(Feature)들의 가중합이며, add_feature로 특성을 추가하거나
+    features 인자로 전체 목록을 교체할 수 있습니다.
+    """
+
+    def __init__(self, features: Optional[List[Feature]] = None, keywords: Optional[Sequence[str]] = None):
+        """
+        Args:
+            features (List[Feature]): 사용할 특성 목록 (기본값: default_features())
+            keywords (Sequence[str]): 키워드 특성에 사용할 키워드 (기본값: config.RANKING_KEYWORDS)
+        """
+        self.features = list(features) if features is not None else default_features()
+        self.matcher = KeywordMatcher(keywords if keywords is not None else RANKING_KEYWORDS)
+
+    def add_feature(self, name: str, func: Callable[[PaperColumns], np.ndarray], weight: float = 1.0):
+        self.features.append(Feature(name, func, weight))
+
+    def columns(self, papers: Sequence[Dict[str, Any]], now: Optional[datetime.datetime] = None) -> PaperColumns:
+        return PaperColumns(papers, self.matcher, now)
+
+    def score_columns(self, columns: PaperColumns) -> np.ndarray:
+        scores = np.zeros(len(columns), dtype=np.float64)
+        for feature in self.features:
+            scores += feature(columns)
+        return scores
+
+    def score(self, papers: Sequence[Dict[str, Any]], now: Optional[datetime.datetime] = None) -> np.ndarray:
+        """논문별 점수 배열을 반환합니다."""
+        return self.score_columns(self.columns(papers, now))
+
+    def rank(self, papers: Sequence[Dict[str, Any]], now: Optional[datetime.datetime] = None) -> List[Dict[str, Any]]:
+        """
+        각 논문의 'score'를 갱신하고 점수 내림차순(동점은 입력 순서 유지)으로 정렬한 목록을 반환합니다.
+        """
+        if not papers:
+            return []
+        scores = self.score(papers, now)
+        for paper, score in zip(papers, scores):
+            paper['score'] = float(score)
+        order = np.argsort(-scores, kind='stable')
+        return [papers[i] for i in order]
+
+
+class TopK:
+    """
+    점수 상위 k개만 유지하는 최소 힙.
+
+    동점이면 더 최근에 제출된 논문, 그래도 같으면 먼저 들어온 논문을 우선합니다.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[Tuple[float, str, int, Dict[str, Any]]] = []
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, score: float, paper: Dict[str, Any]):
+        entry = (score, paper.get('published') or '', -self._seq, paper)
+        self._seq += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:3] > self._heap[0][:3]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Dict[str, Any]]:
+        """점수 내림차순으로 정렬된 논문 목록."""
+        return [entry[3] for entry in sorted(self._heap, key=lambda entry: entry[:3], reverse=True)]
+
+
+class StreamingRanker:
+    """
+    논문 스트림을 micro-batch 단위로 RankingEngine에 넣어 점수를 매기고,
+    최근 시간대(windows)별로 상위 k개만 보관하는 랭커.
+
+    전체 후보를 리스트로 모으지 않으므로 랭커가 보관하는 논문은 O(k x 시간대 수 + batch_size)개입니다
+    (입력 스트림 쪽의 메모리는 스트림에 따라 다름, 예: MultiQueryHarvester.iter_papers).
+    시간대보다 오래된 논문은 버립니다.
+    """
+
+    def __init__(self, engine: RankingEngine, k: int = 20, windows: Sequence[float] = (72,),
+                 batch_size: int = 256, now: Optional[datetime.datetime] = None,
+                 on_scored: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
+        """
+        Args:
+            engine (RankingEngine): 점수 계산 엔진
+            k (int): 시간대별로 보관할 상위 논문 수
+            windows (Sequence[float]): 최근 시간대 목록 (시간 단위, 예: (24, 48, 72))
+            batch_size (int): 한 번에 점수를 계산할 논문 수
+            now (datetime): 기준 시각 (기본값: 생성 시각, 실행 동안 고정)
+            on_scored (Callable): 점수가 매겨진 batch(시간대 내 논문)를 받을 콜백 (예: 점수 저장)
+        """
+        self.engine = engine
+        self.windows = sorted(windows)
+        self.batch_size = batch_size
+        self.now = now or datetime.datetime.now(pytz.UTC)
+        self.on_scored = on_scored
+        self.tops = {window: TopK(k) for window in self.windows}
+        self.counts = {window: 0 for window in self.windows}
+        self._buffer: List[Dict[str, Any]] = []
+
+    def add(self, paper: Dict[str, Any]):
+        self._buffer.append(paper)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def feed(self, papers: Iterable[Dict[str, Any]]) -> 'StreamingRanker':
+        """스트림을 끝까지 소비하고 남은 batch까지 점수를 계산합니다."""
+        for paper in papers:
+            self.add(paper)
+        self.flush()
+        return self
+
+    def flush(self):
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        columns = self.engine.columns(batch, self.now)
+        scores = self.engine.score_columns(columns)
+        scored = []
+        for paper, score, hours_old in zip(batch, scores, columns.hours_old):
+            if hours_old > self.windows[-1]:
+                continue
+            paper['score'] = float(score)
+            scored.append(paper)
+            for window in self.windows:
+                if hours_old <= window:
+                    self.tops[window].push(paper['score'], paper)
+                    self.counts[window] += 1
+        if scored and self.on_scored is not None:
+            self.on_scored(scored)
+
+    def top(self, window: Optional[float] = None) -> List[Dict[str, Any]]:
+        """시간대(기본값: 가장 긴 시간대)의 상위 논문을 점수 내림차순으로 반환합니다."""
+        return self.tops[window if window is not None else self.windows[-1]].items()
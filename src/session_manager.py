@@ -0,0 +1,117 @@
+import time
+import pickle
+import logging
+from pathlib import Path
+from typing import Callable
+
+# 네이버 로그인 세션을 나타내는 필수 쿠키
+SESSION_COOKIES = ('NID_AUT', 'NID_SES')
+
+
+class NaverSessionManager:
+    """
+    네이버 로그인 세션(쿠키)을 파일에 저장/복원하여 논문마다, 실행마다 다시 로그인하지 않도록 합니다.
+
+    세션 검증은 쿠키 존재 여부 확인 -> 로그인 상태 페이지 확인 순으로 저렴한 것부터 수행하며,
+    최근에 검증된 세션은 validate_interval 동안 다시 검증하지 않습니다.
+    세션이 실제로 유효하지 않을 때만 전체 로그인(login_func)을 수행합니다.
+    """
+
+    def __init__(self, cookies_file: Path, login_func: Callable[[], bool],
+                 check_func: Callable[[], bool], validate_interval: float = 600,
+                 home_url: str = 'https://www.naver.com'):
+        """
+        Args:
+            cookies_file (Path): 쿠키를 저장할 pickle 파일 경로
+            login_func (Callable): 전체 로그인을 수행하고 성공 여부를 반환하는 함수
+            check_func (Callable): 현재 페이지 기준 로그인 상태를 확인하는 함수
+            validate_interval (float): 검증 결과를 신뢰할 시간 (초)
+            home_url (str): 쿠키를 복원할 때 먼저 열 페이지 (쿠키 도메인)
+        """
+        self.cookies_file = Path(cookies_file)
+        self.login_func = login_func
+        self.check_func = check_func
+        self.validate_interval = validate_interval
+        self.home_url = home_url
+        self.last_validated = 0.0
+        self.restored = False
+        self.logger = logging.getLogger(__name__)
+
+    def save(self, driver) -> bool:
+        """현재 브라우저의 쿠키를 파일에 저장합니다."""
+        try:
+            self.cookies_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cookies_file, 'wb') as f:
+                pickle.dump(driver.get_cookies(), f)
+            self.logger.info(f"세션 쿠키 저장: {self.cookies_file}")
+            return True
+        except Exception as e:
+            self.logger.error(f"세션 쿠키 저장 중 오류 발생 ({self.cookies_file}): {e}")
+            return False
+
+    def restore(self, driver) -> bool:
+        """저장된 쿠키를 브라우저에 복원합니다."""
+        self.restored = True
+        if not self.cookies_file.exists():
+            return False
+        try:
+            with open(self.cookies_file, 'rb') as f:
+                cookies = pickle.load(f)
+        except Exception as e:
+            self.logger.error(f"세션 쿠키 로드 중 오류 발생 ({self.cookies_file}): {e}")
+            return False
+
+        # 쿠키를 추가하려면 해당 도메인 페이지에 있어야 함
+        driver.get(self.home_url)
+        added = 0
+        for cookie in cookies:
+            cookie.pop('sameSite', None)
+            try:
+                driver.add_cookie(cookie)
+                added += 1
+            except Exception:
+                # 다른 서브도메인 쿠키 등은 무시
+                continue
+        self.logger.info(f"세션 쿠키 복원: {added}/{len(cookies)}개")
+        return added > 0
+
+    def has_session_cookies(self, driver) -> bool:
+        """필수 세션 쿠키가 브라우저에 있는지 확인합니다."""
+        names = {cookie.get('name') for cookie in driver.get_cookies()}
+        return all(name in names for name in SESSION_COOKIES)
+
+    def is_valid(self, driver) -> bool:
+        """세션이 유효한지 확인합니다. 최근 검증된 세션은 페이지 확인을 생략합니다."""
+        if not self.has_session_cookies(driver):
+            return False
+        if time.time() - self.last_validated < self.validate_interval:
+            return True
+        if self.check_func():
+            self.last_validated = time.time()
+            return True
+        return False
+
+    def reset(self):
+        """새 브라우저가 생성되었을 때 복원/검증 상태를 초기화합니다."""
+        self.restored = False
+        self.last_validated = 0.0
+
+    def invalidate(self):
+        """세션이 만료된 것으로 표시합니다 (예: 글쓰기 페이지에서 로그인 페이지로 이동된 경우)."""
+        self.last_validated = 0.0
+
+    def ensure_logged_in(self, driver) -> bool:
+        """유효한 세션을 보장합니다. 필요할 때만 전체 로그인을 수행합니다."""
+        if not self.restored:
+            self.restore(driver)
+
+        if self.is_valid(driver):
+            print("✓ 기존 로그인 세션 재사용")
+            return True
+
+        print("- 저장된 세션이 유효하지 않음. 전체 로그인 수행...")
+        if not self.login_func():
+            return False
+        self.last_validated = time.time()
+        self.save(driver)
+        return True
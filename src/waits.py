@@ -0,0 +1,96 @@
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from config import WAIT_TIMEOUTS
+from instrumentation import add_time
+
+# 지금까지 로드된 리소스 수. 일정 시간 변하지 않으면 네트워크가 유휴 상태라고 판단합니다.
+RESOURCE_COUNT_SCRIPT = "return performance.getEntriesByType('resource').length;"
+
+
+class StepWaiter:
+    """
+    고정 sleep 대신 DOM 상태, URL 변화, 네트워크 유휴 신호를 기다리는 대기 도우미.
+
+    단계(step)별 제한 시간은 config.WAIT_TIMEOUTS 한 곳에서 관리하고,
+    실제 대기 시간을 기록해 운영 로그에서 제한 시간을 조정할 수 있게 합니다.
+    조건을 만족하지 못하면 WebDriverWait과 동일하게 TimeoutException을 발생시킵니다.
+    """
+
+    def __init__(self, driver, timeouts: Optional[Dict[str, float]] = None, poll: float = 0.1):
+        self.driver = driver
+        self.timeouts = {**WAIT_TIMEOUTS, **(timeouts or {})}
+        self.poll = poll
+        self.records: List[Tuple[str, float, bool]] = []
+        self.logger = logging.getLogger(__name__)
+
+    def budget(self, step: str) -> float:
+        """단계별 제한 시간(초)을 반환합니다."""
+        return self.timeouts.get(step, self.timeouts['default'])
+
+    def until(self, step: str, condition: Callable, timeout: Optional[float] = None):
+        """조건이 참이 될 때까지 기다리고, 실제 대기 시간을 기록합니다."""
+        budget = self.budget(step) if timeout is None else timeout
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(self.driver, budget, poll_frequency=self.poll).until(condition)
+            self._record(step, time.perf_counter() - start, budget, True)
+            return result
+        except TimeoutException:
+            self._record(step, time.perf_counter() - start, budget, False)
+            raise
+
+    def _record(self, step: str, elapsed: float, budget: float, ok: bool):
+        self.records.append((step, elapsed, ok))
+        add_time(f'wait.{step}', elapsed)
+        status = "ok" if ok else "timeout"
+        self.logger.info(f"대기 [{step}]: {elapsed:.2f}초 / 제한 {budget:.1f}초 ({status})")
+
+    # --- 자주 쓰는 조건들 ---
+    def element_present(self, step: str, locator: Tuple[str, str], timeout: Optional[float] = None):
+        return self.until(step, EC.presence_of_element_located(locator), timeout)
+
+    def element_clickable(self, step: str, locator: Tuple[str, str], timeout: Optional[float] = None):
+        return self.until(step, EC.element_to_be_clickable(locator), timeout)
+
+    def element_gone(self, step: str, locator: Tuple[str, str], timeout: Optional[float] = None):
+        return self.until(step, EC.invisibility_of_element_located(locator), timeout)
+
+    def url_contains(self, step: str, fragment: str, timeout: Optional[float] = None):
+        return self.until(step, lambda d: fragment in d.current_url.lower(), timeout)
+
+    def url_not_contains(self, step: str, fragment: str, timeout: Optional[float] = None):
+        return self.until(step, lambda d: fragment not in d.current_url.lower(), timeout)
+
+    def document_ready(self, step: str, timeout: Optional[float] = None):
+        return self.until(step, lambda d: d.execute_script("return document.readyState") == 'complete', timeout)
+
+    def network_idle(self, step: str, idle_time: float = 0.5, timeout: Optional[float] = None):
+        """리소스 로드 수가 idle_time 동안 변하지 않을 때까지 기다립니다."""
+        state = {'count': -1, 'since': time.perf_counter()}
+
+        def _idle(d):
+            count = d.execute_script(RESOURCE_COUNT_SCRIPT)
+            now = time.perf_counter()
+            if count != state['count']:
+                state['count'] = count
+                state['since'] = now
+                return False
+            return now - state['since'] >= idle_time
+
+        return self.until(step, _idle, timeout)
+
+    def summary(self) -> str:
+        """기록된 대기 시간의 합계를 단계별로 요약합니다."""
+        totals: Dict[str, float] = {}
+        for step, elapsed, _ in self.records:
+            totals[step] = totals.get(step, 0.0) + elapsed
+        total = sum(totals.values())
+        parts = [f"{step}={elapsed:.2f}s" for step, elapsed in totals.items()]
+        return f"총 {total:.2f}초 ({', '.join(parts)})"
+
+    def reset(self):
+        self.records.clear()
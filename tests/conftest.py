@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# src/의 모듈은 패키지 없이 모듈 이름으로 import합니다 (src/에서 실행할 때와 같게)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
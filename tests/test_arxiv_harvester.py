@@ -0,0 +1,105 @@
+import datetime
+from types import SimpleNamespace
+import pytz
+import threading
+from arxiv_harvester import ArxivHarvester, MultiQueryHarvester
+from paper_store import PaperStore
+
+
+def _result(arxiv_id: str, category: str, hours_ago: float, categories=None):
+    published = datetime.datetime.now(pytz.UTC).replace(microsecond=0) - datetime.timedelta(hours=hours_ago)
+    return SimpleNamespace(
+        title=f"Paper {arxiv_id}", authors=[SimpleNamespace(name='A. Author')], summary='Abstract.',
+        entry_id=f"http://arxiv.org/abs/{arxiv_id}v1", pdf_url=f"http://arxiv.org/pdf/{arxiv_id}v1",
+        published=published, categories=categories or [category], doi=None, comment=None,
+    )
+
+
+class FakeClient:
+    """제출일 내림차순 결과를 돌려주고 몇 개를 내보냈는지 기록합니다."""
+
+    def __init__(self, results):
+        self.results_list = sorted(results, key=lambda result: result.published, reverse=True)
+        self.yielded = 0
+
+    def results(self, search):
+        for result in self.results_list:
+            self.yielded += 1
+            yield result
+
+
+def test_store_backed_watermark_is_per_query(tmp_path):
+    store = PaperStore(str(tmp_path / 'papers.db'))
+    ai_client = FakeClient([_result('2401.00001', 'cs.AI', 10), _result('2401.00002', 'cs.AI', 20)])
+    lg_client = FakeClient([_result('2401.00003', 'cs.LG', 1)])
+    lg = ArxivHarvester('cat:cs.LG', state_file=tmp_path / 'lg.json', store=store, client=lg_client)
+    ai = ArxivHarvester('cat:cs.AI', state_file=tmp_path / 'ai.json', store=store, client=ai_client)
+
+    assert [paper.url for paper in lg.harvest()] == ['http://arxiv.org/abs/2401.00003v1']
+    ai_papers = ai.harvest()
+    # 다른 카테고리의 논문은 반환하지 않고, 워터마크는 이 쿼리의 최신 논문
+    assert [paper.url for paper in ai_papers] == ['http://arxiv.org/abs/2401.00001v1',
+                                                  'http://arxiv.org/abs/2401.00002v1']
+    assert ai.state['watermark'] == ai_papers[0].published
+    assert ai.state['watermark_ids'] == ['http://arxiv.org/abs/2401.00001v1']
+
+    # 이 쿼리의 새 논문은 다른 카테고리의 더 최신 논문보다 오래되었어도 수집됨
+    ai_client.results_list.insert(0, _result('2401.00004', 'cs.AI', 5))
+    ai = ArxivHarvester('cat:cs.AI', state_file=tmp_path / 'ai.json', store=store, client=ai_client)
+    urls = [paper.url for paper in ai.harvest()]
+    assert urls[0] == 'http://arxiv.org/abs/2401.00004v1'
+    assert len(urls) == 3
+    store.close()
+
+
+def test_file_backed_second_run_stops_at_watermark(tmp_path):
+    client = FakeClient([_result('2401.00001', 'cs.AI', 1), _result('2401.00002', 'cs.AI', 2)])
+    ArxivHarvester('cat:cs.AI', state_file=tmp_path / 'ai.json', client=client).harvest()
+    client.yielded = 0
+    papers = ArxivHarvester('cat:cs.AI', state_file=tmp_path / 'ai.json', client=client).harvest()
+    assert client.yielded == 1
+    assert len(papers) == 2
+
+
+def test_iter_harvest_yields_first_page_before_the_feed_ends(tmp_path):
+    client = FakeClient([_result(f'2401.{i:05d}', 'cs.AI', i + 1) for i in range(10)])
+    papers = ArxivHarvester('cat:cs.AI', state_file=tmp_path / 'ai.json', page_size=3, client=client).iter_harvest()
+    assert next(papers).url == 'http://arxiv.org/abs/2401.00000v1'
+    assert client.yielded <= 4
+    assert len(list(papers)) == 9
+
+
+class BlockingClient(FakeClient):
+    """첫 결과를 내보낸 뒤 release가 설정될 때까지 멈추는 클라이언트 (느린 피드)."""
+
+    def __init__(self, results):
+        super().__init__(results)
+        self.release = threading.Event()
+
+    def results(self, search):
+        for i, result in enumerate(super().results(search)):
+            if i == 1:
+                assert self.release.wait(5)
+            yield result
+
+
+def test_multi_query_streams_and_merges_cross_listed_categories(tmp_path):
+    harvester = MultiQueryHarvester(['cat:cs.AI', 'cat:cs.LG'], request_interval=0)
+    ai, lg = harvester.harvesters
+    ai.client = BlockingClient([_result('2401.00001', 'cs.AI', 1, ['cs.AI', 'cs.LG']), _result('2401.00002', 'cs.AI', 2)])
+    lg.client = FakeClient([_result('2401.00001', 'cs.LG', 1, ['cs.LG', 'cs.AI', 'stat.ML']),
+                            _result('2401.00003', 'cs.LG', 3)])
+    for query_harvester, name in ((ai, 'ai'), (lg, 'lg')):
+        query_harvester.state_file = tmp_path / f'{name}.json'
+        query_harvester.page_size = 1
+
+    papers = harvester.iter_papers()
+    # cs.AI 피드가 끝나기 전에 논문이 나옴
+    first = [next(papers), next(papers)]
+    assert not ai.client.release.is_set()
+    ai.client.release.set()
+    streamed = first + list(papers)
+
+    assert sorted(paper.arxiv_id for paper in streamed) == ['2401.00001', '2401.00002', '2401.00003']
+    cross_listed = next(paper for paper in streamed if paper.arxiv_id == '2401.00001')
+    assert sorted(cross_listed.categories) == ['cs.AI', 'cs.LG', 'stat.ML']
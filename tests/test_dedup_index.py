@@ -0,0 +1,56 @@
+import pytest
+from dedup_index import DedupIndex, normalize_arxiv_id, shingles
+
+TITLE = 'Attention Is All You Need for Efficient Long Context Language Modeling at Scale'
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2504.07936', '2504.07936'),
+    ('2504.07936v3', '2504.07936'),
+    ('http://arxiv.org/abs/2504.07936v1', '2504.07936'),
+    ('https://arxiv.org/pdf/2504.07936v2', '2504.07936'),
+    ('https://arxiv.org/pdf/2504.07936v2.pdf', '2504.07936'),
+    ('http://export.arxiv.org/abs/1501.0001v1', '1501.0001'),
+    ('http://arxiv.org/abs/cs/0101001v2', 'cs/0101001'),
+    ('http://arxiv.org/abs/Math.AG/0101001', 'math.ag/0101001'),
+    ('https://Example.com/Paper/', 'example.com/paper'),
+])
+def test_normalize_arxiv_id(value, expected):
+    assert normalize_arxiv_id(value) == expected
+
+
+def test_versions_and_url_forms_are_the_same_id():
+    index = DedupIndex()
+    index.add('http://arxiv.org/abs/2504.07936v1')
+    assert index.has_id('2504.07936v2')
+    assert index.has_id('https://arxiv.org/pdf/2504.07936v2')
+    assert index.find_duplicate('https://arxiv.org/abs/2504.07936') == ('2504.07936', 'id', 1.0)
+    assert not index.has_id('2504.07937')
+
+
+def test_cross_listed_paper_is_found_by_id_and_title():
+    index = DedupIndex()
+    index.add('http://arxiv.org/abs/2401.00001v1', TITLE)
+    # 다른 카테고리 목록에서 같은 논문 (같은 ID, 다른 URL 형식)
+    assert index.find_duplicate('https://arxiv.org/pdf/2401.00001v2', TITLE) == ('2401.00001', 'id', 1.0)
+    # 대소문자/문장부호만 다른 제목으로 다른 ID에 다시 올라온 논문
+    assert index.find_duplicate('2402.00002', TITLE.upper() + '!') == ('2401.00001', 'title', 1.0)
+
+
+def test_title_threshold():
+    index = DedupIndex(title_threshold=0.9)
+    index.add('2401.00001', TITLE)
+    # 단어 하나 추가 (실제 Jaccard 12/13): 임계값 이상
+    revised = TITLE + ' Revisited'
+    assert len(shingles(revised, 2) & shingles(TITLE, 2)) / len(shingles(revised, 2) | shingles(TITLE, 2)) > 0.9
+    match = index.find_duplicate('2402.00002', revised)
+    assert match is not None and match[:2] == ('2401.00001', 'title') and match[2] >= 0.9
+    # 단어 하나 교체 (실제 Jaccard 10/14): 임계값 미만
+    assert index.find_duplicate('2402.00003', TITLE.replace('Language', 'Vision')) is None
+    assert index.find_duplicate('2402.00004', 'Graph Neural Networks for Molecular Property Prediction') is None
+
+    # 임계값을 낮추면 같은 쌍이 중복으로 판정됨
+    loose = DedupIndex(title_threshold=0.5)
+    loose.add('2401.00001', TITLE)
+    match = loose.find_duplicate('2402.00003', TITLE.replace('Language', 'Vision'))
+    assert match is not None and 0.5 <= match[2] < 0.9
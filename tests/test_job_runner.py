@@ -0,0 +1,68 @@
+import pytest
+import job_runner
+import llm_limits
+from llm_limits import FAILED, LLMGuard
+from paper import Paper
+from paper_store import PaperStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_limits.time, 'monotonic', clock)
+    guard = LLMGuard(0, 1, 1, 1, 1, 3, failure_threshold=1, reset_timeout=60)
+    monkeypatch.setattr(job_runner, 'LLM_GUARD', guard)
+    monkeypatch.setattr(job_runner, 'RUN_REPORT_FILE', str(tmp_path / 'run_reports.jsonl'))
+    published = []
+
+    def publish(job, papers):
+        published.append([paper.url for paper in papers])
+        job.status = 'ok'
+
+    monkeypatch.setattr(job_runner.PostingJob, '_build_posters', lambda job: None)
+    monkeypatch.setattr(job_runner.PostingJob, '_publish', publish)
+    config = {'PAPER_DB_FILE': str(tmp_path / 'papers.db'), 'POST_CACHE_FILE': str(tmp_path / 'posted.txt')}
+    return clock, guard, config, published
+
+
+def _interrupted_job(db_file: str) -> int:
+    store = PaperStore(db_file)
+    papers = [Paper(title=f'Paper {i}', url=f'http://arxiv.org/abs/2401.0000{i}v1', published='2099-01-01 00:00:00')
+              for i in range(3)]
+    store.upsert_papers(papers)
+    ids = [paper.url for paper in papers]
+    job_id = store.start_job(ids)
+    store.advance_stage(ids, 'ranked', job_id=job_id)
+    store.mark_published(ids[0], 'Blog 0')
+    store.finish_job(job_id, 'interrupted')
+    store.close()
+    return job_id
+
+
+def test_resumes_interrupted_job_only_after_breaker_resets(env):
+    clock, guard, config, published = env
+    job_id = _interrupted_job(config['PAPER_DB_FILE'])
+    guard.breaker.record(FAILED)
+
+    assert job_runner.PostingJob(config).run() == 'circuit_open'
+    assert published == []
+    store = PaperStore(config['PAPER_DB_FILE'])
+    assert store.resumable_job(36)['status'] == 'interrupted'
+    store.close()
+
+    clock.now += 61
+    job = job_runner.PostingJob(config)
+    assert job.run() == 'ok'
+    assert job.job_id == job_id
+    assert published == [['http://arxiv.org/abs/2401.00001v1', 'http://arxiv.org/abs/2401.00002v1']]
+    store = PaperStore(config['PAPER_DB_FILE'])
+    assert store.resumable_job(36) is None
+    store.close()
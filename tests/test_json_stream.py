@@ -0,0 +1,68 @@
+import json
+import pytest
+from json_stream import IncrementalJSONParser, parse_partial
+
+DOCUMENTS = [
+    '{}',
+    '{"title": "Hello", "content": "World"}',
+    '{"title": "quote \\" backslash \\\\ slash \\/ tabs\\t\\r\\n\\b\\f end"}',
+    '{"title": "\\uD55C\\uAD6D\\uc5b4 \\u00e9\\u0041", "content": "한국어 그대로"}',
+    '{"emoji": "\\ud83d\\ude00 and \\uD83E\\uDD16!", "raw": "😀🤖"}',
+    '{"esc\\"key\\u0021": 1}',
+    '{"tags": ["AI", "LLM \\"quoted\\"", "br]ace}"], "meta": {"a": [1, {"b": "}{"}], "c": null}, "n": -1.5e3,'
+    ' "ok": true, "no": false, "nil": null}',
+    ' \n{ "a" : [ ] , "b" : { } , "c" : "" , "d" : 0 }',
+]
+
+CHUNK_SIZES = [1, 2, 3, 7, None]
+
+
+def _feed(text: str, size):
+    deltas = {}
+    fields = []
+    parser = IncrementalJSONParser(on_field=lambda key, value: fields.append((key, value)),
+                                   on_text=lambda key, delta: deltas.setdefault(key, []).append(delta))
+    chunks = [text] if size is None else [text[i:i + size] for i in range(0, len(text), size)]
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser, fields, {key: ''.join(parts) for key, parts in deltas.items()}
+
+
+@pytest.mark.parametrize('size', CHUNK_SIZES)
+@pytest.mark.parametrize('text', DOCUMENTS)
+def test_chunked_matches_json_loads(text, size):
+    expected = json.loads(text)
+    parser, fields, texts = _feed(text, size)
+    assert parser.done and parser.error is None
+    assert parser.values == expected
+    assert fields == list(expected.items())
+    # on_text 조각을 이으면 완성된 문자열 값과 같음
+    assert texts == {key: value for key, value in expected.items() if isinstance(value, str) and value}
+
+
+@pytest.mark.parametrize('size', CHUNK_SIZES)
+def test_code_fence_and_trailing_text_are_ignored(size):
+    text = 'Sure:\n```json\n{"title": "T", "body": "line1\nline2"}\n```\nextra {"x": 1}'
+    parser, _, _ = _feed(text, size)
+    assert parser.done
+    # 문자열 안의 실제 줄바꿈은 허용
+    assert parser.values == {'title': 'T', 'body': 'line1\nline2'}
+
+
+def test_parse_partial_keeps_completed_fields():
+    text = '{"title": "T\\u00e9", "tags": ["a", "b"], "content": "half writ'
+    parser = parse_partial(text)
+    assert not parser.done and parser.error is None
+    assert parser.values == {'title': 'Té', 'tags': ['a', 'b']}
+    assert parser.partial('content') == 'half writ'
+
+    # 서로게이트 쌍 중간에서 잘려도 앞의 필드는 유지
+    parser = parse_partial('{"a": 1, "b": "x\\ud83d\\ude')
+    assert parser.values == {'a': 1}
+    assert parser.partial('b') == 'x'
+
+
+def test_malformed_value_records_error():
+    parser = parse_partial('{"a": "ok", "b": [1, 2}, "c": 3}')
+    assert parser.error is not None and not parser.done
+    assert parser.values == {'a': 'ok'}
@@ -0,0 +1,54 @@
+import pytest
+import llm_limits
+from llm_limits import CircuitBreaker, CircuitOpenError, FAILED, OK
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_limits.time, 'monotonic', clock)
+    return clock
+
+
+def test_breaker_open_timeout_half_open_closed(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record(FAILED)
+    assert not breaker.is_open
+    breaker.record(FAILED)
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # 재시도 시간이 지나면 호출 없이도 열림으로 보지 않음
+    clock.now += 61
+    assert not breaker.is_open
+    assert breaker.state == CircuitBreaker.OPEN
+
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # 시험 호출은 하나만
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record(OK)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert not breaker.is_open
+    breaker.before_call()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record(FAILED)
+    clock.now += 11
+    breaker.before_call()
+    breaker.record(FAILED)
+    assert breaker.is_open
+    assert breaker.opens == 2
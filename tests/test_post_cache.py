@@ -0,0 +1,93 @@
+import threading
+import pytest
+from post_cache import PostCache
+
+
+def _lines(path):
+    return path.read_text(encoding='utf-8').splitlines()
+
+
+def test_append_then_reload(tmp_path):
+    cache_file = tmp_path / 'posted.txt'
+    cache = PostCache(str(cache_file))
+    cache.add_paper('2401.00001')
+    cache.add_paper('2401.00002')
+    cache.add_paper('2401.00001')
+
+    assert _lines(cache_file) == ['2401.00001', '2401.00002']
+    reloaded = PostCache(str(cache_file))
+    assert reloaded.get_posted_count() == 2
+    assert reloaded.is_posted('2401.00001') and reloaded.is_posted('2401.00002')
+    assert not reloaded.is_posted('2401.00003')
+
+
+def test_concurrent_appends_from_two_instances(tmp_path):
+    cache_file = tmp_path / 'posted.txt'
+    first, second = PostCache(str(cache_file)), PostCache(str(cache_file))
+
+    def add(cache, prefix):
+        for i in range(50):
+            cache.add_paper(f"{prefix}.{i:05d}")
+
+    threads = [threading.Thread(target=add, args=(first, '2401')), threading.Thread(target=add, args=(second, '2402'))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 줄이 섞이거나 잘리지 않고, 각 인스턴스가 다른 인스턴스의 추가분도 봄
+    lines = _lines(cache_file)
+    assert len(lines) == 100 and len(set(lines)) == 100
+    assert first.is_posted('2402.00049') and second.is_posted('2401.00049')
+    assert PostCache(str(cache_file)).get_posted_count() == 100
+
+
+def test_compaction_removes_duplicates_and_other_instances_reread(tmp_path):
+    cache_file = tmp_path / 'posted.txt'
+    cache_file.write_text('b\na\na\n\na\nb\n', encoding='utf-8')
+    other = PostCache(str(cache_file), compact_threshold=100)
+    assert other.get_posted_count() == 2
+
+    cache = PostCache(str(cache_file), compact_threshold=2)
+    assert _lines(cache_file) == ['a', 'b']
+
+    # 파일이 교체되어도 먼저 열어 둔 인스턴스는 처음부터 다시 읽어 새 줄을 봄
+    cache.add_paper('c')
+    assert other.is_posted('c')
+    assert other.get_posted_count() == 3
+
+
+def test_torn_last_line(tmp_path):
+    cache_file = tmp_path / 'posted.txt'
+    cache = PostCache(str(cache_file))
+    cache.add_paper('2401.00001')
+
+    # 다른 프로세스가 쓰는 도중인(개행 없는) 줄은 완성될 때까지 읽지 않음
+    with open(cache_file, 'ab') as f:
+        f.write(b'2401.000')
+    assert not cache.is_posted('2401.000')
+    assert cache.get_posted_count() == 1
+
+    # 끊긴 줄 뒤에 추가해도 이어 붙지 않음
+    cache.add_paper('2401.00002')
+    assert _lines(cache_file) == ['2401.00001', '2401.000', '2401.00002']
+    reloaded = PostCache(str(cache_file))
+    assert reloaded.is_posted('2401.00002')
+    assert reloaded.get_posted_count() == 3
+
+
+def test_failed_append_is_not_recorded(tmp_path, monkeypatch):
+    cache_file = tmp_path / 'posted.txt'
+    cache = PostCache(str(cache_file))
+    cache.add_paper('2401.00001')
+
+    def fail(paper_id):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(cache, '_append', fail)
+    with pytest.raises(OSError):
+        cache.add_paper('2401.00002', 'A Title')
+    # 기록되지 않은 ID는 메모리에서도 포스팅된 것으로 보지 않음
+    assert not cache.is_posted('2401.00002')
+    assert cache.find_duplicate('2401.00002', 'A Title') is None
+    assert cache.get_posted_count() == 1
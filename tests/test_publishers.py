@@ -0,0 +1,96 @@
+import pickle
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+from publishers import FallbackPublisher, HttpPublisher, Publisher, PublishError, PublishUncertainError
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.server.posts += 1
+        status = {'/ok': 200, '/reject': 400, '/error': 503}.get(self.path)
+        if self.path == '/slow':
+            time.sleep(0.5)
+            status = 200
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(b'{"isSuccess": true}')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = HTTPServer(('127.0.0.1', 0), Handler)
+    httpd.posts = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+
+
+@pytest.fixture
+def cookies(tmp_path):
+    path = tmp_path / 'cookies.pkl'
+    with open(path, 'wb') as f:
+        pickle.dump([{'name': 'NID_AUT', 'value': 'x'}, {'name': 'NID_SES', 'value': 'x'}], f)
+    return path
+
+
+class RecordingPublisher(Publisher):
+    name = 'recording'
+
+    def __init__(self):
+        self.calls = 0
+
+    def publish(self, title, content, tags):
+        self.calls += 1
+        return True
+
+
+def _http(server, path, cookies):
+    return HttpPublisher(f"http://127.0.0.1:{server.server_port}{path}", 'user', cookies, timeout=(1, 0.2))
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.parametrize('path', ['/error', '/slow'])
+def test_ambiguous_failures_do_not_fall_back(server, cookies, path):
+    fallback = RecordingPublisher()
+    publisher = FallbackPublisher(_http(server, path, cookies), fallback)
+    with pytest.raises(PublishUncertainError):
+        publisher.publish('title', 'body', ['tag'])
+    assert fallback.calls == 0
+    assert server.posts == 1
+
+
+def test_explicit_reject_falls_back(server, cookies):
+    fallback = RecordingPublisher()
+    assert FallbackPublisher(_http(server, '/reject', cookies), fallback).publish('title', 'body', [])
+    assert fallback.calls == 1
+
+
+def test_pre_send_failures_fall_back(tmp_path, cookies):
+    refused = HttpPublisher(f"http://127.0.0.1:{_closed_port()}/write", 'user', cookies)
+    with pytest.raises(PublishError) as error:
+        refused.publish('title', 'body', [])
+    assert not isinstance(error.value, PublishUncertainError)
+
+    fallback = RecordingPublisher()
+    assert FallbackPublisher(refused, fallback).publish('title', 'body', [])
+    no_session = HttpPublisher('http://127.0.0.1:1/write', 'user', tmp_path / 'missing.pkl')
+    assert FallbackPublisher(no_session, fallback).publish('title', 'body', [])
+    assert fallback.calls == 2
+
+
+def test_success(server, cookies):
+    assert _http(server, '/ok', cookies).publish('title', 'body', ['a', 'b'])